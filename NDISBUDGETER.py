@@ -1,14 +1,56 @@
+import argparse
+import csv
+import datetime
+import hashlib
+import json
 import os
 import re
+import shutil
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from functools import partial
+from multiprocessing import freeze_support
 from pathlib import Path
 import pandas as pd
 
+try:
+    from pandas._libs.parsers import STR_NA_VALUES
+except ImportError:  # pragma: no cover - private pandas API moved
+    STR_NA_VALUES = {
+        "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND",
+        "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+    }
+
 try:
     from purger_state import DEFAULT_START_ID, get_purge_statistics
 except ImportError:
     DEFAULT_START_ID = 100001
     get_purge_statistics = None
 
+try:
+    from purger_catalog import budget_workbook_path, catalog_path, parse_archive_name, record_files
+except ImportError:
+    budget_workbook_path = catalog_path = parse_archive_name = record_files = None
+
+try:
+    from purger_checksums import replace_manifest_entries
+except ImportError:
+    replace_manifest_entries = None
+
+# Bump whenever parsing changes so --reprocess-archive rebuilds every export.
+PARSER_VERSION = 2
+BUDGET_EXPORT_DIRNAME = "NDIS_Budget_Exports"
+BUDGET_MARKER_NAME = "_budget_source.json"
+BUDGET_LONG_NAME = "Budget_Long.csv"
+BUDGET_LONG_COLUMNS = ("universal_id", "entry_index", "entry", "line", "day", "field", "value")
+BUDGET_DATASET_COLUMNS = ("client",) + BUDGET_LONG_COLUMNS
+DEFAULT_ARCHIVE_ROOT = Path(
+    os.getenv("PURGED_ARCHIVE_ROOT", str(Path.home() / "PurgedClients"))
+).expanduser()
+
 
 def _get_purger_stats():
     if not get_purge_statistics:
@@ -19,12 +61,35 @@ def _get_purger_stats():
         return None
 
 
+def _catalog_budget_workbook(universal_id):
+    """Look the workbook up in the archive catalog; None when it is unavailable."""
+    if not budget_workbook_path:
+        return None
+    db_path = catalog_path(DEFAULT_ARCHIVE_ROOT)
+    if not db_path.exists():
+        return None
+    try:
+        path = budget_workbook_path(db_path, universal_id)
+    except sqlite3.Error:
+        return None
+    return path if path and path.exists() else None
+
+
 def auto_detect_excel_file():
-    """Return the most relevant Excel export for the universal client, if present."""
+    """
+    Return the most relevant Excel export for the universal client, if present.
+    The archive catalog is consulted first; the working directory is only
+    scanned when the catalog has no budget workbook for that client.
+    """
     root = Path.cwd()
     stats = _get_purger_stats()
     preferred_prefixes = []
 
+    if stats:
+        catalogued = _catalog_budget_workbook(max(DEFAULT_START_ID, stats["next_universal_id"] - 1))
+        if catalogued:
+            return catalogued
+
     candidate_dirs = []
     if stats:
         last_sequence = max(DEFAULT_START_ID, stats["next_universal_id"] - 1)
@@ -66,101 +131,386 @@ def auto_detect_excel_file():
     return scoring[0][2]
 
 
-def process_budget_excel(excel_path, sheet_name=None, export_folder=None, quiet=False):
+DAY_NAMES = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+EXCEL_ERROR_VALUES = {
+    "#NULL!", "#DIV/0!", "#VALUE!", "#REF!", "#NAME?", "#NUM!", "#N/A", "#GETTING_DATA",
+}
+
+
+def _entry_file_name(name):
+    return re.sub(r"[^A-Za-z0-9 _-]", "_", name) + ".csv"
+
+
+def _universal_id_from_path(excel_path):
+    """Archived workbooks and client folders are prefixed with the universal ID."""
+    for name in (excel_path.name, excel_path.parent.name):
+        match = re.match(r"(\d+)\s", name)
+        if match:
+            return match.group(1)
+    return ""
+
+
+def _long_rows(universal_id, entry_index, name, header, rows):
     """
-    Parse a TurnPoint budget export into CSVs.
+    Melt one entry's day rows into (universal_id, entry_index, entry, line, day,
+    field, value) records. Blank cells are dropped; unnamed columns get column_<n>.
+    """
+    fields = [value or f"column_{position}" for position, value in enumerate(header, start=1)]
+    records = []
+    for line, row in enumerate(rows, start=1):
+        day = row[0]
+        for position, value in enumerate(row[1:], start=2):
+            if value == "":
+                continue
+            field = fields[position - 1] if position <= len(fields) else f"column_{position}"
+            records.append([universal_id, entry_index, name, line, day, field, value])
+    return records
+
+
+def _find_entry_blocks(df_raw):
+    """
+    Locate agreement entry blocks with vectorised masks.
 
-    Returns a dict containing summary information so callers can react programmatically.
+    Rows are grouped by a cumulative "Agreement entry" counter. Inside a block, day
+    rows only count once a "Day" header row has been seen, and the block is
+    written with the last header row it contains. Returns a list of
+    (name, header_position, day_positions) tuples in sheet order.
     """
+    if df_raw.empty:
+        return []
+    first = df_raw[0]
+    is_entry = first.str.lower().str.startswith("agreement entry")
+    is_header = first.eq("Day")
+    entry_id = is_entry.cumsum()
+    positions = pd.Series(range(len(df_raw)), index=df_raw.index)
+    header_seen = positions.where(is_header).groupby(entry_id).ffill().notna()
+    is_day = first.isin(DAY_NAMES) & header_seen & entry_id.gt(0)
+
+    names = first[is_entry].str.split(":", n=1)
+    names = names.map(lambda parts: parts[1] if len(parts) > 1 else parts[0]).str.strip()
+    last_header = positions[is_header].groupby(entry_id[is_header]).last()
+    day_positions = positions[is_day].groupby(entry_id[is_day]).agg(list)
+
+    blocks = []
+    for block_id, name in enumerate(names.tolist(), start=1):
+        blocks.append(
+            (name, last_header.get(block_id), day_positions.get(block_id, []))
+        )
+    return blocks
 
-    def log(message):
-        if not quiet:
-            print(message)
 
-    excel_path = Path(excel_path).expanduser().resolve()
-    if not excel_path.exists():
-        raise FileNotFoundError(f"Excel file not found: {excel_path}")
+def _export_entry_blocks(df_raw, entry_folder, log, long_writer=None, universal_id=""):
+    """
+    Write one CSV per agreement entry by slicing its day rows out of df_raw.
+    With long_writer, every exported entry is also melted into the long table.
+    """
+    entries_exported = 0
+    for name, header_position, day_positions in _find_entry_blocks(df_raw):
+        log(f"\n🔎 Found new agreement entry: {name}")
+        if header_position is not None:
+            log("   🧱 Found header row for day entries.")
+        if not name or not day_positions:
+            continue
+        header = df_raw.iloc[header_position].tolist()
+        file_path = entry_folder / _entry_file_name(name)
+        df_raw.iloc[day_positions].to_csv(file_path, index=False, header=header)
+        log(f"   ✅ Exported entry '{name}' to:\n      {file_path}")
+        entries_exported += 1
+        if long_writer is not None:
+            long_writer.writerows(
+                _long_rows(
+                    universal_id,
+                    entries_exported,
+                    name,
+                    header,
+                    df_raw.iloc[day_positions].values.tolist(),
+                )
+            )
+    return entries_exported
+
+
+# ---------------- streaming ingestion ---------------- #
+# The streaming path reproduces what pd.read_excel(header=None, dtype=str) and
+# the cleaning step produce, so both paths write the same bytes:
+#   * empty cells become "" and trailing "" cells are trimmed per row,
+#   * whole numbers are read as int, errors and pandas' NA strings become "",
+#   * trailing blank rows are dropped and every row is padded to the widest row.
+
+
+def _convert_openpyxl_cell(cell):
+    if cell.value is None:
+        return ""
+    if cell.data_type == "e":
+        return None
+    if cell.data_type == "n":
+        whole = int(cell.value)
+        return whole if whole == cell.value else float(cell.value)
+    return cell.value
+
+
+def _convert_calamine_value(value):
+    if isinstance(value, float):
+        whole = int(value)
+        return whole if whole == value else value
+    if isinstance(value, datetime.date) and not isinstance(value, datetime.datetime):
+        return datetime.datetime.combine(value, datetime.time())
+    if isinstance(value, str) and value in EXCEL_ERROR_VALUES:
+        return None
+    return value
 
-    log("\n📄 Using Excel file: {}".format(excel_path))
 
-    # --- Load Excel workbook ---
-    log("🔍 Reading workbook and listing sheets...")
-    excel_file = pd.ExcelFile(excel_path)
-    log(f"   ✅ Sheets found: {excel_file.sheet_names}")
+@contextmanager
+def _open_sheet_rows(excel_path, sheet_name=None):
+    """
+    Open the workbook once, read-only, and yield (sheet_names, sheet, rows).
+    Uses python-calamine when installed, otherwise openpyxl's read-only reader.
+    """
+    try:
+        from python_calamine import CalamineWorkbook  # type: ignore
+    except ImportError:
+        CalamineWorkbook = None
+
+    if CalamineWorkbook is not None:
+        workbook = CalamineWorkbook.from_path(str(excel_path))
+        try:
+            selected = sheet_name or workbook.sheet_names[0]
+            sheet = workbook.get_sheet_by_name(selected)
+            offset = [""] * (sheet.start[1] if sheet.start else 0)
+            rows = (offset + [_convert_calamine_value(v) for v in row] for row in sheet.iter_rows())
+            yield workbook.sheet_names, selected, rows
+        finally:
+            workbook.close()
+        return
+
+    from openpyxl import load_workbook
 
-    if sheet_name:
-        selected_sheet = sheet_name
-    else:
-        selected_sheet = excel_file.sheet_names[0]
+    workbook = load_workbook(excel_path, read_only=True, data_only=True, keep_links=False)
+    try:
+        selected = sheet_name or workbook.sheetnames[0]
+        sheet = workbook[selected]
+        sheet.reset_dimensions()
+        rows = ([_convert_openpyxl_cell(cell) for cell in row] for row in sheet.rows)
+        yield workbook.sheetnames, selected, rows
+    finally:
+        workbook.close()
+
+
+def _clean_cell(value):
+    if value is None:
+        return ""
+    text = str(value)
+    return "" if text in STR_NA_VALUES else text.strip()
+
+
+def _iter_clean_rows(raw_rows):
+    """Yield trimmed, cleaned rows; blank rows are held back until more data follows."""
+    blank_rows = 0
+    for raw in raw_rows:
+        while raw and raw[-1] == "":
+            raw.pop()
+        if not raw:
+            blank_rows += 1
+            continue
+        for _ in range(blank_rows):
+            yield []
+        blank_rows = 0
+        yield [_clean_cell(value) for value in raw]
 
-    log(f"\n📖 Reading sheet: '{selected_sheet}' ...")
-    df_raw = pd.read_excel(excel_path, sheet_name=selected_sheet, header=None, dtype=str)
-    df_raw = df_raw.fillna("").astype(str).apply(lambda col: col.map(lambda x: x.strip()))
-    log("   ✅ Sheet loaded successfully.")
 
-    # --- Create export folder ---
-    if export_folder:
-        export_path = Path(export_folder).expanduser().resolve()
-    else:
-        export_path = excel_path.parent / "NDIS_Budget_Exports"
-    export_path.mkdir(parents=True, exist_ok=True)
-    log(f"\n📂 Export folder (created/used): {export_path}")
+def _csv_writer(fh):
+    return csv.writer(fh, lineterminator=os.linesep)
 
-    # --- Save full raw sheet as backup ---
-    main_path = export_path / "Main_Agreement.csv"
-    df_raw.to_csv(main_path, index=False, header=False)
-    log("   ✅ Saved full raw sheet backup to:")
-    log(f"      {main_path}")
 
-    # --- Prepare entry folder ---
-    entry_folder = export_path / "Entries"
-    entry_folder.mkdir(parents=True, exist_ok=True)
-    log(f"\n📁 Entry CSVs will be saved in:\n   {entry_folder}")
+def _write_padded_csv(path, rows, width):
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = _csv_writer(fh)
+        for row in rows:
+            writer.writerow(row + [""] * (width - len(row)))
 
-    # --- Parse and export each “Agreement entry” ---
-    log("\n🧩 Parsing agreement entries and day rows...")
 
+def _repad_csv(source, target, width):
+    """Rewrite a CSV so every row has `width` fields (used once the final width is known)."""
+    with open(source, newline="", encoding="utf-8") as fh:
+        tmp = target.with_name(target.name + ".tmp")
+        _write_padded_csv(tmp, csv.reader(fh), width)
+    os.replace(tmp, target)
+
+
+def _stream_entry_blocks(raw_rows, main_path, entry_folder, log, long_writer=None, universal_id=""):
+    """
+    Parse agreement blocks while rows are read. Each entry CSV is written as soon
+    as its block ends, padded to the widest row seen so far; the few files written
+    before a wider row turned up are re-padded at the end. Only the current block
+    is held in memory. Returns (entries_exported, total_rows).
+    """
+    width = 0
+    total_rows = 0
+    written = {}
     entries_exported = 0
     current_name = None
     header = None
     entry_rows = []
-    day_names = {"Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"}
+    partial_main = main_path.with_name(main_path.name + ".partial")
 
     def flush_entry():
-        nonlocal entries_exported, entry_rows, header, current_name
+        nonlocal entries_exported
         if current_name and entry_rows:
-            df_entry = pd.DataFrame(entry_rows, columns=header)
-            safe_name = re.sub(r"[^A-Za-z0-9 _-]", "_", current_name)
-            file_path = entry_folder / f"{safe_name}.csv"
-            df_entry.to_csv(file_path, index=False)
+            file_path = entry_folder / _entry_file_name(current_name)
+            _write_padded_csv(file_path, [header, *entry_rows], width)
+            written[file_path] = width
             log(f"   ✅ Exported entry '{current_name}' to:\n      {file_path}")
             entries_exported += 1
+            if long_writer is not None:
+                long_writer.writerows(
+                    _long_rows(universal_id, entries_exported, current_name, header, entry_rows)
+                )
+
+    with open(partial_main, "w", newline="", encoding="utf-8") as main_fh:
+        main_writer = _csv_writer(main_fh)
+        for row in _iter_clean_rows(raw_rows):
+            main_writer.writerow(row)
+            total_rows += 1
+            width = max(width, len(row))
+            first_col = row[0] if row else ""
+
+            if first_col.lower().startswith("agreement entry"):
+                flush_entry()
+                parts = first_col.split(":", 1)
+                current_name = parts[1].strip() if len(parts) > 1 else first_col
+                log(f"\n🔎 Found new agreement entry: {current_name}")
+                header = None
+                entry_rows = []
+                continue
+            if first_col == "Day":
+                header = row
+                log("   🧱 Found header row for day entries.")
+                continue
+            if header and first_col in DAY_NAMES:
+                entry_rows.append(row)
+        flush_entry()
+
+    _repad_csv(partial_main, main_path, width)
+    partial_main.unlink()
+    for file_path, used_width in written.items():
+        if used_width < width:
+            _repad_csv(file_path, file_path, width)
+    return entries_exported, total_rows
+
+
+@contextmanager
+def _long_format_writer(long_path):
+    """Yield a csv writer for Budget_Long.csv (or None), swapped into place on success."""
+    if long_path is None:
+        yield None
+        return
+    partial = long_path.with_name(long_path.name + ".partial")
+    try:
+        with open(partial, "w", newline="", encoding="utf-8") as fh:
+            writer = _csv_writer(fh)
+            writer.writerow(BUDGET_LONG_COLUMNS)
+            yield writer
+        os.replace(partial, long_path)
+    finally:
+        partial.unlink(missing_ok=True)
+
+
+def _parse_budget_sheet(
+    excel_path, sheet_name, export_path, main_path, entry_folder, streaming, log,
+    long_writer, universal_id,
+):
+    """Read the sheet (streaming or via pandas) and export its entries."""
+    if streaming:
+        log("🔍 Opening workbook (read-only, streaming)...")
+        with _open_sheet_rows(excel_path, sheet_name) as (sheet_names, selected_sheet, rows):
+            log(f"   ✅ Sheets found: {sheet_names}")
+            log(f"\n📂 Export folder (created/used): {export_path}")
+            log(f"\n🧩 Streaming sheet '{selected_sheet}' into entry CSVs...")
+            entries_exported, _ = _stream_entry_blocks(
+                rows, main_path, entry_folder, log, long_writer, universal_id
+            )
+        log(f"   ✅ Saved full raw sheet backup to:\n      {main_path}")
+    else:
+        # --- Load Excel workbook ---
+        log("🔍 Reading workbook and listing sheets...")
+        excel_file = pd.ExcelFile(excel_path)
+        log(f"   ✅ Sheets found: {excel_file.sheet_names}")
+
+        if sheet_name:
+            selected_sheet = sheet_name
+        else:
+            selected_sheet = excel_file.sheet_names[0]
+
+        log(f"\n📖 Reading sheet: '{selected_sheet}' ...")
+        df_raw = pd.read_excel(excel_file, sheet_name=selected_sheet, header=None, dtype=str)
+        df_raw = df_raw.fillna("").astype(str).apply(lambda col: col.str.strip())
+        log("   ✅ Sheet loaded successfully.")
+        log(f"\n📂 Export folder (created/used): {export_path}")
+
+        # --- Save full raw sheet as backup ---
+        df_raw.to_csv(main_path, index=False, header=False)
+        log("   ✅ Saved full raw sheet backup to:")
+        log(f"      {main_path}")
+        log(f"\n📁 Entry CSVs will be saved in:\n   {entry_folder}")
+
+        # --- Parse and export each “Agreement entry” ---
+        log("\n🧩 Parsing agreement entries and day rows...")
+        entries_exported = _export_entry_blocks(df_raw, entry_folder, log, long_writer, universal_id)
+    return entries_exported, selected_sheet
+
+
+def process_budget_excel(
+    excel_path,
+    sheet_name=None,
+    export_folder=None,
+    quiet=False,
+    streaming=False,
+    long_format=False,
+    universal_id=None,
+):
+    """
+    Parse a TurnPoint budget export into CSVs.
 
-    for _, row in df_raw.iterrows():
-        first_col = row[0].strip()
+    With streaming=True the workbook is opened once in read-only mode and each
+    entry CSV is written as soon as its block has been read (same output bytes).
+    With long_format=True every entry is also written to Budget_Long.csv, one row
+    per (entry, day row, field), tagged with the client's universal ID.
+    Returns a dict containing summary information (including the (path, size) of
+    every file in the export) so callers can react programmatically.
+    """
 
-        if first_col.lower().startswith("agreement entry"):
-            flush_entry()
-            parts = first_col.split(":", 1)
-            current_name = parts[1].strip() if len(parts) > 1 else first_col.strip()
-            log(f"\n🔎 Found new agreement entry: {current_name}")
-            header = None
-            entry_rows = []
-            continue
+    def log(message):
+        if not quiet:
+            print(message)
 
-        if first_col == "Day":
-            header = list(row)
-            log("   🧱 Found header row for day entries.")
-            continue
+    excel_path = Path(excel_path).expanduser().resolve()
+    if not excel_path.exists():
+        raise FileNotFoundError(f"Excel file not found: {excel_path}")
 
-        if header and first_col in day_names:
-            entry_rows.append(list(row)[: len(header)])
-            continue
+    log("\n📄 Using Excel file: {}".format(excel_path))
 
-        if first_col.startswith("Monthly Total"):
-            continue
+    # --- Create export folder ---
+    if export_folder:
+        export_path = Path(export_folder).expanduser().resolve()
+    else:
+        export_path = excel_path.parent / BUDGET_EXPORT_DIRNAME
+    export_path.mkdir(parents=True, exist_ok=True)
+    main_path = export_path / "Main_Agreement.csv"
+    entry_folder = export_path / "Entries"
+    entry_folder.mkdir(parents=True, exist_ok=True)
+    long_path = export_path / BUDGET_LONG_NAME if long_format else None
+    if universal_id is None:
+        universal_id = _universal_id_from_path(excel_path)
+
+    with _long_format_writer(long_path) as long_writer:
+        entries_exported, selected_sheet = _parse_budget_sheet(
+            excel_path, sheet_name, export_path, main_path, entry_folder,
+            streaming, log, long_writer, str(universal_id),
+        )
 
-    flush_entry()
+    written = [main_path, *(Path(entry.path) for entry in os.scandir(entry_folder) if entry.is_file())]
+    if long_path:
+        written.append(long_path)
+    files = [(path, path.stat().st_size) for path in written]
 
     log("\n✅ Parsing complete.")
     log(f"📊 Total agreement entry CSVs created: {entries_exported}")
@@ -179,9 +529,308 @@ def process_budget_excel(excel_path, sheet_name=None, export_folder=None, quiet=
         "entry_folder": entry_folder,
         "sheet_name": selected_sheet,
         "excel_path": excel_path,
+        "long_path": long_path,
+        "files": files,
     }
 
 
+# ---------------- offline archive re-processing ---------------- #
+
+
+def _file_sha256(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def find_budget_workbooks(archive_root):
+    """
+    Return the budget workbooks saved at the top level of each client archive.
+    Client documents live in a subfolder, so spreadsheets there are not picked up.
+    """
+    root = Path(archive_root).expanduser()
+    workbooks = []
+    for folder in sorted(p for p in root.iterdir() if p.is_dir() and not p.name.startswith("_")):
+        for pattern in ("*.xlsx", "*.xls"):
+            workbooks.extend(
+                sorted(path for path in folder.glob(pattern) if not path.name.startswith("~$"))
+            )
+    return workbooks
+
+
+def _read_budget_marker(export_path):
+    try:
+        return json.loads((export_path / BUDGET_MARKER_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _refresh_archive_records(excel_path, export_path):
+    """
+    Point the archive's _checksums.csv and catalog rows at a rebuilt export, so
+    --verify and the catalog see the new files rather than the replaced ones.
+    Archives without a manifest or catalog entry are left as they are.
+    """
+    folder = excel_path.parent
+    files = [path for path in sorted(export_path.rglob("*")) if path.is_file()]
+    manifest = None
+    if replace_manifest_entries:
+        manifest = replace_manifest_entries(
+            folder,
+            "budget_export",
+            {
+                path.relative_to(folder).as_posix(): {
+                    "bytes": path.stat().st_size,
+                    "sha256": _file_sha256(path),
+                    "kind": "budget_export",
+                    "source": excel_path.name,
+                }
+                for path in files
+            },
+        )
+    if not record_files:
+        return
+    db_path = catalog_path(folder.parent)
+    parsed = parse_archive_name(folder.name)
+    if not db_path.exists() or not parsed:
+        return
+    try:
+        record_files(db_path, parsed[0], [(path, None) for path in files], kind="budget_export", replace=True)
+        if manifest is not None:
+            record_files(db_path, parsed[0], [(manifest, None)], kind="checksums")
+    except KeyError:
+        pass  # archive not catalogued yet; --rebuild-catalog picks the new files up
+
+
+def reprocess_budget_workbook(excel_path, *, force=False, streaming=True, long_format=False):
+    """
+    Rebuild one workbook's NDIS_Budget_Exports folder unless its marker shows the
+    same content hash and PARSER_VERSION (and a long table when one is requested).
+    The export is built next to the old one and swapped in, so a failure leaves
+    the previous export untouched; the archive's checksum manifest and catalog
+    rows are then updated to the new files.
+    """
+    excel_path = Path(excel_path)
+    export_path = excel_path.parent / BUDGET_EXPORT_DIRNAME
+    result = {
+        "client": excel_path.parent.name,
+        "workbook": excel_path.name,
+        "status": "cached",
+        "entries": None,
+        "seconds": 0.0,
+        "error": "",
+    }
+    started = time.perf_counter()
+    try:
+        digest = _file_sha256(excel_path)
+    except OSError as exc:
+        result.update(status="failed", error=str(exc))
+        return result
+    marker = _read_budget_marker(export_path)
+    if (
+        not force
+        and marker.get("sha256") == digest
+        and marker.get("parser_version") == PARSER_VERSION
+        and (marker.get("long_format") or not long_format)
+    ):
+        result["entries"] = marker.get("entries_exported")
+        return result
+
+    staging = export_path.with_name(f"{export_path.name}.partial")
+    previous = export_path.with_name(f"{export_path.name}.old")
+    shutil.rmtree(staging, ignore_errors=True)
+    try:
+        summary = process_budget_excel(
+            excel_path,
+            export_folder=staging,
+            quiet=True,
+            streaming=streaming and excel_path.suffix.lower() == ".xlsx",
+            long_format=long_format,
+        )
+        marker = {
+            "workbook": excel_path.name,
+            "sha256": digest,
+            "parser_version": PARSER_VERSION,
+            "entries_exported": summary["entries_exported"],
+            "long_format": bool(long_format),
+            "processed_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        }
+        (staging / BUDGET_MARKER_NAME).write_text(json.dumps(marker, indent=2), encoding="utf-8")
+        shutil.rmtree(previous, ignore_errors=True)
+        if export_path.exists():
+            export_path.rename(previous)
+        staging.rename(export_path)
+        shutil.rmtree(previous, ignore_errors=True)
+        _refresh_archive_records(excel_path, export_path)
+    except Exception as exc:
+        shutil.rmtree(staging, ignore_errors=True)
+        result.update(status="failed", error=str(exc))
+        return result
+    result.update(
+        status="processed",
+        entries=summary["entries_exported"],
+        seconds=round(time.perf_counter() - started, 2),
+    )
+    return result
+
+
+def reprocess_archive(
+    archive_root=None, *, workers=None, force=False, streaming=True, long_format=False
+):
+    """Re-run the parser over every budget workbook in the archive using a process pool."""
+    workbooks = find_budget_workbooks(archive_root or DEFAULT_ARCHIVE_ROOT)
+    job = partial(
+        reprocess_budget_workbook, force=force, streaming=streaming, long_format=long_format
+    )
+    workers = workers or min(4, os.cpu_count() or 1)
+    if workers > 1 and len(workbooks) > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=min(workers, len(workbooks))) as pool:
+                return list(pool.map(job, workbooks))
+        except (BrokenProcessPool, OSError) as exc:
+            print(f"⚠️ Parallel re-processing unavailable ({exc}); running serially.")
+    return [job(path) for path in workbooks]
+
+
+def format_reprocess_summary(results):
+    """Render re-processing results as a plain-text table with a totals line."""
+    columns = ("Client", "Workbook", "Status", "Entries", "Seconds")
+    rows = [
+        (
+            item["client"],
+            item["workbook"],
+            item["status"] + (f" ({item['error']})" if item["error"] else ""),
+            "" if item["entries"] is None else str(item["entries"]),
+            f"{item['seconds']:.2f}",
+        )
+        for item in results
+    ]
+    widths = [max([len(column)] + [len(row[index]) for row in rows]) for index, column in enumerate(columns)]
+    lines = ["  ".join(column.ljust(width) for column, width in zip(columns, widths))]
+    lines.append("  ".join("-" * width for width in widths))
+    lines.extend("  ".join(value.ljust(width) for value, width in zip(row, widths)) for row in rows)
+    statuses = {status: sum(1 for item in results if item["status"] == status)
+                for status in ("processed", "cached", "failed")}
+    entries = sum(item["entries"] or 0 for item in results)
+    lines.append(
+        f"{len(results)} workbook(s): {statuses['processed']} processed, "
+        f"{statuses['cached']} cached, {statuses['failed']} failed; {entries} entries."
+    )
+    return "\n".join(lines)
+
+
+def write_reprocess_summary(results, path):
+    path = Path(path).expanduser()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["client", "workbook", "status", "entries", "seconds", "error"])
+        for item in results:
+            writer.writerow(
+                [item["client"], item["workbook"], item["status"],
+                 "" if item["entries"] is None else item["entries"], item["seconds"], item["error"]]
+            )
+    return path
+
+
+# ---------------- cross-client dataset ---------------- #
+
+
+def _iter_long_tables(archive_root):
+    """Yield (client_folder, Budget_Long.csv) for every archive that has a long table."""
+    for workbook in find_budget_workbooks(archive_root):
+        long_path = workbook.parent / BUDGET_EXPORT_DIRNAME / BUDGET_LONG_NAME
+        if long_path.exists():
+            yield workbook.parent.name, long_path
+
+
+def _read_long_table(client, long_path):
+    with open(long_path, newline="", encoding="utf-8") as fh:
+        reader = csv.reader(fh)
+        next(reader, None)
+        return [[client, *row] for row in reader]
+
+
+def _write_sqlite_dataset(tables, output):
+    tmp_path = output.with_name(output.name + ".tmp")
+    tmp_path.unlink(missing_ok=True)
+    conn = sqlite3.connect(str(tmp_path))
+    rows = 0
+    try:
+        conn.execute(
+            "CREATE TABLE budget_lines (client TEXT, universal_id TEXT, entry_index INTEGER, "
+            "entry TEXT, line INTEGER, day TEXT, field TEXT, value TEXT)"
+        )
+        with conn:
+            for client, long_path in tables:
+                records = _read_long_table(client, long_path)
+                conn.executemany(
+                    "INSERT INTO budget_lines VALUES (?, ?, ?, ?, ?, ?, ?, ?)", records
+                )
+                rows += len(records)
+        conn.execute("CREATE INDEX budget_lines_client ON budget_lines (universal_id, entry_index)")
+        conn.execute("CREATE INDEX budget_lines_field ON budget_lines (field)")
+    finally:
+        conn.close()
+    os.replace(tmp_path, output)
+    return rows
+
+
+def _write_parquet_dataset(tables, output):
+    """Stream one row group per client through ParquetWriter, so memory stays at one client."""
+    try:
+        import pyarrow as pa  # type: ignore
+        import pyarrow.parquet as pq  # type: ignore
+    except ImportError as exc:
+        raise RuntimeError(
+            "Parquet output requires pyarrow. Install it with `pip install pyarrow` "
+            "or write the dataset as .sqlite instead."
+        ) from exc
+    schema = pa.schema(
+        [
+            (name, pa.int64() if name in ("entry_index", "line") else pa.string())
+            for name in BUDGET_DATASET_COLUMNS
+        ]
+    )
+    tmp_path = output.with_name(output.name + ".tmp")
+    rows = 0
+    try:
+        with pq.ParquetWriter(str(tmp_path), schema) as writer:
+            for client, long_path in tables:
+                frame = pd.DataFrame(
+                    _read_long_table(client, long_path), columns=BUDGET_DATASET_COLUMNS
+                ).astype({"entry_index": "int64", "line": "int64"})
+                if frame.empty:
+                    continue
+                writer.write_table(pa.Table.from_pandas(frame, schema=schema, preserve_index=False))
+                rows += len(frame)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    os.replace(tmp_path, output)
+    return rows
+
+
+def build_budget_dataset(output, archive_root=None):
+    """
+    Collect every client's Budget_Long.csv under the archive into one table.
+    The format follows the output suffix: .parquet writes a Parquet file,
+    anything else a SQLite database with a `budget_lines` table. Each client is
+    inserted in bulk (one Parquet row group per client) and the file is swapped
+    in once complete.
+    """
+    output = Path(output).expanduser()
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tables = list(_iter_long_tables(archive_root or DEFAULT_ARCHIVE_ROOT))
+    if output.suffix.lower() == ".parquet":
+        rows = _write_parquet_dataset(tables, output)
+    else:
+        rows = _write_sqlite_dataset(tables, output)
+    return {"clients": len(tables), "rows": rows, "path": output}
+
+
 def generate_budget_exports():
     print("🧾 NDIS Budget Export Tool")
     print("--------------------------")
@@ -220,5 +869,70 @@ def generate_budget_exports():
         print("\n⚠️ No entries detected; please double-check the spreadsheet.")
 
 
-if __name__ == "__main__":
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="NDIS budget export tool.")
+    parser.add_argument(
+        "excel",
+        nargs="?",
+        help="Budget workbook to split into CSVs (prompts with auto-detection when omitted).",
+    )
+    parser.add_argument(
+        "--reprocess-archive",
+        nargs="?",
+        const=str(DEFAULT_ARCHIVE_ROOT),
+        metavar="ROOT",
+        help="Rebuild NDIS_Budget_Exports for every client under ROOT (default: PURGED_ARCHIVE_ROOT).",
+    )
+    parser.add_argument("--workers", type=int, help="Processes used by --reprocess-archive.")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-process workbooks even when their hash and parser version are unchanged.",
+    )
+    parser.add_argument(
+        "--no-streaming",
+        action="store_true",
+        help="Parse through a pandas DataFrame instead of the streaming reader.",
+    )
+    parser.add_argument("--summary-csv", help="Also write the re-processing summary to this CSV.")
+    parser.add_argument(
+        "--long-format",
+        action="store_true",
+        help="Also write Budget_Long.csv (one row per entry/day/field) for each workbook.",
+    )
+    parser.add_argument(
+        "--dataset",
+        metavar="PATH",
+        help="Combine every archive's Budget_Long.csv into one .sqlite or .parquet dataset.",
+    )
+    args = parser.parse_args(argv)
+    long_format = args.long_format or bool(args.dataset)
+
+    if args.reprocess_archive:
+        results = reprocess_archive(
+            args.reprocess_archive,
+            workers=args.workers,
+            force=args.force,
+            streaming=not args.no_streaming,
+            long_format=long_format,
+        )
+        print(format_reprocess_summary(results))
+        if args.summary_csv:
+            print(f"Summary written to {write_reprocess_summary(results, args.summary_csv)}")
+    if args.dataset:
+        dataset = build_budget_dataset(args.dataset, args.reprocess_archive)
+        print(
+            f"Budget dataset: {dataset['rows']} rows from {dataset['clients']} client(s) "
+            f"written to {dataset['path']}"
+        )
+    if args.reprocess_archive or args.dataset:
+        return
+    if args.excel:
+        process_budget_excel(args.excel, streaming=not args.no_streaming, long_format=long_format)
+        return
     generate_budget_exports()
+
+
+if __name__ == "__main__":
+    freeze_support()
+    main()
@@ -0,0 +1,181 @@
+"""
+Benchmark the NDISBUDGETER parser against the original iterrows implementation.
+
+Builds a synthetic multi-year budget workbook, runs both parsers on it, checks
+that every CSV they write is byte-identical and prints the timings:
+
+    python benchmarks/budget_parser_benchmark.py --entries 400 --days 730
+"""
+
+import argparse
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import NDISBUDGETER  # noqa: E402
+
+DAY_NAMES = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+
+def legacy_clean(df_raw):
+    return df_raw.fillna("").astype(str).apply(lambda col: col.map(lambda x: x.strip()))
+
+
+def legacy_export_entries(df_raw, entry_folder):
+    """The pre-vectorisation iterrows loop, kept verbatim (minus logging) as the baseline."""
+    entries_exported = 0
+    current_name = None
+    header = None
+    entry_rows = []
+    day_names = {"Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"}
+
+    def flush_entry():
+        nonlocal entries_exported, entry_rows, header, current_name
+        if current_name and entry_rows:
+            df_entry = pd.DataFrame(entry_rows, columns=header)
+            safe_name = re.sub(r"[^A-Za-z0-9 _-]", "_", current_name)
+            df_entry.to_csv(entry_folder / f"{safe_name}.csv", index=False)
+            entries_exported += 1
+
+    for _, row in df_raw.iterrows():
+        first_col = row[0].strip()
+        if first_col.lower().startswith("agreement entry"):
+            flush_entry()
+            parts = first_col.split(":", 1)
+            current_name = parts[1].strip() if len(parts) > 1 else first_col.strip()
+            header = None
+            entry_rows = []
+            continue
+        if first_col == "Day":
+            header = list(row)
+            continue
+        if header and first_col in day_names:
+            entry_rows.append(list(row)[: len(header)])
+            continue
+        if first_col.startswith("Monthly Total"):
+            continue
+
+    flush_entry()
+    return entries_exported
+
+
+def legacy_process_budget_excel(excel_path, export_folder):
+    """The original process_budget_excel pipeline without logging."""
+    excel_path = Path(excel_path)
+    excel_file = pd.ExcelFile(excel_path)
+    df_raw = pd.read_excel(excel_path, sheet_name=excel_file.sheet_names[0], header=None, dtype=str)
+    df_raw = legacy_clean(df_raw)
+    export_path = Path(export_folder)
+    export_path.mkdir(parents=True, exist_ok=True)
+    df_raw.to_csv(export_path / "Main_Agreement.csv", index=False, header=False)
+    entry_folder = export_path / "Entries"
+    entry_folder.mkdir(parents=True, exist_ok=True)
+    return {"entries_exported": legacy_export_entries(df_raw, entry_folder)}
+
+
+def _best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def build_workbook(path, entries, days):
+    rows = [["NDIS Service Agreement Budget", "", "", "", "", ""]]
+    for entry in range(entries):
+        rows.append([f"Agreement entry: Support {entry:04d} / Core", "", "", "", "", ""])
+        rows.append(["Day", "Date", "Start", "End", "Hours", " Rate "])
+        for day in range(days):
+            rows.append(
+                [DAY_NAMES[day % 7], f"2024-{day % 12 + 1:02d}-{day % 28 + 1:02d}",
+                 "09:00", "11:30", " 2.5 ", f"{65.47 + entry % 5:.2f}"]
+            )
+            if day % 30 == 29:
+                rows.append([f"Monthly Total {day // 30 + 1}", "", "", "", "75", ""])
+    pd.DataFrame(rows).to_excel(path, index=False, header=False)
+    return len(rows)
+
+
+def compare_outputs(left: Path, right: Path):
+    left_files = sorted(p.relative_to(left) for p in left.rglob("*.csv"))
+    right_files = sorted(p.relative_to(right) for p in right.rglob("*.csv"))
+    if left_files != right_files:
+        raise AssertionError("Parsers wrote different sets of files.")
+    for relative in left_files:
+        if (left / relative).read_bytes() != (right / relative).read_bytes():
+            raise AssertionError(f"{relative} differs between parsers.")
+    return len(left_files)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=200)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        workbook = tmp / "budget.xlsx"
+        rows = build_workbook(workbook, args.entries, args.days)
+        print(f"Workbook: {rows} rows, {args.entries} entries")
+        raw = pd.read_excel(workbook, header=None, dtype=str)
+        legacy_dir, current_dir = tmp / "legacy_parse", tmp / "current_parse"
+        legacy_dir.mkdir()
+        current_dir.mkdir()
+        parse = {
+            "legacy": _best_of(
+                args.repeat, lambda: legacy_export_entries(legacy_clean(raw), legacy_dir)
+            ),
+            "current": _best_of(
+                args.repeat,
+                lambda: NDISBUDGETER._export_entry_blocks(
+                    raw.fillna("").astype(str).apply(lambda col: col.str.strip()),
+                    current_dir,
+                    lambda message: None,
+                ),
+            ),
+        }
+        end_to_end = {
+            "legacy": _best_of(
+                args.repeat, lambda: legacy_process_budget_excel(workbook, tmp / "legacy")
+            ),
+            "current": _best_of(
+                args.repeat,
+                lambda: NDISBUDGETER.process_budget_excel(
+                    workbook, export_folder=tmp / "current", quiet=True
+                ),
+            ),
+        }
+        streaming = {
+            "legacy": end_to_end["legacy"],
+            "current": _best_of(
+                args.repeat,
+                lambda: NDISBUDGETER.process_budget_excel(
+                    workbook, export_folder=tmp / "streaming", quiet=True, streaming=True
+                ),
+            ),
+        }
+        files = compare_outputs(tmp / "legacy", tmp / "current")
+        compare_outputs(tmp / "legacy", tmp / "streaming")
+        print(f"Byte-identical output: {files} CSV files")
+        for label, timings in (
+            ("clean + parse", parse),
+            ("end to end", end_to_end),
+            ("streaming", streaming),
+        ):
+            legacy, current = timings["legacy"], timings["current"]
+            print(f"{label:14} legacy {legacy:7.3f}s  current {current:7.3f}s  ({legacy / current:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,51 @@
 import argparse
 import csv
+import errno
+import hashlib
+import json
 import os
 import re
+import heapq
+import queue
+import socket
+import sqlite3
+import statistics
+import threading
 import time
 import shutil
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import freeze_support
 from pathlib import Path
+from urllib.parse import parse_qs, urlparse
 from datetime import datetime, timezone
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    TimeoutException,
+    WebDriverException,
+)
 from dotenv import load_dotenv
 
+import purger_archive
+import purger_blobs
+import purger_catalog
+import purger_checksums
+import purger_queue
+import purger_snapshots
+import purger_sqlite_archive
+import purger_throttle
 from purger_state import (
+    STATE_DIR,
+    forget_selector,
+    get_cost_model,
+    get_learned_selector,
+    record_archive_package,
+    remember_selector,
     reserve_universal_sequence,
     record_purge_event,
     get_client_last_purge,
@@ -44,6 +76,18 @@ PDCC_ROOT = Path(
 ).expanduser().resolve()
 PDCC_DOWNLOADS_DIR = PDCC_ROOT / "_downloads"
 LATEST_PURGEABLE_EXCEL = PDCC_ROOT / "latest_purgeable_clients.xlsx"
+SNAPSHOT_CHANGES_DIR = PDCC_DOWNLOADS_DIR / "_changes"
+DISCOVERY_SOURCE = os.getenv("PURGER_DISCOVERY_SOURCE", "excel")  # "excel" or "table"
+SELECTOR_CACHE_WAIT = 3  # seconds to wait for a learned locator before relearning
+HARVEST_WORKERS = int(os.getenv("PURGER_HARVEST_WORKERS", "2"))
+HARVEST_MAX_PAGES = 500
+# Write NDIS_Budget_Exports/Budget_Long.csv alongside the per-entry CSVs.
+BUDGET_LONG_FORMAT = os.getenv("PURGER_BUDGET_LONG_FORMAT", "0") != "0"
+SNAPSHOT_KEEP = int(os.getenv("PURGER_SNAPSHOT_KEEP", "30"))
+SNAPSHOT_MAX_AGE_DAYS = float(os.getenv("PURGER_SNAPSHOT_MAX_AGE_DAYS", "0"))
+PURGEABLE_SIDECAR_VERSION = 1
+PURGEABLE_CATEGORY_RATIO = 0.5  # object columns below this unique/rows ratio become categorical
+BUNDLE_EXPORT_WORKERS = int(os.getenv("PURGER_BUNDLE_WORKERS", "0")) or min(4, os.cpu_count() or 1)
 DEFAULT_PURGEABLE_CLIENTS_URL = f"{BASE_URL.rstrip('/')}/client-list.asp?purgeable=yes"
 PURGEABLE_CLIENTS_URL = os.getenv("PURGEABLE_CLIENTS_URL")
 PACKAGE_FALLBACK_NAMES = [
@@ -82,9 +126,62 @@ FILE_PREFIX = ""
 OUTPUT_DIR = None
 DOCUMENTS_DIR = None
 FINAL_OUTPUT_DIR = None
+DOWNLOAD_DIR = None
+# Chrome downloads land here, on the same filesystem as the archives, so moving
+# them into the client folder is a rename rather than a copy.
+STAGING_ROOT = ARCHIVE_ROOT / "_staging"
+# Archives replaced by a re-purge are moved here; "_" folders are not treated as archives.
+SUPERSEDED_DIRNAME = "_superseded"
+ARCHIVE_COPY_WORKERS = int(os.getenv("PURGER_COPY_WORKERS", "4"))
+# Optional packaging of finished archives: "", "zip", "tar.zst" or "auto".
+PACKAGE_FORMAT = os.getenv("PURGER_PACKAGE_FORMAT", "").strip().lower()
+PACKAGE_DIR = ARCHIVE_ROOT / "_packages"
+# Optional content-addressed document store: "" (off), "hardlink" or "reflink".
+DOCUMENT_STORE_LINK = os.getenv("PURGER_DOCUMENT_STORE", "").strip().lower()
+DOCUMENT_STORE_DIR = purger_blobs.store_dir_for(ARCHIVE_ROOT)
+# Archive layout: "folder" (CSV/document tree), "sqlite" (one <archive>.sqlite3
+# per client) or "both". Document bytes go into the SQLite file only when
+# PURGER_SQLITE_DOCUMENTS=1; otherwise documents stay in the folder.
+ARCHIVE_FORMAT = os.getenv("PURGER_ARCHIVE_FORMAT", "folder").strip().lower() or "folder"
+SQLITE_ARCHIVE_DOCUMENTS = os.getenv("PURGER_SQLITE_DOCUMENTS", "0") == "1"
+SQLITE_ARCHIVE_PATH = None  # container being built in STAGING_ROOT for the current client
+PACKAGE_WORKERS = int(os.getenv("PURGER_PACKAGE_WORKERS", "2"))
+_PACKAGE_EXECUTOR = None
+PACKAGE_JOBS = []
 DOWNLOAD_TIMEOUT = 60  # seconds
 LOG_SINK = None
 DEFAULT_MANIFEST_PATH = Path(__file__).resolve().parent / "client_manifest.csv"
+MANIFEST_CACHE_DIR = STATE_DIR / "manifest_cache"
+MANIFEST_CACHE_VERSION = 2
+MANIFEST_ID_COLUMNS = ("client_id", "turnpoint_id", "client", "id", "eid")
+MANIFEST_NAME_COLUMNS = ("client_name", "name", "full_name")
+MANIFEST_PACKAGE_COLUMNS = ("package", "package_name")
+_MANIFEST_CACHE = {}
+BATCH_REPORTS_DIR = ARCHIVE_ROOT / "_batch_reports"
+BATCH_MAX_ATTEMPTS = int(os.getenv("PURGER_BATCH_MAX_ATTEMPTS", "3"))
+BATCH_BACKOFF_SECONDS = float(os.getenv("PURGER_BATCH_BACKOFF_SECONDS", "30"))
+BATCH_BACKOFF_CAP_SECONDS = 600
+TRANSIENT_FAILURE_KINDS = {"login", "timeout", "download", "browser"}
+LAST_PAGE_FAILURES = []
+# Set by the queue worker's heartbeat when this process loses its lease; checked between pages.
+PURGE_STOP = None
+DEFAULT_QUEUE_PATH = ARCHIVE_ROOT / "_queue" / "batch_queue.sqlite3"
+CATALOG_PATH = purger_catalog.catalog_path(ARCHIVE_ROOT)
+QUEUE_LEASE_SECONDS = int(os.getenv("PURGER_QUEUE_LEASE_SECONDS", str(purger_queue.DEFAULT_LEASE_SECONDS)))
+QUEUE_POLL_SECONDS = 15
+# Fleet-wide cap on clients in flight across all queue workers (0 = no cap). Kept
+# in queue meta; each process's AIMD throttle limit stays local to that process.
+QUEUE_FLEET_LIMIT = int(os.getenv("PURGER_FLEET_LIMIT", "0"))
+DEFAULT_CLIENT_SECONDS = 180.0
+RUN_METRICS = {}
+RUN_WRITTEN = {}  # archive-relative path -> {bytes, sha256, kind, source} for every file written
+_RUN_WRITTEN_LOCK = threading.Lock()
+VERIFY_ARCHIVE_BYTES = os.getenv("PURGER_VERIFY_BYTES", "0") == "1"
+# Budget parsing and other post-download work run on this many background threads
+# while Chrome moves on; 0 runs them inline.
+POST_PROCESS_WORKERS = int(os.getenv("PURGER_POST_PROCESS_WORKERS", "2"))
+_POST_PROCESS_EXECUTOR = None
+PENDING_POST_PROCESSING = []
 
 
 def set_log_sink(callback):
@@ -120,6 +217,53 @@ class DuplicateClientError(Exception):
         super().__init__(message)
 
 
+def _log_throttle_change(direction, reason, _status):
+    log_message(f"Throttle {direction} ({reason}) -> {THROTTLE.describe()}")
+
+
+THROTTLE = purger_throttle.AdaptiveThrottle(
+    rate=float(os.getenv("PURGER_RATE_LIMIT", "2.0")),
+    max_rate=float(os.getenv("PURGER_MAX_RATE", "8.0")),
+    concurrency=int(os.getenv("PURGER_CONCURRENCY", "2")),
+    max_concurrency=int(os.getenv("PURGER_MAX_CONCURRENCY", "6")),
+    target_latency=float(os.getenv("PURGER_TARGET_LATENCY", "3.0")),
+    on_change=_log_throttle_change,
+)
+
+
+def get_throttle_status():
+    """Expose the active rate/concurrency limits (used by the GUI)."""
+    return THROTTLE.status()
+
+
+def open_page(driver, url, locator, timeout=10):
+    """
+    Navigate to url through the shared throttle and wait for locator.
+    Load time and timeouts feed the AIMD controller.
+    """
+    with THROTTLE.slot():
+        started = time.monotonic()
+        try:
+            driver.get(url)
+            WebDriverWait(driver, timeout).until(EC.presence_of_element_located(locator))
+        except WebDriverException:
+            THROTTLE.observe(error=True)
+            raise
+        THROTTLE.observe(time.monotonic() - started)
+
+
+class PurgeStepError(Exception):
+    """Raised when a purge step fails in a way the batch scheduler can classify."""
+
+    def __init__(self, kind, message):
+        self.kind = kind
+        super().__init__(message)
+
+
+class LeaseLostError(Exception):
+    """Raised between pages when another queue worker has reclaimed the client."""
+
+
 def ensure_pdcc_root():
     """Ensure the PDCC directory tree exists (used by package exports)."""
     PDCC_ROOT.mkdir(parents=True, exist_ok=True)
@@ -168,6 +312,25 @@ def load_pandas():
     return pd
 
 
+def load_openpyxl():
+    try:
+        import openpyxl  # type: ignore
+    except ImportError as exc:
+        raise RuntimeError(
+            "openpyxl is required for streaming Excel reads. Install via `pip install openpyxl`."
+        ) from exc
+    return openpyxl
+
+
+def iter_workbook_rows(path: Path):
+    """Yield rows (tuples of cell values) from the first sheet in read-only mode."""
+    workbook = load_openpyxl().load_workbook(path, read_only=True, data_only=True)
+    try:
+        yield from workbook.worksheets[0].iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
 def resolve_purgeable_clients_url(override=None):
     if override:
         return override
@@ -228,14 +391,296 @@ def get_duplicate_metadata(client_id):
     return get_client_last_purge(client_id)
 
 
+def file_sha256(path: Path, chunk_size=1024 * 1024) -> str:
+    """Return the hex SHA-256 digest of a file, read in fixed-size chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
 def calculate_directory_bytes(path: Path | None) -> int:
+    """Walk an archive with os.scandir and total its file sizes (on-demand verification only)."""
     if not path or not path.exists():
         return 0
-    total = 0
-    for file in path.rglob("*"):
-        if file.is_file():
-            total += file.stat().st_size
-    return total
+    return sum(size for _, size in purger_catalog.iter_files(path))
+
+
+def submit_post_processing(label, func, *args, on_result=None, **kwargs):
+    """
+    Run func(*args, **kwargs) off the Selenium critical path. The task is
+    tracked for the current client and on_result(result) is called when
+    drain_post_processing() collects it.
+    """
+    global _POST_PROCESS_EXECUTOR
+    if POST_PROCESS_WORKERS <= 0:
+        future = Future()
+        try:
+            future.set_result(func(*args, **kwargs))
+        except Exception as exc:
+            future.set_exception(exc)
+    else:
+        if _POST_PROCESS_EXECUTOR is None:
+            _POST_PROCESS_EXECUTOR = ThreadPoolExecutor(
+                max_workers=POST_PROCESS_WORKERS, thread_name_prefix="post-process"
+            )
+        future = _POST_PROCESS_EXECUTOR.submit(func, *args, **kwargs)
+    PENDING_POST_PROCESSING.append((label, future, on_result))
+    return future
+
+
+def drain_post_processing():
+    """
+    Wait for every background task of the current client, log failures and
+    record counts in RUN_METRICS. Must run before the output folder is renamed.
+    Returns (completed, failed).
+    """
+    completed = failed = 0
+    started = time.monotonic()
+    while PENDING_POST_PROCESSING:
+        label, future, on_result = PENDING_POST_PROCESSING.pop(0)
+        try:
+            result = future.result()
+            if on_result:
+                on_result(result)
+            completed += 1
+        except Exception as exc:
+            failed += 1
+            log_message(f"{label} failed: {exc}")
+    if completed or failed:
+        waited = time.monotonic() - started
+        RUN_METRICS["post_processed"] = RUN_METRICS.get("post_processed", 0) + completed
+        RUN_METRICS["post_process_failed"] = RUN_METRICS.get("post_process_failed", 0) + failed
+        log_message(
+            f"Background processing finished: {completed} done, {failed} failed "
+            f"(waited {waited:.1f}s)."
+        )
+    return completed, failed
+
+
+def catalog_archive_location():
+    """Point the catalog entry for the current universal ID at OUTPUT_DIR."""
+    try:
+        purger_catalog.register_archive(
+            CATALOG_PATH,
+            UNIVERSAL_CLIENT_ID,
+            OUTPUT_DIR,
+            turnpoint_id=CLIENT_ID,
+            client_name=CLIENT_NAME,
+        )
+    except (sqlite3.Error, OSError) as exc:
+        log_message(f"Archive catalog unavailable: {exc}")
+
+
+def _archive_relpath(path):
+    try:
+        return path.relative_to(OUTPUT_DIR).as_posix()
+    except (TypeError, ValueError):
+        return str(path)
+
+
+def record_written_files(files, kind="file", source=""):
+    """
+    Account for files written into the current archive, given as (path, size)
+    or (path, size, sha256) tuples (size None stats the file once). Sizes and
+    hashes go to the per-run accumulator, where a rewritten file replaces its
+    earlier entry and which becomes the archive's checksum manifest, and to the
+    archive catalog; catalog problems are logged and never stop a purge.
+    Returns the bytes recorded.
+    """
+    sized = []
+    with _RUN_WRITTEN_LOCK:
+        for path, size, *digest in files:
+            path = Path(path)
+            size = path.stat().st_size if size is None else int(size)
+            sized.append((path, size))
+            RUN_WRITTEN[_archive_relpath(path)] = {
+                "bytes": size,
+                "sha256": digest[0] if digest else None,
+                "kind": kind,
+                "source": source,
+            }
+    if UNIVERSAL_CLIENT_ID:
+        try:
+            purger_catalog.record_files(CATALOG_PATH, UNIVERSAL_CLIENT_ID, sized, kind=kind)
+        except (sqlite3.Error, OSError, KeyError, ValueError) as exc:
+            log_message(f"Archive catalog update skipped: {exc}")
+    return sum(size for _, size in sized)
+
+
+def run_bytes_written():
+    with _RUN_WRITTEN_LOCK:
+        return sum(record["bytes"] for record in RUN_WRITTEN.values())
+
+
+def hash_written_file_in_background(path, *, sqlite_relpath=None):
+    """
+    Hash a file already recorded by record_written_files on the post-processing
+    pool and fill in its SHA-256 (and the SQLite container's copy of the
+    metadata) when the tasks are drained, keeping the read off the Selenium thread.
+    """
+    path = Path(path)
+    relpath = _archive_relpath(path)
+    sqlite_path = SQLITE_ARCHIVE_PATH
+
+    def fill(digest):
+        with _RUN_WRITTEN_LOCK:
+            record = RUN_WRITTEN.get(relpath)
+            if record is not None:
+                record["sha256"] = digest
+        if sqlite_relpath and sqlite_path is not None:
+            purger_sqlite_archive.set_file_hash(sqlite_path, sqlite_relpath, digest)
+
+    return submit_post_processing(f"Checksum of {path.name}", file_sha256, path, on_result=fill)
+
+
+def write_run_checksums():
+    """Write the checksum manifest for the current archive from hashes taken while writing."""
+    if OUTPUT_DIR is None or not OUTPUT_DIR.exists():
+        return None
+    with _RUN_WRITTEN_LOCK:
+        records = {relpath: dict(record) for relpath, record in RUN_WRITTEN.items()}
+    try:
+        manifest = purger_checksums.write_checksum_manifest(OUTPUT_DIR, records)
+    except OSError as exc:
+        log_message(f"Checksum manifest not written: {exc}")
+        return None
+    record_written_files([(manifest, None)], kind="checksums")
+    return manifest
+
+
+class _HashingWriter:
+    """Text sink for csv.writer that encodes, hashes and counts bytes as they are written."""
+
+    def __init__(self, fh, encoding="utf-8"):
+        self._fh = fh
+        self._encoding = encoding
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, text):
+        data = text.encode(self._encoding)
+        self.digest.update(data)
+        self.size += len(data)
+        return self._fh.write(data)
+
+
+def format_verification_report(results):
+    """One line per damaged archive plus a totals line."""
+    lines = []
+    for result in results:
+        for relpath, issue in result["problems"]:
+            lines.append(f"{result['archive']}: {relpath}: {issue}")
+    damaged = sum(1 for result in results if result["problems"])
+    files = sum(result["files"] for result in results)
+    total = sum(result["bytes"] for result in results)
+    lines.append(
+        f"Verified {len(results)} archive(s), {files} file(s), {total / (1024 ** 3):.2f} GB: "
+        f"{damaged} with problems."
+    )
+    return lines
+
+
+def run_integrity_check(target, workers=None):
+    """Verify one archive (a folder containing _checksums.csv) or every archive under a root."""
+    target = Path(target).expanduser()
+    started = time.monotonic()
+    if (target / purger_checksums.CHECKSUM_NAME).exists():
+        results = [purger_checksums.verify_archive(target, workers=workers)]
+    else:
+        results = purger_checksums.verify_archives(target, workers=workers)
+    for line in format_verification_report(results):
+        log_message(line)
+    log_message(f"Integrity check took {time.monotonic() - started:.1f}s.")
+    return results
+
+
+def verify_archive_bytes(path, expected):
+    """Compare the write-time byte total with an os.scandir walk of the archive."""
+    actual = calculate_directory_bytes(path)
+    if actual != expected:
+        log_message(
+            f"Archive size check: {actual} bytes on disk vs {expected} bytes recorded "
+            f"while writing {path} ({actual - expected:+d})."
+        )
+    else:
+        log_message(f"Archive size check passed: {actual} bytes.")
+    return actual
+
+
+def get_archive_catalog_totals():
+    """Archive count, file count and bytes across ARCHIVE_ROOT (used by the GUI)."""
+    if not CATALOG_PATH.exists():
+        return None
+    return purger_catalog.catalog_totals(CATALOG_PATH)
+
+
+def _package_and_record(folder, turnpoint_id, universal_id, fmt):
+    result = purger_archive.package_archive(folder, fmt=fmt, dest_dir=PACKAGE_DIR)
+    result["timestamp"] = datetime.now(timezone.utc).isoformat()
+    record_archive_package(turnpoint_id, universal_id, result)
+    log_message(
+        f"Packaged {Path(folder).name} -> {Path(result['path']).name} "
+        f"({result['source_bytes']} -> {result['package_bytes']} bytes, verified, {result['seconds']}s)."
+    )
+    return result
+
+
+def queue_archive_packaging(folder, turnpoint_id, universal_id, fmt=None):
+    """
+    Package a finished archive on a background pool that outlives the current
+    client, so the next purge starts immediately. Several archives compress in
+    parallel (zlib and zstd release the GIL). Returns the future, or None when
+    packaging is switched off.
+    """
+    global _PACKAGE_EXECUTOR
+    prune_archive_packaging()
+    fmt = fmt or PACKAGE_FORMAT
+    if not fmt:
+        return None
+    if _PACKAGE_EXECUTOR is None:
+        _PACKAGE_EXECUTOR = ThreadPoolExecutor(
+            max_workers=max(1, PACKAGE_WORKERS), thread_name_prefix="package"
+        )
+    future = _PACKAGE_EXECUTOR.submit(_package_and_record, folder, turnpoint_id, universal_id, fmt)
+    PACKAGE_JOBS.append((Path(folder).name, future))
+    log_message(f"Packaging {Path(folder).name} as {fmt} in the background.")
+    return future
+
+
+def _collect_packaging_jobs(jobs):
+    done = failed = 0
+    for name, future in jobs:
+        try:
+            future.result()
+            done += 1
+        except Exception as exc:
+            failed += 1
+            log_message(f"Packaging {name} failed: {exc}")
+    return done, failed
+
+
+def prune_archive_packaging():
+    """
+    Drop packaging jobs that have already finished, logging failures, without
+    waiting on the rest. Runs before each new job so a long GUI session does not
+    keep every future alive. Returns (done, failed).
+    """
+    finished = [job for job in PACKAGE_JOBS if job[1].done()]
+    for job in finished:
+        PACKAGE_JOBS.remove(job)
+    return _collect_packaging_jobs(finished)
+
+
+def wait_for_archive_packaging():
+    """Block until queued packaging jobs finish; logs failures. Returns (done, failed)."""
+    done = failed = 0
+    while PACKAGE_JOBS:
+        job_done, job_failed = _collect_packaging_jobs([PACKAGE_JOBS.pop(0)])
+        done += job_done
+        failed += job_failed
+    return done, failed
 
 
 def prompt_operator_name():
@@ -285,11 +730,8 @@ def reset_purge_data():
 def login(driver):
     """Log into TurnPoint using credentials from .env."""
     username, password = ensure_credentials()
-    driver.get(BASE_URL)
     # wait for login page to load
-    WebDriverWait(driver, 10).until(
-        EC.presence_of_element_located((By.NAME, "email"))
-    )
+    open_page(driver, BASE_URL, (By.NAME, "email"))
     driver.find_element(By.NAME, "email").send_keys(username)
     driver.find_element(By.NAME, "password").send_keys(password)
     driver.find_element(By.XPATH, "//input[@type='submit']").click()
@@ -380,18 +822,41 @@ def ensure_output_directories():
 
 
 def configure_client_context(client_id, client_name=None):
-    global CLIENT_ID, CLIENT_NAME, OUTPUT_DIR, DOCUMENTS_DIR, FINAL_OUTPUT_DIR
+    """
+    Set up the client's archive folder. With a known client name (manifest or
+    GUI) files are written straight into the final folder; otherwise into
+    "<uid> <client id>" until the Client-Details page supplies the name.
+    """
+    global CLIENT_ID, CLIENT_NAME, OUTPUT_DIR, DOCUMENTS_DIR, FINAL_OUTPUT_DIR, DOWNLOAD_DIR
+    global SQLITE_ARCHIVE_PATH
     if not FILE_PREFIX:
         raise RuntimeError("Universal client sequence is not initialized.")
     CLIENT_ID = client_id
     if client_name:
-        CLIENT_NAME = client_name
+        CLIENT_NAME = normalize_label(client_name) or client_name
     ensure_archive_root()
-    working_folder = (ARCHIVE_ROOT / f"{FILE_PREFIX}{CLIENT_ID}").resolve()
-    OUTPUT_DIR = working_folder
-    DOCUMENTS_DIR = OUTPUT_DIR / f"{UNIVERSAL_CLIENT_ID} Documents"
     FINAL_OUTPUT_DIR = (ARCHIVE_ROOT / f"{FILE_PREFIX}{CLIENT_NAME} ({CLIENT_ID})").resolve()
+    if client_name:
+        if FINAL_OUTPUT_DIR.exists():
+            set_aside_existing_archive(FINAL_OUTPUT_DIR)
+        OUTPUT_DIR = FINAL_OUTPUT_DIR
+    else:
+        OUTPUT_DIR = (ARCHIVE_ROOT / f"{FILE_PREFIX}{CLIENT_ID}").resolve()
+    DOCUMENTS_DIR = OUTPUT_DIR / f"{UNIVERSAL_CLIENT_ID} Documents"
+    DOWNLOAD_DIR = (STAGING_ROOT / f"{UNIVERSAL_CLIENT_ID}-{os.getpid()}").resolve()
+    DOWNLOAD_DIR.mkdir(parents=True, exist_ok=True)
     ensure_output_directories()
+    catalog_archive_location()
+    SQLITE_ARCHIVE_PATH = None
+    if ARCHIVE_FORMAT != "folder":
+        SQLITE_ARCHIVE_PATH = DOWNLOAD_DIR.with_name(DOWNLOAD_DIR.name + purger_sqlite_archive.SQLITE_SUFFIX)
+        purger_sqlite_archive.create_archive(
+            SQLITE_ARCHIVE_PATH,
+            universal_id=UNIVERSAL_CLIENT_ID,
+            turnpoint_id=CLIENT_ID,
+            archive_format=ARCHIVE_FORMAT,
+            started_at=datetime.now(timezone.utc).isoformat(),
+        )
 
 
 def update_final_client_name(new_name):
@@ -405,7 +870,78 @@ def update_final_client_name(new_name):
     FINAL_OUTPUT_DIR = (ARCHIVE_ROOT / f"{FILE_PREFIX}{CLIENT_NAME} ({CLIENT_ID})").resolve()
 
 
+def set_aside_existing_archive(path):
+    """
+    Move an existing archive (folder or SQLite container) out of the way into
+    ARCHIVE_ROOT/_superseded, never deleting it. Keeping it out of the top level
+    stops the catalog, --verify and packaging from treating it as a live
+    archive. Returns the new path.
+    """
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    superseded_dir = ARCHIVE_ROOT / SUPERSEDED_DIRNAME
+    superseded_dir.mkdir(parents=True, exist_ok=True)
+    stem, suffix = (path.stem, path.suffix) if path.is_file() else (path.name, "")
+    aside = superseded_dir / f"{stem} (superseded {stamp}){suffix}"
+    counter = 1
+    while aside.exists():
+        aside = superseded_dir / f"{stem} (superseded {stamp}_{counter}){suffix}"
+        counter += 1
+    path.rename(aside)
+    log_message(f"Existing archive {path.name} kept as {SUPERSEDED_DIRNAME}/{aside.name}.")
+    return aside
+
+
+def _copy_file_verified(source, target, chunk_size=1024 * 1024):
+    """Copy one file, hashing it on the way, then re-hash the copy and compare."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256()
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        for chunk in iter(lambda: src.read(chunk_size), b""):
+            digest.update(chunk)
+            dst.write(chunk)
+    shutil.copystat(source, target)
+    if file_sha256(target) != digest.hexdigest():
+        raise OSError(f"Checksum mismatch after copying {source} to {target}")
+    return target.stat().st_size
+
+
+def copy_tree_verified(source, target, *, workers=None):
+    """
+    Copy an archive across filesystems on a thread pool, verifying every file
+    by SHA-256 and logging progress roughly every 10%. Raises before anything
+    is deleted if any file fails. Returns (files, bytes) copied.
+    """
+    source, target = Path(source), Path(target)
+    files = list(purger_catalog.iter_files(source))
+    total_bytes = sum(size for _, size in files) or 1
+    copied_files = copied_bytes = 0
+    next_report = 0.1
+    for folder, _, _ in os.walk(source):
+        (target / Path(folder).relative_to(source)).mkdir(parents=True, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=max(1, workers or ARCHIVE_COPY_WORKERS)) as pool:
+        futures = [
+            pool.submit(_copy_file_verified, path, target / path.relative_to(source))
+            for path, _ in files
+        ]
+        for future in as_completed(futures):
+            copied_bytes += future.result()
+            copied_files += 1
+            if copied_bytes / total_bytes >= next_report or copied_files == len(files):
+                log_message(
+                    f"Copying archive to {target.name}: {copied_files}/{len(files)} files, "
+                    f"{copied_bytes / (1024 ** 2):.1f} MB verified."
+                )
+                next_report = copied_bytes / total_bytes + 0.1
+    return copied_files, copied_bytes
+
+
 def finalize_output_directory():
+    """
+    Move the working folder to its final name. Normally this is a cheap rename
+    done right after Client-Details; a checksum-verified copy is used only when
+    the two paths are on different filesystems. An existing folder with the
+    final name is set aside, not deleted.
+    """
     global OUTPUT_DIR, DOCUMENTS_DIR, FINAL_OUTPUT_DIR
     if not FINAL_OUTPUT_DIR or OUTPUT_DIR is None:
         return
@@ -414,19 +950,63 @@ def finalize_output_directory():
         return
     target = FINAL_OUTPUT_DIR
     if target.exists() and target != OUTPUT_DIR:
-        shutil.rmtree(target)
+        set_aside_existing_archive(target)
     if OUTPUT_DIR.exists():
         try:
             OUTPUT_DIR.rename(target)
         except OSError as exc:
-            if exc.errno == 18:  # cross-device link
-                shutil.copytree(OUTPUT_DIR, target, dirs_exist_ok=True)
-                shutil.rmtree(OUTPUT_DIR)
-            else:
+            if exc.errno != errno.EXDEV:
                 raise
+            log_message(f"{OUTPUT_DIR} and {target} are on different filesystems; copying.")
+            copy_tree_verified(OUTPUT_DIR, target)
+            shutil.rmtree(OUTPUT_DIR)
     OUTPUT_DIR = target
     FINAL_OUTPUT_DIR = target
     DOCUMENTS_DIR = OUTPUT_DIR / f"{UNIVERSAL_CLIENT_ID} Documents"
+    catalog_archive_location()
+
+
+def finalize_sqlite_archive():
+    """
+    Move the client's SQLite container from the staging area into the archive
+    folder as '<archive folder>.sqlite3' and record it like any other archive
+    file (run bytes, catalog, checksum manifest, package). An existing
+    container with that name is set aside, not deleted. Returns the final path
+    (None when disabled or the container failed its check, in which case it is
+    left in staging).
+    """
+    global SQLITE_ARCHIVE_PATH
+    if SQLITE_ARCHIVE_PATH is None or OUTPUT_DIR is None or not SQLITE_ARCHIVE_PATH.exists():
+        return None
+    target = purger_sqlite_archive.archive_path_for(OUTPUT_DIR)
+    try:
+        purger_sqlite_archive.set_metadata(
+            SQLITE_ARCHIVE_PATH,
+            client_name=CLIENT_NAME,
+            archive_folder=OUTPUT_DIR.name,
+            finished_at=datetime.now(timezone.utc).isoformat(),
+        )
+        if target.exists():
+            set_aside_existing_archive(target)
+        purger_sqlite_archive.finalize_archive(SQLITE_ARCHIVE_PATH, target)
+    except (sqlite3.Error, OSError) as exc:
+        log_message(f"SQLite archive not finalised ({SQLITE_ARCHIVE_PATH} kept): {exc}")
+        return None
+    SQLITE_ARCHIVE_PATH = None
+    summary = purger_sqlite_archive.archive_summary(target)
+    RUN_METRICS["sqlite_archive"] = str(target)
+    RUN_METRICS["sqlite_archive_bytes"] = target.stat().st_size
+    record_written_files(
+        [(target, RUN_METRICS["sqlite_archive_bytes"], file_sha256(target))],
+        kind="sqlite_archive",
+        source="SQLite archive",
+    )
+    log_message(
+        f"SQLite archive {target.name}: {summary['pages']} page(s), {summary['records']} record(s), "
+        f"{summary['budget_lines']} budget line(s), {summary['files']} file(s), "
+        f"{RUN_METRICS['sqlite_archive_bytes'] / (1024 ** 2):.1f} MB."
+    )
+    return target
 
 
 def prompt_client_id(prompt_text=None):
@@ -494,6 +1074,7 @@ def write_csv(page, records):
     """
     safe_page = page.replace("/", "-")
     filename = OUTPUT_DIR / f"{FILE_PREFIX}{safe_page}.csv"
+    page_records = records
 
     if not records:
         records = [{}]
@@ -504,7 +1085,13 @@ def write_csv(page, records):
             if key not in headers:
                 headers.append(key)
 
-    with open(filename, "w", newline="", encoding="utf-8") as f:
+    if SQLITE_ARCHIVE_PATH is not None:
+        purger_sqlite_archive.write_page(SQLITE_ARCHIVE_PATH, page, headers, page_records)
+        if ARCHIVE_FORMAT == "sqlite":
+            return
+
+    with open(filename, "wb") as raw:
+        f = _HashingWriter(raw)
         writer = csv.writer(f)
         if not headers:
             writer.writerow([])
@@ -512,6 +1099,9 @@ def write_csv(page, records):
             writer.writerow(headers)
             for record in records:
                 writer.writerow([sanitize_csv_value(record.get(h, "")) for h in headers])
+    record_written_files(
+        [(filename, f.size, f.digest.hexdigest())], kind="page_csv", source=page
+    )
 
 
 def safe_filename(name):
@@ -527,19 +1117,25 @@ def ensure_unique_path(path: Path) -> Path:
     return candidate
 
 
+def _download_dir():
+    return DOWNLOAD_DIR or OUTPUT_DIR
+
+
 def snapshot_downloads():
-    if OUTPUT_DIR is None or not OUTPUT_DIR.exists():
+    folder = _download_dir()
+    if folder is None or not folder.exists():
         return set()
-    return {p.name for p in OUTPUT_DIR.iterdir() if p.is_file()}
+    return {p.name for p in folder.iterdir() if p.is_file()}
 
 
 def wait_for_new_download(previous_files, timeout=DOWNLOAD_TIMEOUT):
-    if OUTPUT_DIR is None:
+    folder = _download_dir()
+    if folder is None:
         raise RuntimeError("Output directory not configured for downloads.")
     deadline = time.time() + timeout
     while time.time() < deadline:
         ready_files = []
-        for p in OUTPUT_DIR.iterdir():
+        for p in folder.iterdir():
             if not p.is_file():
                 continue
             if p.name.endswith(".crdownload"):
@@ -561,6 +1157,70 @@ def cleanup_old_csvs():
             csv_file.unlink(missing_ok=True)
 
 
+def _document_source(href):
+    query = parse_qs(urlparse(href).query)
+    cid = (query.get("cid") or [""])[0]
+    return f"document cid={cid}" if cid else href
+
+
+def store_document(downloaded_path, target):
+    """
+    Move a downloaded document into the client's Documents folder. With the
+    document store on, the file is kept once under ARCHIVE_ROOT/_blobs and
+    target becomes a reflink/hardlink (or copy) of it. Returns (size, sha256); the hash
+    comes from the store's ingest read, or is None for a plain rename (the
+    caller hashes it on the post-processing pool).
+    """
+    if not DOCUMENT_STORE_LINK:
+        size = downloaded_path.stat().st_size
+        downloaded_path.rename(target)
+        return size, None
+    stored = purger_blobs.ingest_file(
+        DOCUMENT_STORE_DIR, downloaded_path, target, link=DOCUMENT_STORE_LINK
+    )
+    if stored["deduplicated"]:
+        RUN_METRICS["documents_deduplicated"] = RUN_METRICS.get("documents_deduplicated", 0) + 1
+        if stored["method"] != "copy":  # a copied entry takes its full size again
+            RUN_METRICS["dedup_bytes_saved"] = RUN_METRICS.get("dedup_bytes_saved", 0) + stored["bytes"]
+    return stored["bytes"], stored["sha256"]
+
+
+def archive_document(downloaded_path, target, source):
+    """
+    Place one downloaded document according to ARCHIVE_FORMAT: into the
+    Documents folder, into the SQLite container, or both. Returns the name it
+    was stored under.
+    """
+    relpath = f"{DOCUMENTS_DIR.name}/{target.name}"
+    if ARCHIVE_FORMAT == "sqlite" and SQLITE_ARCHIVE_DOCUMENTS:
+        stored = purger_sqlite_archive.store_file(
+            SQLITE_ARCHIVE_PATH, relpath, downloaded_path, kind="document", source=source, unique=True
+        )
+        downloaded_path.unlink()
+        return stored["relpath"]
+    target = ensure_unique_path(target)
+    size, digest = store_document(downloaded_path, target)
+    relpath = f"{DOCUMENTS_DIR.name}/{target.name}"
+    if SQLITE_ARCHIVE_PATH is not None:
+        # Copying the bytes into the container hashes them on the way.
+        stored = purger_sqlite_archive.store_file(
+            SQLITE_ARCHIVE_PATH,
+            relpath,
+            target if SQLITE_ARCHIVE_DOCUMENTS else None,
+            kind="document",
+            source=source,
+            size=size,
+            sha256=digest,
+        )
+        digest = digest or stored["sha256"]
+    record_written_files([(target, size, digest)], kind="document", source=source)
+    if digest is None:
+        hash_written_file_in_background(
+            target, sqlite_relpath=relpath if SQLITE_ARCHIVE_PATH is not None else None
+        )
+    return target.name
+
+
 def download_document_files(driver):
     try:
         main_window = driver.current_window_handle
@@ -582,32 +1242,51 @@ def download_document_files(driver):
         seen.add(href)
         title = link.text.strip() or link.get_attribute("title") or f"Document_{index}"
 
-        driver.execute_script("window.open(arguments[0], '_blank');", href)
-        driver.switch_to.window(driver.window_handles[-1])
-
+        opened = False
         try:
-            download_btn = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable(
-                    (
-                        By.XPATH,
-                        "//input[@type='submit' and contains(translate(@value,'abcdefghijklmnopqrstuvwxyz','ABCDEFGHIJKLMNOPQRSTUVWXYZ'),'DOWNLOAD')]",
+            # Hold a throttle slot only for the TurnPoint requests (page load and
+            # click), not while Chrome finishes writing the file.
+            with THROTTLE.slot():
+                driver.execute_script("window.open(arguments[0], '_blank');", href)
+                driver.switch_to.window(driver.window_handles[-1])
+                opened = True
+                download_btn = WebDriverWait(driver, 10).until(
+                    EC.element_to_be_clickable(
+                        (
+                            By.XPATH,
+                            "//input[@type='submit' and contains(translate(@value,'abcdefghijklmnopqrstuvwxyz','ABCDEFGHIJKLMNOPQRSTUVWXYZ'),'DOWNLOAD')]",
+                        )
                     )
                 )
-            )
-            driver.execute_script("arguments[0].scrollIntoView(true);", download_btn)
-            previous = snapshot_downloads()
-            driver.execute_script("arguments[0].click();", download_btn)
+                driver.execute_script("arguments[0].scrollIntoView(true);", download_btn)
+                previous = snapshot_downloads()
+                driver.execute_script("arguments[0].click();", download_btn)
             downloaded_path = wait_for_new_download(previous)
             safe_name = safe_filename(title)
             target = DOCUMENTS_DIR / f"{FILE_PREFIX}{safe_name}{downloaded_path.suffix}"
-            target = ensure_unique_path(target)
-            downloaded_path.rename(target)
-            log_message(f"Downloaded document '{title}' -> {target.name}")
+            stored_name = archive_document(downloaded_path, target, _document_source(href))
+            RUN_METRICS["documents"] = RUN_METRICS.get("documents", 0) + 1
+            THROTTLE.observe()
+            log_message(f"Downloaded document '{title}' -> {stored_name}")
         except Exception as exc:
+            THROTTLE.observe(error=isinstance(exc, WebDriverException))
             log_message(f"Error downloading document '{title}': {exc}")
         finally:
-            driver.close()
-            driver.switch_to.window(main_window)
+            if opened:
+                driver.close()
+                driver.switch_to.window(main_window)
+
+
+def load_budget_lines(db_path, long_path):
+    """Copy a Budget_Long.csv into the SQLite container in batched transactions."""
+    with open(long_path, newline="", encoding="utf-8") as fh:
+        reader = csv.reader(fh)
+        next(reader, None)
+        rows = (
+            (uid, int(entry_index), entry, int(line), day, field, value)
+            for uid, entry_index, entry, line, day, field, value in reader
+        )
+        return purger_sqlite_archive.write_budget_lines(db_path, rows)
 
 
 def download_budget_excel(driver):
@@ -620,44 +1299,87 @@ def download_budget_excel(driver):
         return
 
     driver.execute_script("arguments[0].scrollIntoView(true);", export_link)
-    previous = snapshot_downloads()
-    driver.execute_script("arguments[0].click();", export_link)
-    try:
-        downloaded_path = wait_for_new_download(previous)
-    except TimeoutException as exc:
-        log_message(f"Budget download failed: {exc}")
-        return
+    with THROTTLE.slot():
+        previous = snapshot_downloads()
+        driver.execute_script("arguments[0].click();", export_link)
+        try:
+            downloaded_path = wait_for_new_download(previous)
+        except TimeoutException as exc:
+            THROTTLE.observe(error=True)
+            log_message(f"Budget download failed: {exc}")
+            return
+        THROTTLE.observe()
 
     new_name = f"{FILE_PREFIX}{downloaded_path.name}"
     target = ensure_unique_path(OUTPUT_DIR / new_name)
+    size = downloaded_path.stat().st_size
     downloaded_path.rename(target)
+    digest = None
+    sqlite_path = SQLITE_ARCHIVE_PATH
+    if sqlite_path is not None:
+        digest = purger_sqlite_archive.store_file(
+            sqlite_path,
+            target.name,
+            target if SQLITE_ARCHIVE_DOCUMENTS else None,
+            kind="budget_workbook",
+            source="NDIS-Budget",
+            size=size,
+        )["sha256"]
+    record_written_files([(target, size, digest)], kind="budget_workbook", source="NDIS-Budget")
+    if digest is None:
+        hash_written_file_in_background(
+            target, sqlite_relpath=target.name if sqlite_path is not None else None
+        )
     log_message(f"Saved budget export as {target.name}")
 
     try:
-        from NDISBUDGETER import process_budget_excel
-
-        result = process_budget_excel(target, quiet=True)
-        entries = result.get("entries_exported", 0)
-        entry_folder = result.get("entry_folder")
-        log_message(
-            f"Processed budget workbook into {entries} entry CSVs"
-            f"{' at ' + str(entry_folder) if entry_folder else ''}"
-        )
+        from NDISBUDGETER import BUDGET_EXPORT_DIRNAME, process_budget_excel
     except ImportError:
         log_message("NDISBUDGETER module not available; skipping budget parsing.")
-    except Exception as exc:
-        log_message(f"Budget parsing step failed: {exc}")
+        return
+
+    def parse_and_hash(path, **kwargs):
+        # Runs on the post-processing worker, so hashing the exports (a re-read of
+        # each file) and loading the SQLite container stay off the Selenium path.
+        result = process_budget_excel(path, **kwargs)
+        if sqlite_path is not None:
+            result["budget_lines"] = load_budget_lines(sqlite_path, result["long_path"])
+            if not BUDGET_LONG_FORMAT:
+                result["long_path"].unlink()
+                result["files"] = [item for item in result["files"] if item[0] != result["long_path"]]
+        if ARCHIVE_FORMAT == "sqlite":
+            result["files"] = []  # parsed in staging; the entries live in the SQLite archive
+        result["files"] = [(file, size, file_sha256(file)) for file, size in result["files"]]
+        return result
+
+    def record_budget(result):
+        entries = result.get("entries_exported", 0)
+        RUN_METRICS["budget_entries"] = entries
+        record_written_files(result["files"], kind="budget_export", source=target.name)
+        log_message(f"Processed budget workbook {target.name} into {entries} entry CSVs.")
+
+    submit_post_processing(
+        "Budget parsing step",
+        parse_and_hash,
+        target,
+        export_folder=DOWNLOAD_DIR / BUDGET_EXPORT_DIRNAME if ARCHIVE_FORMAT == "sqlite" else None,
+        quiet=True,
+        # openpyxl's read-only reader only opens .xlsx; older .xls exports use the pandas path.
+        streaming=target.suffix.lower() == ".xlsx",
+        long_format=BUDGET_LONG_FORMAT or sqlite_path is not None,
+        universal_id=UNIVERSAL_CLIENT_ID,
+        on_result=record_budget,
+    )
+    log_message("Budget parsing queued in the background.")
 
 def extract_client_details(driver):
     url = f"https://tp1.com.au/client-details.asp?eid={CLIENT_ID}"
-    driver.get(url)
-    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.LINK_TEXT, "Client Details")))
+    open_page(driver, url, (By.LINK_TEXT, "Client Details"))
     return [extract_fields_on_page(driver, "Client-Details")]
 
 def extract_package_schedules(driver):
     url = f"https://tp1.com.au/client-details.asp?eid={CLIENT_ID}&BREAKDOWN_SHOW_PACKAGE_SCHEDULE=yes"
-    driver.get(url)
-    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.XPATH, "//table")))
+    open_page(driver, url, (By.XPATH, "//table"))
     records = []
     rows = driver.find_elements(
         By.XPATH,
@@ -683,8 +1405,7 @@ def extract_notes(driver):
         f"https://tp1.com.au/client-details.asp?eid={CLIENT_ID}"
         "&BREAKDOWN_SHOW_NOTES=yes&noteSort=date&NoteTopRestrict=no"
     )
-    driver.get(url)
-    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.LINK_TEXT, "Notes")))
+    open_page(driver, url, (By.LINK_TEXT, "Notes"))
 
     rows = []
     note_rows = driver.find_elements(
@@ -726,114 +1447,170 @@ def extract_notes(driver):
 
 def extract_info_sheet(driver):
     url = f"https://tp1.com.au/client-infosheet.asp?eid={CLIENT_ID}&pageStatus=edit"
-    driver.get(url)
-    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.XPATH, "//body")))
+    open_page(driver, url, (By.XPATH, "//body"))
     return [extract_fields_on_page(driver, "Info-Sheet")]
 
 def extract_agreement(driver):
     url = f"https://tp1.com.au/client-agreement-V12.asp?eid={CLIENT_ID}"
-    driver.get(url)
-    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.XPATH, "//body")))
+    open_page(driver, url, (By.XPATH, "//body"))
     return [extract_fields_on_page(driver, "Agreement")]
 
 def extract_contacts(driver):
     url = f"https://tp1.com.au/client-details.asp?eid={CLIENT_ID}&BREAKDOWN_SHOW_CONTACTS=yes"
-    driver.get(url)
-    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.XPATH, "//body")))
+    open_page(driver, url, (By.XPATH, "//body"))
     return [extract_fields_on_page(driver, "Contacts")]
 
 def extract_support_plan(driver):
     url = f"https://tp1.com.au/client-support-plan-V11.asp?eid={CLIENT_ID}"
-    driver.get(url)
-    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.XPATH, "//body")))
+    open_page(driver, url, (By.XPATH, "//body"))
     return [extract_fields_on_page(driver, "Support-Plan")]
 
 def extract_emergency_plan(driver):
     url = f"https://tp1.com.au/client-details-emergency.asp?eid={CLIENT_ID}"
-    driver.get(url)
-    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.XPATH, "//body")))
+    open_page(driver, url, (By.XPATH, "//body"))
     return [extract_fields_on_page(driver, "Emergency-Plan")]
 
 def extract_documents(driver):
     url = f"https://tp1.com.au/client-details.asp?eid={CLIENT_ID}&BREAKDOWN_SHOW_DOCUMENTS=yes"
-    driver.get(url)
-    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.XPATH, "//body")))
+    open_page(driver, url, (By.XPATH, "//body"))
     rows = [extract_fields_on_page(driver, "Documents")]
     download_document_files(driver)
     return rows
 
 def extract_ndis_budget(driver):
     url = f"https://tp1.com.au/ndis-service-agreement-budget.asp?eid={CLIENT_ID}"
-    driver.get(url)
-    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.XPATH, "//body")))
+    open_page(driver, url, (By.XPATH, "//body"))
     rows = [extract_fields_on_page(driver, "NDIS-Budget")]
     download_budget_excel(driver)
     return rows
 
 
-def _set_record_limit(driver, limit=10000):
-    selectors = [
-        (By.ID, "RecordLimit"),
-        (By.NAME, "recordlimit"),
-        (By.NAME, "RecordLimit"),
-        (By.XPATH, "//select[contains(@id,'record') or contains(@name,'record')]"),
-    ]
-    for by, locator in selectors:
+def _probe_control(driver, candidates, clickable=False):
+    for locator in candidates:
+        for element in driver.find_elements(*locator):
+            if not clickable or (element.is_displayed() and element.is_enabled()):
+                return locator, element
+    return None
+
+
+def use_page_control(driver, control, candidates, action, *, timeout=0, clickable=False):
+    """
+    Find a page control and run action(element) on it.
+    The locator that worked last time for this BASE_URL is tried first with a
+    short wait; when it stops working it is forgotten and the full candidate
+    list is scanned (waiting up to `timeout`), learning whichever succeeds.
+    Returns True when the action ran.
+    """
+    candidates = [tuple(locator) for locator in candidates]
+    learned = get_learned_selector(BASE_URL, control)
+    if learned in candidates:
         try:
-            select_elem = driver.find_element(by, locator)
-            Select(select_elem).select_by_value(str(limit))
-            log_message(f"Record limit set to {limit}.")
-            return True
+            wait = min(timeout, SELECTOR_CACHE_WAIT)
+            found = (
+                WebDriverWait(driver, wait).until(
+                    lambda d: _probe_control(d, [learned], clickable)
+                )
+                if wait
+                else _probe_control(driver, [learned], clickable)
+            )
+            if found:
+                action(found[1])
+                return True
+        except Exception:
+            pass
+        log_message(f"Learned selector for {control} stopped working; relearning.")
+        candidates = [locator for locator in candidates if locator != learned]
+    if learned is not None:
+        forget_selector(BASE_URL, control)
+    if timeout:
+        try:
+            WebDriverWait(driver, timeout).until(
+                lambda d: _probe_control(d, candidates, clickable)
+            )
+        except TimeoutException:
+            return False
+    for locator in candidates:
+        found = _probe_control(driver, [locator], clickable)
+        if not found:
+            continue
+        try:
+            action(found[1])
         except Exception:
             continue
+        remember_selector(BASE_URL, control, locator)
+        return True
+    return False
+
+
+RECORD_LIMIT_SELECTORS = [
+    (By.ID, "RecordLimit"),
+    (By.NAME, "recordlimit"),
+    (By.NAME, "RecordLimit"),
+    (By.XPATH, "//select[contains(@id,'record') or contains(@name,'record')]"),
+]
+PURGEABLE_CHECKBOX_SELECTORS = [
+    (By.XPATH, "//input[@type='checkbox' and (contains(translate(@id,'PURGE','purge'),'purge') or contains(translate(@name,'PURGE','purge'),'purge'))]"),
+    (By.XPATH, "//label[contains(translate(text(),'PURGE','purge'),'purge')]/input[@type='checkbox']"),
+]
+FILTER_APPLY_SELECTORS = [
+    (By.XPATH, "//input[@type='submit' and (contains(translate(@value,'SEARCH','search'),'search') or contains(translate(@value,'FILTER','filter'),'filter'))]"),
+    (By.XPATH, "//button[contains(translate(text(),'SEARCH','search'),'search') or contains(translate(text(),'FILTER','filter'),'filter')]"),
+]
+EXCEL_EXPORT_SELECTORS = [
+    (By.XPATH, "//a[contains(translate(text(),'EXCEL','excel'),'excel') or contains(@title,'Excel') or contains(@onclick,'Excel')]"),
+    (By.XPATH, "//button[contains(translate(text(),'EXCEL','excel'),'excel')]"),
+]
+
+
+def _set_record_limit(driver, limit=10000):
+    if use_page_control(
+        driver,
+        "record_limit",
+        RECORD_LIMIT_SELECTORS,
+        lambda element: Select(element).select_by_value(str(limit)),
+    ):
+        log_message(f"Record limit set to {limit}.")
+        return True
     log_message("Record limit selector not found; proceeding with existing limit.")
     return False
 
 
 def _apply_purgeable_filter(driver):
-    toggled = False
-    checkbox_selectors = [
-        "//input[@type='checkbox' and (contains(translate(@id,'PURGE','purge'),'purge') or contains(translate(@name,'PURGE','purge'),'purge'))]",
-        "//label[contains(translate(text(),'PURGE','purge'),'purge')]/input[@type='checkbox']",
-    ]
-    for xpath in checkbox_selectors:
-        try:
-            checkbox = driver.find_element(By.XPATH, xpath)
-            if not checkbox.is_selected():
-                driver.execute_script("arguments[0].click();", checkbox)
-            toggled = True
-        except Exception:
-            continue
-    if not toggled:
+    def tick(checkbox):
+        if not checkbox.is_selected():
+            driver.execute_script("arguments[0].click();", checkbox)
+
+    if not use_page_control(driver, "purgeable_checkbox", PURGEABLE_CHECKBOX_SELECTORS, tick):
         log_message("Purgeable filter checkbox not found; continuing with existing filters.")
 
-    apply_selectors = [
-        "//input[@type='submit' and (contains(translate(@value,'SEARCH','search'),'search') or contains(translate(@value,'FILTER','filter'),'filter'))]",
-        "//button[contains(translate(text(),'SEARCH','search'),'search') or contains(translate(text(),'FILTER','filter'),'filter')]",
-    ]
-    for xpath in apply_selectors:
-        try:
-            button = driver.find_element(By.XPATH, xpath)
-            driver.execute_script("arguments[0].click();", button)
-            log_message("Purgeable filter applied.")
-            return
-        except Exception:
-            continue
+    if use_page_control(
+        driver,
+        "filter_apply",
+        FILTER_APPLY_SELECTORS,
+        lambda button: driver.execute_script("arguments[0].click();", button),
+    ):
+        log_message("Purgeable filter applied.")
+        return
     log_message("Filter apply button not found; results may already be visible.")
 
 
 def _trigger_excel_download(driver):
-    button = WebDriverWait(driver, 15).until(
-        EC.element_to_be_clickable(
-            (
-                By.XPATH,
-                "//a[contains(translate(text(),'EXCEL','excel'),'excel') or contains(@title,'Excel') or contains(@onclick,'Excel')]"
-                " | //button[contains(translate(text(),'EXCEL','excel'),'excel')]",
-            )
-        )
-    )
-    driver.execute_script("arguments[0].scrollIntoView(true);", button)
-    driver.execute_script("arguments[0].click();", button)
+    def click(button):
+        driver.execute_script("arguments[0].scrollIntoView(true);", button)
+        driver.execute_script("arguments[0].click();", button)
+
+    if not use_page_control(
+        driver, "excel_export", EXCEL_EXPORT_SELECTORS, click, timeout=15, clickable=True
+    ):
+        raise TimeoutException("Excel export button not found on the purgeable client page.")
+
+
+def _open_purgeable_list(driver, url, limit):
+    """Open the client list and apply the record limit and purgeable filter in this session."""
+    open_page(driver, url, (By.TAG_NAME, "body"), timeout=15)
+    _assert_valid_purgeable_page(driver, url)
+    _set_record_limit(driver, limit)
+    _apply_purgeable_filter(driver)
 
 
 def _download_purgeable_clients_excel(
@@ -843,48 +1620,416 @@ def _download_purgeable_clients_excel(
     target_dir = download_dir or PDCC_DOWNLOADS_DIR
     target_dir.mkdir(parents=True, exist_ok=True)
     resolved_url = resolve_purgeable_clients_url(purgeable_url)
-    driver.get(resolved_url)
-    WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-    _assert_valid_purgeable_page(driver, resolved_url)
-    _set_record_limit(driver, limit)
-    _apply_purgeable_filter(driver)
+    _open_purgeable_list(driver, resolved_url, limit)
     previous = snapshot_files(target_dir)
     _trigger_excel_download(driver)
     downloaded = wait_for_new_file_in(target_dir, previous)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    safe_name = f"purgeable_clients_{timestamp}.xlsx"
-    final_path = target_dir / safe_name
-    downloaded.rename(final_path)
-    latest = LATEST_PURGEABLE_EXCEL
-    if latest.exists():
-        latest.unlink()
-    shutil.copy2(final_path, latest)
-    log_message(f"Purgeable Excel downloaded -> {final_path.name}")
-    return final_path
+    return _store_purgeable_snapshot(downloaded, _snapshot_store_dir(target_dir))
+
+
+# Reads the largest non-layout table on the page in one round trip, plus pager links.
+_RESULT_TABLE_JS = r"""
+const text = (node) => (node.innerText || node.textContent || '')
+  .replace(/\u00a0/g, ' ').replace(/\s+/g, ' ').trim();
+let best = null;
+for (const table of document.querySelectorAll('table')) {
+  if (table.querySelector('table')) continue;
+  if (!best || table.rows.length > best.rows.length) best = table;
+}
+const pages = [];
+for (const link of document.querySelectorAll('a')) {
+  const label = text(link);
+  if (/^\d+$/.test(label) || /^(next|>|>>|\u00bb)$/i.test(label)) {
+    pages.push({label: label, href: link.href || ''});
+  }
+}
+if (!best || !best.rows.length) return {headers: [], rows: [], pages: pages};
+let headerRow = best.tHead && best.tHead.rows.length
+  ? best.tHead.rows[best.tHead.rows.length - 1]
+  : (Array.from(best.rows).find((row) => row.querySelector('th')) || best.rows[0]);
+const headers = Array.from(headerRow.cells).map(text);
+const rows = [];
+for (const row of best.rows) {
+  if (row === headerRow || row.querySelector('th') || row.cells.length !== headers.length) continue;
+  const values = Array.from(row.cells).map(text);
+  if (values.some((value) => value)) rows.push(values);
+}
+return {headers: headers, rows: rows, pages: pages};
+"""
+
+
+def _read_result_table(driver, url=None):
+    """Return {"headers", "rows", "pages"} for the client-list table on the page."""
+    if url:
+        open_page(driver, url, (By.TAG_NAME, "table"), timeout=15)
+    result = driver.execute_script(_RESULT_TABLE_JS) or {}
+    return {
+        "headers": [normalize_label(h) for h in result.get("headers") or []],
+        "rows": result.get("rows") or [],
+        "pages": result.get("pages") or [],
+    }
 
 
-def _load_purgeable_dataframe(path: Path):
-    pd = load_pandas()
-    df = pd.read_excel(path)
-    return df
+def _pagination_targets(pages):
+    """
+    Split pager links into navigable URLs and javascript-only page labels.
+    Page "1" is the page the harvest starts on, so it is never revisited.
+    """
+    urls = {}
+    scripted = []
+    for page in pages:
+        label, href = page.get("label", ""), page.get("href", "")
+        if label == "1":
+            continue
+        if href.startswith(("http://", "https://")):
+            rank = int(label) if label.isdigit() else HARVEST_MAX_PAGES
+            urls[href] = min(rank, urls.get(href, rank))
+        elif label.isdigit():
+            scripted.append(label)
+    return sorted(urls, key=urls.get), scripted
 
 
-def _discover_packages_from_dataframe(df):
-    if df.empty:
-        return []
-    package_col = None
-    for column in df.columns:
-        if "package" in column.lower():
-            package_col = column
-            break
-    if package_col is None:
-        return []
-    packages = (
-        df[package_col]
-        .dropna()
-        .astype(str)
-        .map(lambda x: x.strip())
-        .replace("", None)
+def _start_harvest_drivers(count, headless, prepare=None):
+    def start(_):
+        driver = build_chrome_driver(headless=headless, download_dir=PDCC_DOWNLOADS_DIR)
+        try:
+            login(driver)
+            if prepare is not None:
+                prepare(driver)
+        except Exception:
+            driver.quit()
+            raise
+        return driver
+
+    drivers = []
+    with ThreadPoolExecutor(max_workers=count) as pool:
+        for future in [pool.submit(start, index) for index in range(count)]:
+            try:
+                drivers.append(future.result())
+            except Exception as exc:
+                log_message(f"Harvest worker failed to start: {exc}")
+    return drivers
+
+
+def _harvest_linked_pages(first_url, start_urls, *, headless, workers, prepare=None):
+    """
+    Fetch paginated result pages with `workers` logged-in drivers, each set up
+    with prepare(driver) first. Pager links found on each page join the
+    frontier, so windowed pagers are followed too. Returns page results in
+    discovery order.
+    """
+    drivers = _start_harvest_drivers(max(1, min(workers, len(start_urls))), headless, prepare)
+    if not drivers:
+        raise RuntimeError("No harvest workers could log in to TurnPoint.")
+    pending = queue.Queue()
+    lock = threading.Lock()
+    seen = {first_url, *start_urls}
+    order = list(start_urls)
+    results = {}
+    for url in start_urls:
+        pending.put(url)
+
+    def work(driver):
+        while True:
+            url = pending.get()
+            if url is None:
+                pending.task_done()
+                return
+            try:
+                page = _read_result_table(driver, url)
+                with lock:
+                    results[url] = page
+                    for link in _pagination_targets(page["pages"])[0]:
+                        if link not in seen and len(seen) < HARVEST_MAX_PAGES:
+                            seen.add(link)
+                            order.append(link)
+                            pending.put(link)
+            except Exception as exc:
+                log_message(f"Harvest of {url} failed: {exc}")
+            finally:
+                pending.task_done()
+
+    threads = [threading.Thread(target=work, args=(driver,), daemon=True) for driver in drivers]
+    try:
+        for thread in threads:
+            thread.start()
+        pending.join()
+    finally:
+        for _ in threads:
+            pending.put(None)
+        for thread in threads:
+            thread.join()
+        for driver in drivers:
+            driver.quit()
+    missing = [url for url in order if url not in results]
+    if missing:
+        raise RuntimeError(f"{len(missing)} result page(s) could not be harvested.")
+    return [results[url] for url in order]
+
+
+def _harvest_scripted_pages(driver, labels):
+    """Click javascript-driven pager links one after another in the current driver."""
+    pages = []
+    visited = {"1"}
+    queued = sorted(set(labels) - visited, key=int)
+    while queued and len(visited) < HARVEST_MAX_PAGES:
+        label = queued.pop(0)
+        visited.add(label)
+        table = driver.find_element(By.TAG_NAME, "table")
+        with THROTTLE.slot():
+            driver.find_element(By.LINK_TEXT, label).click()
+            WebDriverWait(driver, 15).until(EC.staleness_of(table))
+        page = _read_result_table(driver)
+        pages.append(page)
+        _, more = _pagination_targets(page["pages"])
+        queued = sorted(set(queued) | (set(more) - visited), key=int)
+    return pages
+
+
+def _coerce_harvested_cell(value):
+    # Mirror the Excel export: plain integers (client IDs) are numbers there.
+    if value and re.fullmatch(r"-?[1-9]\d{0,14}|0", value):
+        return int(value)
+    return value
+
+
+def write_harvested_workbook(path: Path, headers, pages):
+    """
+    Write harvested result pages into one XLSX in the purgeable export layout.
+    Rows are aligned to the first page's headers; returns the row count.
+    """
+    workbook = load_openpyxl().Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(list(headers))
+    count = 0
+    for page in pages:
+        positions = [
+            page["headers"].index(header) if header in page["headers"] else None
+            for header in headers
+        ]
+        for row in page["rows"]:
+            sheet.append(
+                [
+                    _coerce_harvested_cell(row[pos]) if pos is not None and pos < len(row) else None
+                    for pos in positions
+                ]
+            )
+            count += 1
+    workbook.save(path)
+    return count
+
+
+def _harvest_purgeable_clients_table(
+    driver, limit=10000, download_dir=None, purgeable_url=None, headless=False, workers=None
+):
+    """
+    Read the rendered purgeable client list directly instead of exporting Excel.
+    Additional pages are fetched in parallel drivers when the pager uses links,
+    sequentially when it is javascript-driven.
+    """
+    ensure_pdcc_root()
+    target_dir = download_dir or PDCC_DOWNLOADS_DIR
+    target_dir.mkdir(parents=True, exist_ok=True)
+    resolved_url = resolve_purgeable_clients_url(purgeable_url)
+    _open_purgeable_list(driver, resolved_url, limit)
+    first = _read_result_table(driver)
+    if not first["headers"]:
+        raise RuntimeError("No client result table found on the purgeable client page.")
+    urls, scripted = _pagination_targets(first["pages"])
+    current = driver.current_url
+    urls = [url for url in urls if url != current]
+    if urls:
+        pages = _harvest_linked_pages(
+            current,
+            urls,
+            headless=headless,
+            workers=workers or HARVEST_WORKERS,
+            # TurnPoint may keep the filter and record limit in the session, not the URL.
+            prepare=lambda worker: _open_purgeable_list(worker, resolved_url, limit),
+        )
+    elif scripted:
+        pages = _harvest_scripted_pages(driver, scripted)
+    else:
+        pages = []
+    harvested = target_dir / f"harvest_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+    rows = write_harvested_workbook(harvested, first["headers"], [first, *pages])
+    log_message(f"Harvested {rows} purgeable client row(s) from {1 + len(pages)} page(s).")
+    return _store_purgeable_snapshot(harvested, _snapshot_store_dir(target_dir))
+
+
+def _snapshot_store_dir(download_dir: Path | None = None) -> Path:
+    return (download_dir or PDCC_DOWNLOADS_DIR) / "snapshots"
+
+
+def _snapshot_row_count(path: Path) -> int:
+    return summarize_purgeable_workbook(path)["record_count"]
+
+
+def _store_purgeable_snapshot(downloaded: Path, store_dir: Path | None = None):
+    """
+    File a fresh download in the content-addressed snapshot store and point
+    LATEST_PURGEABLE_EXCEL at it. Returns the stored blob path.
+    """
+    store_dir = store_dir or _snapshot_store_dir()
+    purger_snapshots.ingest_legacy_snapshots(
+        store_dir, store_dir.parent, row_counter=_snapshot_row_count
+    )
+    entry, is_new = purger_snapshots.store_snapshot(
+        store_dir, downloaded, row_counter=_snapshot_row_count
+    )
+    blob = store_dir / entry["file"]
+    method = purger_snapshots.point_latest(blob, LATEST_PURGEABLE_EXCEL)
+    refresh_purgeable_sidecar(LATEST_PURGEABLE_EXCEL, entry["sha256"])
+    if is_new:
+        log_message(
+            f"Purgeable Excel downloaded -> {entry['file']} ({entry['rows']} rows, latest via {method})"
+        )
+    else:
+        log_message(
+            f"Purgeable Excel unchanged since {entry['first_seen']}; reusing stored snapshot."
+        )
+    return blob
+
+
+def _prune_purgeable_snapshots(store_dir: Path | None = None, protect=()):
+    removed = purger_snapshots.apply_retention(
+        store_dir or _snapshot_store_dir(),
+        keep=SNAPSHOT_KEEP,
+        max_age_days=SNAPSHOT_MAX_AGE_DAYS,
+        protect=protect,
+    )
+    if removed:
+        freed = sum(entry.get("bytes", 0) for entry in removed)
+        log_message(f"Snapshot retention removed {len(removed)} snapshot(s), {freed} bytes.")
+    return removed
+
+
+def _purgeable_sidecar_meta_path(path: Path) -> Path:
+    return path.with_name(f"{path.stem}.sidecar.json")
+
+
+def _sidecar_format():
+    # Feather only: the sidecar lives on the shared PDCC drive, so formats that
+    # can execute code when loaded (pickle) are never written or read.
+    try:
+        import pyarrow  # type: ignore  # noqa: F401
+    except ImportError:
+        return None
+    return "feather"
+
+
+def _categorize_purgeable_columns(df):
+    """Store the Package column (and other low-cardinality text columns) as categoricals."""
+    rows = max(1, len(df))
+    for column in df.columns:
+        if df[column].dtype != object:
+            continue
+        is_package = "package" in str(column).lower()
+        if is_package or df[column].nunique(dropna=True) / rows < PURGEABLE_CATEGORY_RATIO:
+            df[column] = df[column].astype("category")
+    return df
+
+
+def write_purgeable_sidecar(path: Path, df, digest=None):
+    """
+    Persist df next to the workbook as Feather, keyed by the workbook's SHA-256
+    so a replaced snapshot never reads a stale sidecar. Without pyarrow no
+    sidecar is written and the workbook is parsed each time. Returns the
+    sidecar path or None.
+    """
+    if _sidecar_format() is None:
+        return None
+    digest = digest or file_sha256(path)
+    data_path = path.with_suffix(".feather")
+    partial = data_path.with_name(data_path.name + ".partial")
+    try:
+        df.reset_index(drop=True).to_feather(partial)
+        partial.replace(data_path)
+        meta = {
+            "version": PURGEABLE_SIDECAR_VERSION,
+            "sha256": digest,
+            "format": "feather",
+            "data": data_path.name,
+            "rows": int(df.shape[0]),
+        }
+        _purgeable_sidecar_meta_path(path).write_text(json.dumps(meta), encoding="utf-8")
+    except Exception as exc:
+        log_message(f"Unable to write purgeable sidecar for {path.name}: {exc}")
+        partial.unlink(missing_ok=True)
+        return None
+    return data_path
+
+
+def refresh_purgeable_sidecar(path: Path, digest):
+    """Write the sidecar for a freshly stored snapshot unless one already matches it."""
+    if _sidecar_format() is None or _sidecar_meta_matches(path, digest):
+        return None
+    try:
+        df = _categorize_purgeable_columns(load_pandas().read_excel(path))
+    except Exception as exc:
+        log_message(f"Purgeable sidecar skipped; {path.name} could not be parsed: {exc}")
+        return None
+    return write_purgeable_sidecar(path, df, digest)
+
+
+def _sidecar_meta_matches(path: Path, digest):
+    try:
+        meta = json.loads(_purgeable_sidecar_meta_path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if (
+        meta.get("version") != PURGEABLE_SIDECAR_VERSION
+        or meta.get("sha256") != digest
+        or meta.get("format") != "feather"
+    ):
+        return None
+    return meta
+
+
+def _read_purgeable_sidecar(path: Path, digest):
+    if _sidecar_format() is None:
+        return None
+    meta = _sidecar_meta_matches(path, digest)
+    if meta is None:
+        return None
+    data_path = path.with_name(Path(meta.get("data", "")).name)
+    try:
+        return load_pandas().read_feather(data_path)
+    except Exception as exc:
+        log_message(f"Ignoring unreadable purgeable sidecar {data_path.name}: {exc}")
+        return None
+
+
+def _load_purgeable_dataframe(path: Path):
+    """
+    Load the purgeable workbook, preferring the Feather sidecar written when the
+    snapshot was stored if it matches the workbook's content hash; otherwise
+    parse the Excel file.
+    """
+    pd = load_pandas()
+    if _sidecar_format() is not None:
+        df = _read_purgeable_sidecar(path, file_sha256(path))
+        if df is not None:
+            return df
+    return _categorize_purgeable_columns(pd.read_excel(path))
+
+
+def _discover_packages_from_dataframe(df):
+    if df.empty:
+        return []
+    package_col = None
+    for column in df.columns:
+        if "package" in column.lower():
+            package_col = column
+            break
+    if package_col is None:
+        return []
+    packages = (
+        df[package_col]
+        .dropna()
+        .astype(str)
+        .map(lambda x: x.strip())
+        .replace("", None)
         .dropna()
         .unique()
         .tolist()
@@ -895,23 +2040,200 @@ def _discover_packages_from_dataframe(df):
     return packages
 
 
-def find_purgeable_clients(headless=False, limit=10000, purgeable_url=None):
+def _package_column_index(header):
+    for index, column in enumerate(header):
+        if "package" in column.lower():
+            return index
+    return None
+
+
+def summarize_purgeable_workbook(path: Path):
+    """Count rows and discover packages by streaming the workbook (no DataFrame)."""
+    rows = iter_workbook_rows(path)
+    header = [("" if h is None else str(h)) for h in (next(rows, None) or ())]
+    package_idx = _package_column_index(header)
+    record_count = 0
+    packages = set()
+    for row in rows:
+        if not row or all(value is None for value in row):
+            continue
+        record_count += 1
+        if package_idx is not None and package_idx < len(row) and row[package_idx] is not None:
+            name = str(row[package_idx]).strip()
+            if name:
+                packages.add(name)
+    if package_idx is None or not record_count:
+        return {"record_count": record_count, "packages": []}
+    return {"record_count": record_count, "packages": sorted(packages) or PACKAGE_FALLBACK_NAMES}
+
+
+def _previous_purgeable_snapshot(store_dir: Path | None = None):
+    """Return the most recently downloaded snapshot in the store, if any."""
+    store_dir = store_dir or _snapshot_store_dir()
+    purger_snapshots.ingest_legacy_snapshots(
+        store_dir, store_dir.parent, row_counter=_snapshot_row_count
+    )
+    entry = purger_snapshots.latest_entry(store_dir)
+    if entry is None or not (store_dir / entry["file"]).exists():
+        return None
+    return store_dir / entry["file"]
+
+
+def _snapshot_clients(path: Path):
+    """Map client ID -> (package, normalised row) for one purgeable snapshot."""
+    clients = {}
+    for entry, row in iter_manifest_entries(path):
+        clients[entry["client_id"]] = (entry["package"], row)
+    return clients
+
+
+def _client_sort_key(client_id):
+    return (0, int(client_id), "") if client_id.isdigit() else (1, 0, client_id)
+
+
+def diff_purgeable_snapshots(previous_path: Path, current_path: Path):
+    """
+    Compare two purgeable snapshots by client ID. Returns added, removed and
+    changed clients plus the packages whose bundles are affected.
+    """
+    before = _snapshot_clients(previous_path)
+    after = _snapshot_clients(current_path)
+    if (before or after) and not (before and after):
+        # One side without recognisable client IDs means we cannot trust the diff.
+        raise ValueError("Snapshot has no client ID column; cannot diff.")
+    packages = {}
+
+    def touch(package):
+        if package:
+            packages.setdefault(_normalize_package(package), package)
+
+    added = []
+    for client_id in sorted(after.keys() - before.keys(), key=_client_sort_key):
+        package = after[client_id][0]
+        touch(package)
+        added.append({"client_id": client_id, "package": package})
+    removed = []
+    for client_id in sorted(before.keys() - after.keys(), key=_client_sort_key):
+        package = before[client_id][0]
+        touch(package)
+        removed.append({"client_id": client_id, "package": package})
+    changed = []
+    for client_id in sorted(before.keys() & after.keys(), key=_client_sort_key):
+        old_package, old_row = before[client_id]
+        new_package, new_row = after[client_id]
+        fields = sorted(
+            key
+            for key in old_row.keys() | new_row.keys()
+            if old_row.get(key, "") != new_row.get(key, "")
+        )
+        if not fields:
+            continue
+        touch(old_package)
+        touch(new_package)
+        changed.append(
+            {
+                "client_id": client_id,
+                "package": new_package,
+                "previous_package": old_package,
+                "fields": fields,
+            }
+        )
+    return {
+        "previous": Path(previous_path).name,
+        "current": Path(current_path).name,
+        "added": added,
+        "removed": removed,
+        "changed": changed,
+        "packages": sorted(packages.values()),
+    }
+
+
+def write_snapshot_change_log(changes, directory: Path | None = None) -> Path:
+    """Write a snapshot diff as JSON under _downloads/_changes/ and return its path."""
+    target_dir = directory or SNAPSHOT_CHANGES_DIR
+    target_dir.mkdir(parents=True, exist_ok=True)
+    path = target_dir / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_changes.json"
+    payload = dict(changes, generated_at=datetime.now(timezone.utc).isoformat())
+    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    return path
+
+
+def _record_snapshot_changes(previous: Path | None, current: Path):
+    if previous is None:
+        log_message("No previous purgeable snapshot to compare against.")
+        return None
+    if previous == current:
+        log_message("Purgeable snapshot identical to the previous download; no client changes.")
+        return {
+            "previous": previous.name,
+            "current": current.name,
+            "added": [],
+            "removed": [],
+            "changed": [],
+            "packages": [],
+        }
+    try:
+        changes = diff_purgeable_snapshots(previous, current)
+    except Exception as exc:
+        log_message(f"Unable to diff purgeable snapshots ({exc}); bundles will be rebuilt.")
+        return None
+    changes["log_path"] = str(write_snapshot_change_log(changes))
+    log_message(
+        f"Snapshot changes since {previous.name}: {len(changes['added'])} added, "
+        f"{len(changes['removed'])} removed, {len(changes['changed'])} changed "
+        f"across {len(changes['packages'])} package(s)."
+    )
+    return changes
+
+
+def find_purgeable_clients(
+    headless=False, limit=10000, purgeable_url=None, *, include_dataframe=True, source=None
+):
+    """
+    Download the purgeable client list into the PDCC snapshot.
+    With include_dataframe=False the workbook is summarised by streaming it and
+    no DataFrame is kept in memory (the GUI uses this). The new download is
+    diffed against the previous one; the result is returned under "changes"
+    (None when there is nothing to compare against). source="table" reads the
+    rendered result table instead of downloading the Excel export.
+    """
     ensure_pdcc_root()
+    store_dir = _snapshot_store_dir()
+    previous = _previous_purgeable_snapshot(store_dir)
     driver = build_chrome_driver(headless=headless, download_dir=PDCC_DOWNLOADS_DIR)
     try:
         login(driver)
-        excel_path = _download_purgeable_clients_excel(
-            driver,
-            limit=limit,
-            download_dir=PDCC_DOWNLOADS_DIR,
-            purgeable_url=purgeable_url,
-        )
+        if (source or DISCOVERY_SOURCE) == "table":
+            excel_path = _harvest_purgeable_clients_table(
+                driver,
+                limit=limit,
+                download_dir=PDCC_DOWNLOADS_DIR,
+                purgeable_url=purgeable_url,
+                headless=headless,
+            )
+        else:
+            excel_path = _download_purgeable_clients_excel(
+                driver,
+                limit=limit,
+                download_dir=PDCC_DOWNLOADS_DIR,
+                purgeable_url=purgeable_url,
+            )
     finally:
         driver.quit()
+    changes = _record_snapshot_changes(previous, excel_path)
+    # Keep the snapshot this download was diffed against, whatever the retention settings.
+    protect = [excel_path.stem] + ([previous.stem] if previous else [])
+    _prune_purgeable_snapshots(store_dir, protect=protect)
     latest = LATEST_PURGEABLE_EXCEL
-    df = _load_purgeable_dataframe(latest)
-    packages = _discover_packages_from_dataframe(df)
-    record_count = int(df.shape[0])
+    if include_dataframe:
+        df = _load_purgeable_dataframe(latest)
+        packages = _discover_packages_from_dataframe(df)
+        record_count = int(df.shape[0])
+    else:
+        df = None
+        summary = summarize_purgeable_workbook(latest)
+        packages = summary["packages"]
+        record_count = summary["record_count"]
     log_message(
         f"Found {record_count} purgeable clients across {len(packages)} package(s). Excel snapshot saved at {latest}"
     )
@@ -920,38 +2242,274 @@ def find_purgeable_clients(headless=False, limit=10000, purgeable_url=None):
         "record_count": record_count,
         "packages": packages,
         "dataframe": df,
+        "changes": changes,
     }
 
 
-def _export_package_dataframe(df, package_name, package_col, overwrite=False):
-    normalized_target = _normalize_package(package_name)
+def _package_export_paths(package_name, create=True):
     folder_name = re.sub(r"[\\/]+", "-", (package_name or "Package").strip()) or "Package"
-    package_dir = ensure_pdcc_root() / folder_name
-    package_dir.mkdir(parents=True, exist_ok=True)
+    package_dir = (ensure_pdcc_root() if create else PDCC_ROOT) / folder_name
+    if create:
+        package_dir.mkdir(parents=True, exist_ok=True)
     safe_stem = sanitize_component(package_name or "Package")
     excel_path = package_dir / f"{safe_stem}_clients.xlsx"
     csv_path = package_dir / f"{safe_stem}_clients.csv"
-    if not overwrite and excel_path.exists() and csv_path.exists():
-        log_message(f"{package_name} bundle already exists; skipping. Use update to refresh.")
-        return {"package": package_name, "rows": None, "skipped": True}
+    return excel_path, csv_path
 
-    mask = (
-        df[package_col]
-        .fillna("")
-        .astype(str)
-        .map(_normalize_package)
-        == normalized_target
-    )
-    subset = df.loc[mask]
+
+def _write_package_export(subset, excel_path, csv_path):
+    """Write one package's Excel/CSV pair (runs inside the bundle process pool)."""
     subset.to_excel(excel_path, index=False)
     subset.to_csv(csv_path, index=False)
-    if subset.empty:
-        log_message(f"Package '{package_name}' export created (empty placeholder).")
+    return int(len(subset))
+
+
+def _group_rows_by_package(df, package_col):
+    """Normalise the package column once and split the frame in a single groupby pass."""
+    pd = load_pandas()
+    column = df[package_col]
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        # Normalise each category once and expand through the codes (-1 -> "").
+        categories = column.cat.categories.astype(str).str.strip().str.lower().tolist()
+        lookup = pd.Series(categories + [""]).to_numpy()
+        keys = pd.Series(lookup[column.cat.codes.to_numpy()], index=df.index)
     else:
-        log_message(
-            f"Package '{package_name}' export created with {len(subset)} client(s) -> {excel_path.name} / {csv_path.name}"
-        )
-    return {"package": package_name, "rows": int(len(subset)), "skipped": False}
+        keys = column.fillna("").astype(str).str.strip().str.lower()
+    return {key: group for key, group in df.groupby(keys, sort=False, observed=True)}
+
+
+def _run_package_writes(jobs, workers):
+    """Run (package, subset, excel_path, csv_path) jobs, in a process pool when worthwhile."""
+    if workers > 1 and len(jobs) > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+                futures = [
+                    pool.submit(_write_package_export, subset, excel_path, csv_path)
+                    for _, subset, excel_path, csv_path in jobs
+                ]
+                return [future.result() for future in futures]
+        except (BrokenProcessPool, OSError) as exc:
+            log_message(f"Parallel bundle writers unavailable ({exc}); writing serially.")
+    return [
+        _write_package_export(subset, excel_path, csv_path)
+        for _, subset, excel_path, csv_path in jobs
+    ]
+
+
+def _should_skip_bundle(package_name, excel_path, csv_path, overwrite, refresh_keys):
+    if overwrite or not (excel_path.exists() and csv_path.exists()):
+        return False
+    if refresh_keys is None:
+        log_message(f"{package_name} bundle already exists; skipping. Use update to refresh.")
+        return True
+    if _normalize_package(package_name) in refresh_keys:
+        return False
+    log_message(f"{package_name} bundle unchanged since the previous snapshot; skipping.")
+    return True
+
+
+def _export_package_bundles(
+    df, packages, package_col, *, overwrite=False, workers=None, refresh_packages=None
+):
+    """
+    Export every requested package from one normalise-and-group pass over df.
+    Existing bundles are skipped unless overwrite is set or the package is listed
+    in refresh_packages; returns the exports summary in package order.
+    """
+    workers = workers or BUNDLE_EXPORT_WORKERS
+    refresh_keys = (
+        None if refresh_packages is None
+        else {_normalize_package(pkg) for pkg in refresh_packages}
+    )
+    groups = _group_rows_by_package(df, package_col)
+    empty = df.iloc[0:0]
+    exports = []
+    jobs = []
+    for package_name in packages:
+        excel_path, csv_path = _package_export_paths(package_name)
+        if _should_skip_bundle(package_name, excel_path, csv_path, overwrite, refresh_keys):
+            exports.append({"package": package_name, "rows": None, "skipped": True})
+            continue
+        subset = groups.get(_normalize_package(package_name), empty)
+        exports.append({"package": package_name, "rows": None, "skipped": False})
+        jobs.append((package_name, subset, excel_path, csv_path))
+
+    row_counts = iter(_run_package_writes(jobs, workers))
+    written = iter(jobs)
+    for export in exports:
+        if export["skipped"]:
+            continue
+        package_name, _, excel_path, csv_path = next(written)
+        export["rows"] = next(row_counts)
+        if not export["rows"]:
+            log_message(f"Package '{package_name}' export created (empty placeholder).")
+        else:
+            log_message(
+                f"Package '{package_name}' export created with {export['rows']} client(s) -> {excel_path.name} / {csv_path.name}"
+            )
+    return exports
+
+
+def _dedupe_packages(packages):
+    unique_packages = []
+    seen = set()
+    for pkg in packages:
+        key = _normalize_package(pkg)
+        if not key or key in seen:
+            continue
+        seen.add(key)
+        unique_packages.append(pkg)
+    return unique_packages
+
+
+class _PackageStreamWriter:
+    """Append rows to one package's CSV and write-only XLSX, swapped in on close."""
+
+    def __init__(self, header, excel_path, csv_path):
+        self.excel_path = excel_path
+        self.csv_path = csv_path
+        self.partial_excel = excel_path.with_suffix(".partial.xlsx")
+        self.partial_csv = csv_path.with_suffix(".partial.csv")
+        self.workbook = load_openpyxl().Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet()
+        self.csv_fh = open(self.partial_csv, "w", newline="", encoding="utf-8")
+        self.csv_writer = csv.writer(self.csv_fh)
+        self.sheet.append(header)
+        self.csv_writer.writerow(header)
+        self.rows = 0
+
+    def append(self, row):
+        self.sheet.append(row)
+        self.csv_writer.writerow(["" if value is None else value for value in row])
+        self.rows += 1
+
+    def close(self):
+        self.csv_fh.close()
+        self.workbook.save(self.partial_excel)
+        self.partial_csv.replace(self.csv_path)
+        self.partial_excel.replace(self.excel_path)
+        return self.rows
+
+    def abort(self):
+        self.csv_fh.close()
+        self.partial_csv.unlink(missing_ok=True)
+        self.partial_excel.unlink(missing_ok=True)
+
+
+def stream_package_bundles(source_path, packages=None, *, overwrite=False, refresh_packages=None):
+    """
+    Build package bundles by streaming the purgeable workbook row by row.
+    Each row is routed straight to its package's CSV/XLSX writer, so peak memory
+    stays flat regardless of export size. Without packages, every package found in
+    the workbook is exported (sorted, as with the DataFrame path).
+    """
+    source_path = Path(source_path)
+    rows = iter_workbook_rows(source_path)
+    header = [("" if h is None else str(h)) for h in (next(rows, None) or ())]
+    package_idx = _package_column_index(header)
+    if not header:
+        raise RuntimeError("Purgeable client dataset is empty; cannot build bundles.")
+    if package_idx is None:
+        raise RuntimeError("Unable to locate a 'Package' column in the purgeable dataset.")
+
+    requested = _dedupe_packages(packages) if packages else None
+    refresh_keys = (
+        None if refresh_packages is None
+        else {_normalize_package(pkg) for pkg in refresh_packages}
+    )
+    writers = {}
+    exports = {}
+
+    def open_package(key, package_name):
+        excel_path, csv_path = _package_export_paths(package_name)
+        if _should_skip_bundle(package_name, excel_path, csv_path, overwrite, refresh_keys):
+            writers[key] = None
+            exports[key] = {"package": package_name, "rows": None, "skipped": True}
+            return
+        writers[key] = _PackageStreamWriter(header, excel_path, csv_path)
+        exports[key] = {"package": package_name, "rows": 0, "skipped": False}
+
+    record_count = 0
+    try:
+        for name in requested or ():
+            open_package(_normalize_package(name), name)
+        for row in rows:
+            if not row or all(value is None for value in row):
+                continue
+            record_count += 1
+            value = row[package_idx] if package_idx < len(row) else None
+            key = _normalize_package("" if value is None else str(value))
+            if key not in writers:
+                if requested is not None or not key:
+                    continue
+                open_package(key, str(value).strip())
+            writer = writers[key]
+            if writer is not None:
+                writer.append(row)
+        if not record_count:
+            raise RuntimeError("Purgeable client dataset is empty; cannot build bundles.")
+        if requested is None and not exports:
+            for name in PACKAGE_FALLBACK_NAMES:
+                open_package(_normalize_package(name), name)
+    except BaseException:
+        rows.close()
+        for writer in writers.values():
+            if writer is not None:
+                writer.abort()
+        raise
+
+    for key, writer in writers.items():
+        if writer is not None:
+            exports[key]["rows"] = writer.close()
+
+    ordered = list(exports.values())
+    if requested is None:
+        ordered.sort(key=lambda export: export["package"])
+    for export in ordered:
+        if export["skipped"]:
+            continue
+        if not export["rows"]:
+            log_message(f"Package '{export['package']}' export created (empty placeholder).")
+        else:
+            log_message(
+                f"Package '{export['package']}' export streamed with {export['rows']} client(s)."
+            )
+    return {
+        "excel_path": source_path,
+        "packages": [export["package"] for export in ordered],
+        "exports": ordered,
+        "record_count": record_count,
+    }
+
+
+def _bundle_baseline_changes(latest_changes):
+    """
+    Diff the new snapshot against the one the bundles were last fully built
+    from. latest_changes (the diff against the previous download) is reused when
+    that is the baseline; None means the baseline is unknown and every package
+    must be rebuilt.
+    """
+    store_dir = _snapshot_store_dir()
+    baseline = purger_snapshots.bundle_baseline(store_dir)
+    current = purger_snapshots.latest_entry(store_dir)
+    if not baseline or current is None:
+        log_message("No record of the snapshot the bundles were built from; rebuilding every package.")
+        return None
+    baseline_path = store_dir / f"{baseline}.xlsx"
+    if not baseline_path.exists():
+        log_message(f"Bundle baseline {baseline_path.name} is no longer stored; rebuilding every package.")
+        return None
+    if latest_changes is not None and latest_changes["previous"] == baseline_path.name:
+        return latest_changes
+    return _record_snapshot_changes(baseline_path, store_dir / current["file"])
+
+
+def _record_bundle_baseline(built_from, exports, all_packages, overwrite, refresh_packages):
+    """Remember the snapshot once every package bundle reflects it."""
+    if built_from is None or not all_packages:
+        return
+    if overwrite or refresh_packages is not None or not any(export["skipped"] for export in exports):
+        purger_snapshots.set_bundle_baseline(_snapshot_store_dir(), built_from["sha256"])
 
 
 def bundle_package_download(
@@ -962,18 +2520,60 @@ def bundle_package_download(
     overwrite=False,
     limit=10000,
     purgeable_url=None,
+    workers=None,
+    streaming=False,
+    source=None,
 ):
+    """
+    Split the purgeable client snapshot into per-package Excel/CSV bundles.
+    streaming=True reads the workbook row by row instead of loading it into pandas.
+    With refresh the list is re-downloaded and only packages whose clients changed
+    since the snapshot the bundles were last fully built from are rewritten
+    (overwrite rewrites every package, as does a refresh with no known baseline).
+    """
     ensure_pdcc_root()
     dataframe = None
     package_col = None
     packages_found = []
+    snapshot = None
+    refresh_packages = None
+    all_packages = not packages
 
     if refresh or not LATEST_PURGEABLE_EXCEL.exists():
         snapshot = find_purgeable_clients(
-            headless=headless, limit=limit, purgeable_url=purgeable_url
+            headless=headless,
+            limit=limit,
+            purgeable_url=purgeable_url,
+            include_dataframe=not streaming,
+            source=source,
         )
-        dataframe = snapshot["dataframe"]
         packages_found = snapshot["packages"]
+        if refresh and not overwrite:
+            changes = _bundle_baseline_changes(snapshot.get("changes"))
+            snapshot["changes"] = changes
+            if changes is None:
+                overwrite = True
+            else:
+                refresh_packages = changes["packages"]
+                if not packages:
+                    # Packages that lost every client still need an empty rewrite.
+                    packages = _dedupe_packages(packages_found + refresh_packages)
+    built_from = purger_snapshots.latest_entry(_snapshot_store_dir())
+
+    if streaming:
+        result = stream_package_bundles(
+            LATEST_PURGEABLE_EXCEL,
+            packages,
+            overwrite=overwrite,
+            refresh_packages=refresh_packages,
+        )
+        result["excel_path"] = LATEST_PURGEABLE_EXCEL
+        result["changes"] = snapshot.get("changes") if snapshot else None
+        _record_bundle_baseline(built_from, result["exports"], all_packages, overwrite, refresh_packages)
+        return result
+
+    if snapshot is not None:
+        dataframe = snapshot["dataframe"]
     else:
         dataframe = _load_purgeable_dataframe(LATEST_PURGEABLE_EXCEL)
         packages_found = _discover_packages_from_dataframe(dataframe)
@@ -991,15 +2591,7 @@ def bundle_package_download(
     if not packages:
         packages = packages_found or PACKAGE_FALLBACK_NAMES
 
-    unique_packages = []
-    seen = set()
-    for pkg in packages:
-        key = _normalize_package(pkg)
-        if not key or key in seen:
-            continue
-        seen.add(key)
-        unique_packages.append(pkg)
-    packages = unique_packages
+    packages = _dedupe_packages(packages)
     if not packages:
         log_message("No package names available for bundle export.")
         return {
@@ -1008,25 +2600,25 @@ def bundle_package_download(
             "exports": [],
         }
 
-    exports = []
-    for package in packages:
-        exports.append(
-            _export_package_dataframe(
-                dataframe,
-                package,
-                package_col,
-                overwrite=overwrite or refresh,
-            )
-        )
+    exports = _export_package_bundles(
+        dataframe,
+        packages,
+        package_col,
+        overwrite=overwrite,
+        workers=workers,
+        refresh_packages=refresh_packages,
+    )
+    _record_bundle_baseline(built_from, exports, all_packages, overwrite, refresh_packages)
 
     return {
         "excel_path": LATEST_PURGEABLE_EXCEL,
         "packages": packages,
         "exports": exports,
+        "changes": snapshot.get("changes") if snapshot else None,
     }
 
 def build_chrome_driver(headless=False, download_dir=None):
-    target_dir = download_dir or OUTPUT_DIR
+    target_dir = download_dir or _download_dir()
     if target_dir is None:
         raise RuntimeError("Output directory not configured before creating driver.")
 
@@ -1054,9 +2646,13 @@ def run_turnpoint_purge(
     *,
     allow_duplicate=False,
     prompt_on_duplicate=False,
+    universal_id=None,
+    package=None,
 ):
     """
     Execute the end-to-end extraction flow for a client ID.
+    universal_id overrides the locally reserved slot (used by the shared work queue);
+    package labels the run in the cost model used for batch scheduling.
     Returns the final output directory path.
     """
     guard_against_duplicate(
@@ -1065,7 +2661,7 @@ def run_turnpoint_purge(
         prompt_on_duplicate=prompt_on_duplicate,
     )
     universal_slot, purged_so_far = reserve_universal_sequence()
-    assign_universal_sequence(universal_slot)
+    assign_universal_sequence(universal_id or universal_slot)
     log_message(
         f"Universal sequence {UNIVERSAL_CLIENT_ID} armed. "
         f"{purged_so_far} client(s) purged so far."
@@ -1087,29 +2683,66 @@ def run_turnpoint_purge(
         ("NDIS-Budget", extract_ndis_budget),
     ]
 
-    log_message(f"Launching Turnpoint session for client {client_id}")
+    log_message(f"Launching Turnpoint session for client {client_id} (throttle: {THROTTLE.describe()})")
     success = False
+    if PENDING_POST_PROCESSING:
+        # An earlier run stopped before draining; let its tasks finish (and log
+        # their failures) before its metrics and written-file list are reset.
+        log_message(
+            f"Waiting for {len(PENDING_POST_PROCESSING)} background task(s) left over from the previous run."
+        )
+        drain_post_processing()
+    LAST_PAGE_FAILURES.clear()
+    RUN_METRICS.clear()
+    RUN_METRICS.update({"documents": 0, "notes": 0, "package": package or ""})
+    with _RUN_WRITTEN_LOCK:
+        RUN_WRITTEN.clear()
+    started = time.monotonic()
     try:
-        login(driver)
+        try:
+            login(driver)
+        except Exception as exc:
+            raise PurgeStepError("login", f"TurnPoint login failed: {exc}") from exc
 
         for page_name, extractor in pages_and_extractors:
+            if PURGE_STOP is not None and PURGE_STOP.is_set():
+                raise LeaseLostError(
+                    f"Stopped before {page_name}: client {client_id} was reclaimed by another worker."
+                )
             try:
                 rows = extractor(driver)
-                if page_name == "Client-Details" and rows:
-                    new_name = derive_client_name_from_record(rows[0])
-                    update_final_client_name(new_name)
+                if page_name == "Client-Details":
+                    if rows:
+                        update_final_client_name(derive_client_name_from_record(rows[0]))
+                    # Rename now, while the folder is empty, so every later file
+                    # (documents, budget) is written straight into the final archive.
+                    finalize_output_directory()
+                if page_name == "Notes":
+                    RUN_METRICS["notes"] = len(rows)
                 write_csv(page_name, rows)
                 log_message(f"Extracted {len(rows)} rows for {page_name}")
             except Exception as e:
-                # log but continue
+                # log and carry on with the other pages; the purge still fails below
                 log_message(f"Error extracting {page_name}: {e}")
+                LAST_PAGE_FAILURES.append(
+                    {"page": page_name, "kind": classify_purge_failure(e), "error": str(e)}
+                )
+        if LAST_PAGE_FAILURES:
+            raise page_failure_error(LAST_PAGE_FAILURES)
         success = True
     finally:
         driver.quit()
+        drain_post_processing()
         finalize_output_directory()
+        finalize_sqlite_archive()
+        write_run_checksums()
+        if DOWNLOAD_DIR is not None:
+            shutil.rmtree(DOWNLOAD_DIR, ignore_errors=True)
 
     if success:
-        archive_bytes = calculate_directory_bytes(FINAL_OUTPUT_DIR)
+        archive_bytes = run_bytes_written()
+        if VERIFY_ARCHIVE_BYTES:
+            verify_archive_bytes(FINAL_OUTPUT_DIR, archive_bytes)
         timestamp_iso = datetime.now(timezone.utc).isoformat()
         state = record_purge_event(
             universal_id=UNIVERSAL_CLIENT_ID,
@@ -1119,8 +2752,16 @@ def run_turnpoint_purge(
             bytes_written=archive_bytes,
             timestamp_iso=timestamp_iso,
             operator=OPERATOR_NAME,
+            metrics=dict(RUN_METRICS, duration_seconds=round(time.monotonic() - started, 1)),
         )
         log_message(f"Purging complete. Files saved to {FINAL_OUTPUT_DIR}")
+        if RUN_METRICS.get("documents_deduplicated"):
+            log_message(
+                f"Document store: {RUN_METRICS['documents_deduplicated']} of "
+                f"{RUN_METRICS['documents']} document(s) already stored, "
+                f"{RUN_METRICS['dedup_bytes_saved'] / (1024 ** 2):.1f} MB not written again."
+            )
+        queue_archive_packaging(FINAL_OUTPUT_DIR, CLIENT_ID, UNIVERSAL_CLIENT_ID)
         log_message(
             f"Purge counters updated -> total {state['purged_count']} | "
             f"next universal slot {state['next_universal_id']}"
@@ -1172,50 +2813,204 @@ def _normalize_package(value):
     return (value or "").strip().lower()
 
 
-def load_client_manifest(manifest_path):
-    """
-    Load a CSV manifest of clients with columns: client_id, client_name, package.
-    Returns a list of dictionaries preserving file order.
-    """
+def _normalize_manifest_header(value):
+    return re.sub(r"[^a-z0-9]+", "_", (value or "").strip().lower()).strip("_")
+
+
+def _first_manifest_value(row, columns):
+    for column in columns:
+        value = row.get(column)
+        if value:
+            return value
+    return ""
+
+
+def _iter_csv_manifest_rows(path: Path):
+    with path.open("r", newline="", encoding="utf-8-sig") as fh:
+        reader = csv.reader(fh)
+        headers = next(reader, None)
+        if not headers or not any(h.strip() for h in headers):
+            raise ValueError(f"Manifest {path} has no headers.")
+        keys = [_normalize_manifest_header(h) for h in headers]
+        for raw_row in reader:
+            yield {key: (value or "").strip() for key, value in zip(keys, raw_row)}
+
+
+def _iter_excel_manifest_rows(path: Path):
+    rows = iter_workbook_rows(path)
+    headers = next(rows, None)
+    if not headers or not any(h is not None and str(h).strip() for h in headers):
+        rows.close()
+        raise ValueError(f"Manifest {path} has no headers.")
+    keys = [_normalize_manifest_header(str(h) if h is not None else "") for h in headers]
+    for raw_row in rows:
+        yield {
+            key: ("" if value is None else str(value).strip())
+            for key, value in zip(keys, raw_row)
+        }
+
+
+def iter_manifest_rows(manifest_path):
+    """
+    Stream manifest rows (CSV or Excel, e.g. a PDCC bundle) one at a time.
+    Headers are normalised to snake_case so "Client ID" and "client_id" match.
+    """
+    path = Path(manifest_path).expanduser()
+    if path.suffix.lower() in (".xlsx", ".xlsm"):
+        return _iter_excel_manifest_rows(path)
+    return _iter_csv_manifest_rows(path)
+
+
+def _resolve_manifest_columns(keys):
+    """
+    Map normalised headers to client_id/client_name/package candidates.
+    Known aliases win; otherwise headers are matched loosely (e.g. "TP Client ID",
+    "Participant Name", "Package Type") so purgeable snapshots and PDCC bundles
+    work as manifests without renaming columns.
+    """
+    keys = list(keys)
+
+    def pick(aliases, matches):
+        exact = [alias for alias in aliases if alias in keys]
+        fuzzy = sorted(
+            (key for key in keys if key not in exact and matches(key)),
+            key=lambda key: "client" not in key,
+        )
+        return tuple(exact + fuzzy)
+
+    return {
+        "client_id": pick(
+            MANIFEST_ID_COLUMNS,
+            lambda key: "package" not in key and re.search(r"(^|_)e?id$", key),
+        ),
+        "client_name": pick(
+            MANIFEST_NAME_COLUMNS, lambda key: "name" in key and "package" not in key
+        ),
+        "package": pick(
+            MANIFEST_PACKAGE_COLUMNS, lambda key: "package" in key and not key.endswith("_id")
+        ),
+    }
+
+
+def iter_manifest_entries(manifest_path):
+    """Yield (entry, row) pairs, resolving the manifest's columns from its headers."""
+    columns = None
+    for row in iter_manifest_rows(manifest_path):
+        if columns is None:
+            columns = _resolve_manifest_columns(row.keys())
+        entry = _manifest_entry_from_row(row, columns)
+        if entry:
+            yield entry, row
+
+
+def _manifest_entry_from_row(row, columns=None):
+    columns = columns or {
+        "client_id": MANIFEST_ID_COLUMNS,
+        "client_name": MANIFEST_NAME_COLUMNS,
+        "package": MANIFEST_PACKAGE_COLUMNS,
+    }
+    client_id = _first_manifest_value(row, columns["client_id"])
+    if not client_id:
+        return None
+    if client_id.endswith(".0") and client_id[:-2].isdigit():
+        client_id = client_id[:-2]  # Excel stores numeric IDs as floats
+    return {
+        "client_id": client_id,
+        "client_name": _first_manifest_value(row, columns["client_name"]),
+        "package": _first_manifest_value(row, columns["package"]),
+    }
+
+
+def _read_manifest_cache(digest):
+    cache_path = MANIFEST_CACHE_DIR / f"v{MANIFEST_CACHE_VERSION}-{digest}.json"
+    if not cache_path.exists():
+        return None
+    try:
+        with cache_path.open("r", encoding="utf-8") as fh:
+            entries = json.load(fh)
+    except Exception:
+        return None
+    return entries if isinstance(entries, list) else None
+
+
+def _write_manifest_cache(digest, entries):
+    try:
+        MANIFEST_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_path = MANIFEST_CACHE_DIR / f"v{MANIFEST_CACHE_VERSION}-{digest}.json"
+        tmp_path = cache_path.with_suffix(".tmp")
+        with tmp_path.open("w", encoding="utf-8") as fh:
+            json.dump(entries, fh)
+        tmp_path.replace(cache_path)
+    except OSError as exc:
+        log_message(f"Manifest cache write skipped: {exc}")
+
+
+def index_client_manifest(entries):
+    """
+    Index manifest entries by normalised package and by client ID.
+    Package buckets preserve manifest order; the first row wins for duplicate IDs.
+    """
+    by_package = {}
+    by_client = {}
+    for entry in entries:
+        by_package.setdefault(_normalize_package(entry.get("package")), []).append(entry)
+        by_client.setdefault(entry["client_id"], entry)
+    return {"by_package": by_package, "by_client": by_client}
+
+
+def _load_manifest_record(manifest_path):
     path = Path(manifest_path).expanduser()
     if not path.exists():
         raise FileNotFoundError(f"Client manifest not found at {path}")
 
-    entries = []
-    with path.open("r", newline="", encoding="utf-8") as fh:
-        reader = csv.DictReader(fh)
-        if not reader.fieldnames:
-            raise ValueError(f"Manifest {path} has no headers.")
-        for raw_row in reader:
-            row = { (key or "").strip().lower(): (value or "").strip() for key, value in raw_row.items() }
-            client_id = row.get("client_id") or row.get("turnpoint_id") or row.get("client")
-            if not client_id:
-                continue
-            entries.append(
-                {
-                    "client_id": client_id,
-                    "client_name": row.get("client_name") or row.get("name") or "",
-                    "package": row.get("package") or "",
-                }
-            )
+    digest = file_sha256(path)
+    record = _MANIFEST_CACHE.get(digest)
+    if record is not None:
+        return record
+
+    entries = _read_manifest_cache(digest)
+    if entries is None:
+        entries = [entry for entry, _ in iter_manifest_entries(path)]
+        if entries:
+            _write_manifest_cache(digest, entries)
     if not entries:
         raise ValueError(f"No clients discovered in manifest {path}.")
-    return entries
 
+    record = {"entries": entries, "index": index_client_manifest(entries)}
+    _MANIFEST_CACHE[digest] = record
+    return record
 
-def select_clients_by_packages(entries, packages):
+
+def load_client_manifest(manifest_path):
+    """
+    Load a manifest of clients with columns: client_id, client_name, package.
+    Accepts CSV or Excel (PDCC bundles included); rows are streamed and the parsed
+    result is cached keyed by the file's SHA-256, so unchanged manifests load instantly.
+    Returns a list of dictionaries preserving file order.
+    """
+    return list(_load_manifest_record(manifest_path)["entries"])
+
+
+def load_manifest_index(manifest_path):
+    """Return the cached package/client index for a manifest file."""
+    return _load_manifest_record(manifest_path)["index"]
+
+
+def select_clients_by_packages(entries, packages, *, index=None):
     """Return manifest entries filtered by package order."""
     if not packages:
         return entries
+    if index is None:
+        index = index_client_manifest(entries)
+    by_package = index["by_package"]
     normalized_targets = [_normalize_package(pkg) for pkg in packages]
     selection = []
     seen_ids = set()
     for target in normalized_targets:
         matches = [
             entry
-            for entry in entries
-            if _normalize_package(entry.get("package")) == target
-            and entry["client_id"] not in seen_ids
+            for entry in by_package.get(target, ())
+            if entry["client_id"] not in seen_ids
         ]
         if not matches:
             log_message(f"No manifest entries matched package '{target}'.")
@@ -1225,10 +3020,46 @@ def select_clients_by_packages(entries, packages):
     return selection
 
 
+def resolve_generated_manifest(bundle_package=None):
+    """
+    Return the file to use as an auto-generated manifest: the CSV of a package
+    bundle when bundle_package is given, otherwise the latest purgeable snapshot.
+    """
+    if bundle_package:
+        _, csv_path = _package_export_paths(bundle_package, create=False)
+        if not csv_path.exists():
+            raise FileNotFoundError(
+                f"No bundle for package '{bundle_package}' at {csv_path}. Run --bundle-download first."
+            )
+        return csv_path
+    if not LATEST_PURGEABLE_EXCEL.exists():
+        raise FileNotFoundError(
+            f"No purgeable snapshot at {LATEST_PURGEABLE_EXCEL}. Run --find-purgeable first."
+        )
+    return LATEST_PURGEABLE_EXCEL
+
+
+def write_queue_manifest(entries, source_path):
+    """Save a resolved batch queue as a manifest CSV under PDCC_ROOT/_manifests."""
+    target_dir = ensure_pdcc_root() / "_manifests"
+    target_dir.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    path = target_dir / f"{Path(source_path).stem}_{timestamp}_queue.csv"
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["client_id", "client_name", "package"])
+        for entry in entries:
+            writer.writerow(
+                [entry["client_id"], entry.get("client_name") or "", entry.get("package") or ""]
+            )
+    return path
+
+
 def build_batch_queue(manifest_path, *, packages=None, include_all=False):
-    entries = load_client_manifest(manifest_path)
+    record = _load_manifest_record(manifest_path)
+    entries = list(record["entries"])
     if packages:
-        filtered = select_clients_by_packages(entries, packages)
+        filtered = select_clients_by_packages(entries, packages, index=record["index"])
         if not filtered:
             raise ValueError("No clients matched the requested package filters.")
         return filtered
@@ -1237,14 +3068,248 @@ def build_batch_queue(manifest_path, *, packages=None, include_all=False):
     raise ValueError("A batch run requires either --package filters or --all-clients.")
 
 
-def run_client_batch(queue, *, headless=False, allow_duplicate=False):
-    """Sequentially run the purge for each manifest entry."""
+def estimate_client_durations(entries, cost_model=None):
+    """
+    Predict purge seconds per client from the historical cost model.
+    Clients seen before use their smoothed duration; unseen clients fall back to
+    the mean of their package, then the median of every recorded client.
+    """
+    costs = get_cost_model() if cost_model is None else cost_model
+    durations = {
+        client_id: float(cost["duration_seconds"])
+        for client_id, cost in costs.items()
+        if cost.get("duration_seconds")
+    }
+    by_package = {}
+    for client_id, cost in costs.items():
+        if client_id in durations:
+            by_package.setdefault(_normalize_package(cost.get("package")), []).append(
+                durations[client_id]
+            )
+    package_means = {pkg: statistics.fmean(values) for pkg, values in by_package.items()}
+    fallback = statistics.median(durations.values()) if durations else DEFAULT_CLIENT_SECONDS
+
+    estimates = {}
+    for entry in entries:
+        client_id = entry["client_id"]
+        if client_id in durations:
+            estimates[client_id] = durations[client_id]
+        else:
+            estimates[client_id] = package_means.get(
+                _normalize_package(entry.get("package")), fallback
+            )
+    return estimates
+
+
+def estimate_batch_makespan(durations, workers=1):
+    """Return the wall-clock seconds to drain durations (in order) across workers."""
+    finish_times = [0.0] * max(1, int(workers))
+    for duration in durations:
+        earliest = heapq.heappop(finish_times)
+        heapq.heappush(finish_times, earliest + duration)
+    return max(finish_times)
+
+
+def format_duration(seconds):
+    minutes, _ = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m" if hours else f"{minutes}m"
+
+
+def plan_batch_schedule(entries, *, workers=1, strategy="lpt", cost_model=None):
+    """
+    Order a batch and estimate its ETA. The "lpt" strategy puts the heaviest
+    clients first (longest-processing-time-first) so parallel workers finish
+    together instead of one huge client trailing at the end; "manifest" keeps
+    the manifest/package order.
+    Returns (ordered_entries, estimates, eta_seconds).
+    """
+    estimates = estimate_client_durations(entries, cost_model)
+    ordered = list(entries)
+    if strategy == "lpt":
+        ordered.sort(key=lambda entry: estimates[entry["client_id"]], reverse=True)
+    eta_seconds = estimate_batch_makespan(
+        [estimates[entry["client_id"]] for entry in ordered], workers
+    )
+    finish = datetime.now().timestamp() + eta_seconds
+    log_message(
+        f"Scheduled {len(ordered)} client(s) ({strategy}) across {workers} worker(s): "
+        f"estimated {format_duration(eta_seconds)}, finishing around "
+        f"{datetime.fromtimestamp(finish).strftime('%H:%M')}."
+    )
+    return ordered, estimates, eta_seconds
+
+
+def page_failure_error(failures):
+    """
+    Turn the pages that failed during a purge into one PurgeStepError. A
+    transient kind wins so the batch retries the client instead of recording
+    a partial archive as purged.
+    """
+    kinds = [failure["kind"] for failure in failures]
+    kind = next((item for item in kinds if item in TRANSIENT_FAILURE_KINDS), kinds[0])
+    pages = ", ".join(f"{failure['page']} ({failure['kind']})" for failure in failures)
+    return PurgeStepError(kind, f"{len(failures)} page(s) failed: {pages}")
+
+
+def classify_purge_failure(exc):
+    """Map an exception raised during a purge onto a failure category."""
+    if isinstance(exc, PurgeStepError):
+        return exc.kind
+    text = str(exc).lower()
+    if isinstance(exc, TimeoutException):
+        return "download" if "download" in text else "timeout"
+    if isinstance(exc, (NoSuchElementException, ValueError, KeyError, IndexError, UnicodeError)):
+        return "parse"
+    if isinstance(exc, WebDriverException):
+        return "browser"
+    if "timed out" in text or "timeout" in text:
+        return "timeout"
+    if "download" in text:
+        return "download"
+    return "other"
+
+
+def _batch_backoff_delay(attempt):
+    return min(BATCH_BACKOFF_CAP_SECONDS, BATCH_BACKOFF_SECONDS * (2 ** (attempt - 1)))
+
+
+def _log_batch_eta(pending, estimates, predicted_done, elapsed):
+    if not pending:
+        return
+    remaining = sum(
+        estimates.get(item["entry"]["client_id"], DEFAULT_CLIENT_SECONDS) for item in pending
+    )
+    pace = elapsed / predicted_done if predicted_done else 1.0
+    log_message(
+        f"{len(pending)} client(s) remaining, ETA {format_duration(remaining * pace)}."
+    )
+
+
+def _next_ready_batch_item(pending):
+    """Pop the first item whose backoff has elapsed, sleeping when none is ready."""
+    now = time.monotonic()
+    for index, item in enumerate(pending):
+        if item["not_before"] <= now:
+            del pending[index]
+            return item
+    wait = min(item["not_before"] for item in pending) - now
+    log_message(f"All remaining clients are backing off; waiting {wait:.0f}s.")
+    time.sleep(max(0.0, wait))
+    return _next_ready_batch_item(pending)
+
+
+def write_dead_letter_report(dead_letters):
+    """Persist dead-lettered clients as a manifest so they can be re-queued later."""
+    if not dead_letters:
+        return None
+    BATCH_REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    path = BATCH_REPORTS_DIR / f"dead_letter_{timestamp}.csv"
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["client_id", "client_name", "package", "attempts", "failure_kind", "error"])
+        for item in dead_letters:
+            entry = item["entry"]
+            writer.writerow(
+                [
+                    entry["client_id"],
+                    entry.get("client_name") or "",
+                    entry.get("package") or "",
+                    item["attempts"],
+                    item["failure_kind"],
+                    item["error"],
+                ]
+            )
+    return path
+
+
+def summarize_batch_results(results, elapsed_seconds):
+    """Return (and log) throughput plus failure causes for a finished batch."""
+    statuses = Counter(r["status"] for r in results)
+    causes = Counter(r["failure_kind"] for r in results if r.get("failure_kind"))
+    page_causes = Counter(
+        failure["kind"] for r in results for failure in r.get("page_failures") or []
+    )
+    retries = sum(max(0, r.get("attempts", 1) - 1) for r in results)
+    completed = statuses.get("completed", 0)
+    hours = elapsed_seconds / 3600 if elapsed_seconds else 0
+    summary = {
+        "completed": completed,
+        "duplicates": statuses.get("duplicate", 0),
+        "failed": statuses.get("failed", 0),
+        "retries": retries,
+        "elapsed_seconds": round(elapsed_seconds, 1),
+        "clients_per_hour": round(completed / hours, 1) if hours else 0.0,
+        "failure_causes": dict(causes),
+        "page_failure_causes": dict(page_causes),
+        "documents_deduplicated": sum(
+            (r.get("metrics") or {}).get("documents_deduplicated", 0) for r in results
+        ),
+        "dedup_bytes_saved": sum(
+            (r.get("metrics") or {}).get("dedup_bytes_saved", 0) for r in results
+        ),
+    }
+    log_message(
+        f"Batch purge finished: {summary['completed']} completed, "
+        f"{summary['duplicates']} skipped as duplicates, {summary['failed']} dead-lettered "
+        f"({summary['retries']} retries) in {elapsed_seconds / 60:.1f} min "
+        f"-> {summary['clients_per_hour']} clients/hour."
+    )
+    if summary["documents_deduplicated"]:
+        log_message(
+            f"Document store: {summary['documents_deduplicated']} duplicate document(s) linked, "
+            f"{summary['dedup_bytes_saved'] / (1024 ** 2):.1f} MB saved."
+        )
+    if causes:
+        log_message(
+            "Failure causes: " + ", ".join(f"{kind}={count}" for kind, count in causes.most_common())
+        )
+    if page_causes:
+        log_message(
+            "Page-level errors: "
+            + ", ".join(f"{kind}={count}" for kind, count in page_causes.most_common())
+        )
+    return summary
+
+
+def run_client_batch(
+    queue,
+    *,
+    headless=False,
+    allow_duplicate=False,
+    max_attempts=None,
+    continue_on_error=True,
+    estimates=None,
+):
+    """
+    Run the purge for each manifest entry, retrying transient failures.
+    Clients that fail with a transient error (login, timeout, download, browser)
+    are requeued at the end of the batch with exponential backoff; anything that
+    exhausts its attempts, or fails permanently, is dead-lettered and the sweep
+    carries on unless continue_on_error is False. estimates (client_id -> seconds,
+    from plan_batch_schedule) drive the progress ETA.
+    """
+    max_attempts = max(1, max_attempts or BATCH_MAX_ATTEMPTS)
+    pending = deque(
+        {"entry": entry, "attempts": 0, "not_before": 0.0} for entry in queue
+    )
     completed = []
-    for entry in queue:
+    dead_letters = []
+    started = time.monotonic()
+    if estimates is None:
+        estimates = estimate_client_durations(queue)
+    predicted_done = 0.0
+
+    while pending:
+        item = _next_ready_batch_item(pending)
+        entry = item["entry"]
+        item["attempts"] += 1
         client_id = entry["client_id"]
         client_name = entry.get("client_name") or None
         package_label = entry.get("package") or "Unlabelled Package"
-        log_message(f"Starting purge for manifest client {client_id} [{package_label}].")
+        attempt_label = f" (attempt {item['attempts']}/{max_attempts})" if item["attempts"] > 1 else ""
+        log_message(f"Starting purge for manifest client {client_id} [{package_label}]{attempt_label}.")
         try:
             output_dir = run_turnpoint_purge(
                 client_id,
@@ -1252,12 +3317,17 @@ def run_client_batch(queue, *, headless=False, allow_duplicate=False):
                 headless=headless,
                 allow_duplicate=allow_duplicate,
                 prompt_on_duplicate=False,
+                package=entry.get("package") or None,
             )
+            predicted_done += estimates.get(client_id, DEFAULT_CLIENT_SECONDS)
+            _log_batch_eta(pending, estimates, predicted_done, time.monotonic() - started)
             completed.append(
                 {
                     "client_id": client_id,
                     "status": "completed",
                     "path": output_dir,
+                    "attempts": item["attempts"],
+                    "metrics": dict(RUN_METRICS),
                 }
             )
         except DuplicateClientError as exc:
@@ -1267,14 +3337,248 @@ def run_client_batch(queue, *, headless=False, allow_duplicate=False):
                     "client_id": client_id,
                     "status": "duplicate",
                     "path": None,
+                    "attempts": item["attempts"],
                 }
             )
         except Exception as exc:
-            log_message(f"Batch purge halted on client {client_id}: {exc}")
-            raise
+            kind = classify_purge_failure(exc)
+            if kind in TRANSIENT_FAILURE_KINDS and item["attempts"] < max_attempts:
+                delay = _batch_backoff_delay(item["attempts"])
+                item["not_before"] = time.monotonic() + delay
+                pending.append(item)
+                log_message(
+                    f"Client {client_id} hit a {kind} failure: {exc}. "
+                    f"Requeued to the end of the batch (retry in {delay:.0f}s)."
+                )
+                continue
+            item["failure_kind"] = kind
+            item["error"] = str(exc)
+            dead_letters.append(item)
+            completed.append(
+                {
+                    "client_id": client_id,
+                    "status": "failed",
+                    "path": None,
+                    "attempts": item["attempts"],
+                    "failure_kind": kind,
+                    "error": str(exc),
+                    "page_failures": list(LAST_PAGE_FAILURES),
+                }
+            )
+            log_message(
+                f"Client {client_id} dead-lettered after {item['attempts']} attempt(s) [{kind}]: {exc}"
+            )
+            if not continue_on_error:
+                log_message(f"Batch purge halted on client {client_id}: {exc}")
+                write_dead_letter_report(dead_letters)
+                raise
+
+    report_path = write_dead_letter_report(dead_letters)
+    if report_path:
+        log_message(f"Dead-letter list saved to {report_path} (re-run it with --manifest).")
+    summarize_batch_results(completed, time.monotonic() - started)
     return completed
 
 
+def default_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def enqueue_batch(queue_path, entries, *, estimates=None):
+    """
+    Persist a batch (from build_batch_queue) into the durable work queue.
+    estimates become job priorities, so workers claim the heaviest clients first.
+    """
+    added = purger_queue.enqueue_jobs(queue_path, entries, priorities=estimates)
+    log_message(
+        f"Queued {added} new client(s) at {queue_path} "
+        f"({len(entries) - added} already present)."
+    )
+    return added
+
+
+def _start_lease_heartbeat(queue_path, client_id, worker_id, lease_seconds):
+    """
+    Renew the lease in the background. Returns (stop, lost): set stop to end the
+    heartbeat; lost is set when another worker has taken the job over.
+    """
+    stop = threading.Event()
+    lost = threading.Event()
+
+    def beat():
+        while not stop.wait(max(5.0, lease_seconds / 3)):
+            try:
+                if not purger_queue.heartbeat(
+                    queue_path, client_id, worker_id, lease_seconds=lease_seconds
+                ):
+                    log_message(f"Lease for client {client_id} was lost to another worker; stopping.")
+                    lost.set()
+                    return
+            except Exception as exc:
+                log_message(f"Queue heartbeat failed for client {client_id}: {exc}")
+
+    threading.Thread(target=beat, daemon=True).start()
+    return stop, lost
+
+
+def _lease_lost_result(client_id, job):
+    log_message(
+        f"Client {client_id} is now leased by another worker; this attempt's result was not recorded."
+    )
+    return {"client_id": client_id, "status": "lease_lost", "path": None, "attempts": job["attempts"]}
+
+
+def run_queue_worker(
+    queue_path=None,
+    *,
+    headless=False,
+    allow_duplicate=False,
+    max_attempts=None,
+    worker_id=None,
+    lease_seconds=None,
+    fleet_limit=None,
+):
+    """
+    Pull clients from the shared SQLite queue until it is drained.
+    Several processes (on one or many machines sharing ARCHIVE_ROOT) can run this
+    concurrently; each job is leased, kept alive by a heartbeat thread, and
+    reclaimed by other workers if this process dies. When the heartbeat finds the
+    lease has been lost, the purge stops before its next page. fleet_limit (or
+    PURGER_FLEET_LIMIT) sets the queue's fleet-wide cap on clients in flight;
+    0 removes it.
+    """
+    global PURGE_STOP
+    queue_path = Path(queue_path or DEFAULT_QUEUE_PATH)
+    worker_id = worker_id or default_worker_id()
+    lease_seconds = lease_seconds or QUEUE_LEASE_SECONDS
+    max_attempts = max(1, max_attempts or BATCH_MAX_ATTEMPTS)
+    results = []
+    started = time.monotonic()
+    log_message(f"Queue worker {worker_id} attached to {queue_path}. Throttle: {THROTTLE.describe()}.")
+    if fleet_limit is None and QUEUE_FLEET_LIMIT:
+        fleet_limit = QUEUE_FLEET_LIMIT
+    if fleet_limit is not None:
+        purger_queue.set_meta(queue_path, "fleet_limit", max(0, int(fleet_limit)))
+        log_message(f"Fleet limit for {queue_path.name} set to {fleet_limit or 'unlimited'}.")
+
+    while True:
+        counts = purger_queue.queue_counts(queue_path)
+        active = counts.get("leased", 0)
+        THROTTLE.set_share(active + 1)
+        fleet_limit = int(purger_queue.get_meta(queue_path, "fleet_limit") or 0)
+        if fleet_limit and active >= fleet_limit and counts.get("pending"):
+            log_message(
+                f"Fleet concurrency limit {fleet_limit} reached ({active} active); waiting."
+            )
+            time.sleep(QUEUE_POLL_SECONDS)
+            continue
+        local_floor, _ = reserve_universal_sequence()
+        job = purger_queue.claim_job(
+            queue_path,
+            worker_id,
+            lease_seconds=lease_seconds,
+            universal_floor=local_floor,
+            max_attempts=max_attempts,
+        )
+        if job is None:
+            counts = purger_queue.queue_counts(queue_path)
+            if not counts.get("pending") and not counts.get("leased"):
+                break
+            next_at = counts.get("next_available_at")
+            wait = QUEUE_POLL_SECONDS
+            if counts.get("pending") and next_at:
+                wait = min(wait, max(1.0, next_at - time.time()))
+            time.sleep(wait)
+            continue
+
+        client_id = job["client_id"]
+        package_label = job["package"] or "Unlabelled Package"
+        log_message(
+            f"Worker {worker_id} leased client {client_id} [{package_label}] "
+            f"as {job['universal_id']} (attempt {job['attempts']}/{max_attempts})."
+        )
+        stop_heartbeat, PURGE_STOP = _start_lease_heartbeat(
+            queue_path, client_id, worker_id, lease_seconds
+        )
+        try:
+            output_dir = run_turnpoint_purge(
+                client_id,
+                client_name=job["client_name"] or None,
+                headless=headless,
+                allow_duplicate=allow_duplicate,
+                prompt_on_duplicate=False,
+                universal_id=job["universal_id"],
+                package=job["package"] or None,
+            )
+            if not purger_queue.complete_job(queue_path, client_id, worker_id, output_path=output_dir):
+                results.append(_lease_lost_result(client_id, job))
+                continue
+            results.append(
+                {
+                    "client_id": client_id,
+                    "status": "completed",
+                    "path": output_dir,
+                    "attempts": job["attempts"],
+                }
+            )
+        except LeaseLostError as exc:
+            log_message(str(exc))
+            results.append(_lease_lost_result(client_id, job))
+        except DuplicateClientError as exc:
+            log_message(f"Skipping client {client_id}: {exc}")
+            if not purger_queue.complete_job(queue_path, client_id, worker_id, status="duplicate"):
+                results.append(_lease_lost_result(client_id, job))
+                continue
+            results.append(
+                {"client_id": client_id, "status": "duplicate", "path": None, "attempts": job["attempts"]}
+            )
+        except Exception as exc:
+            kind = classify_purge_failure(exc)
+            retry = kind in TRANSIENT_FAILURE_KINDS and job["attempts"] < max_attempts
+            delay = _batch_backoff_delay(job["attempts"]) if retry else None
+            if not purger_queue.fail_job(
+                queue_path, client_id, worker_id, kind=kind, error=str(exc), retry_delay=delay
+            ):
+                results.append(_lease_lost_result(client_id, job))
+                continue
+            if retry:
+                log_message(
+                    f"Client {client_id} hit a {kind} failure: {exc}. "
+                    f"Returned to the queue (retry in {delay:.0f}s)."
+                )
+            else:
+                log_message(
+                    f"Client {client_id} dead-lettered after {job['attempts']} attempt(s) [{kind}]: {exc}"
+                )
+                results.append(
+                    {
+                        "client_id": client_id,
+                        "status": "failed",
+                        "path": None,
+                        "attempts": job["attempts"],
+                        "failure_kind": kind,
+                        "error": str(exc),
+                        "page_failures": list(LAST_PAGE_FAILURES),
+                    }
+                )
+        finally:
+            stop_heartbeat.set()
+            PURGE_STOP = None
+
+    log_message(f"Queue worker {worker_id} found no remaining work.")
+    summarize_batch_results(results, time.monotonic() - started)
+    return results
+
+
+def log_queue_status(queue_path=None):
+    queue_path = Path(queue_path or DEFAULT_QUEUE_PATH)
+    counts = purger_queue.queue_counts(queue_path)
+    counts.pop("next_available_at", None)
+    summary = ", ".join(f"{status}={count}" for status, count in sorted(counts.items())) or "empty"
+    log_message(f"Queue {queue_path}: {summary}")
+    return counts
+
+
 def parse_cli_args():
     parser = argparse.ArgumentParser(description="TurnPoint client purger")
     parser.add_argument(
@@ -1288,7 +3592,22 @@ def parse_cli_args():
     )
     parser.add_argument(
         "--manifest",
-        help="Path to a CSV manifest (client_id,client_name,package) for batch purges.",
+        help="Path to a CSV or Excel manifest (client_id,client_name,package) for batch purges.",
+    )
+    parser.add_argument(
+        "--from-snapshot",
+        action="store_true",
+        help="Use the latest purgeable snapshot as the batch manifest (columns are mapped automatically).",
+    )
+    parser.add_argument(
+        "--from-bundle",
+        metavar="PACKAGE",
+        help="Batch purge every client in this package's PDCC bundle.",
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Refresh the purgeable snapshot and bundles, then batch purge straight from the snapshot.",
     )
     parser.add_argument(
         "--package",
@@ -1316,6 +3635,101 @@ def parse_cli_args():
         action="store_true",
         help="Disable CLI confirmation prompts when duplicates are detected.",
     )
+    parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=None,
+        help="Attempts per client for transient batch failures (default: PURGER_BATCH_MAX_ATTEMPTS or 3).",
+    )
+    parser.add_argument(
+        "--stop-on-error",
+        action="store_true",
+        help="Halt a batch run on the first dead-lettered client instead of continuing.",
+    )
+    parser.add_argument(
+        "--schedule",
+        choices=("lpt", "manifest"),
+        default=None,
+        help="Batch order: 'lpt' runs the historically heaviest clients first, 'manifest' keeps "
+        "manifest/package order (default: lpt with --queue or --workers > 1, otherwise manifest).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of queue workers that will drain the batch (with --queue), used for scheduling and the ETA.",
+    )
+    parser.add_argument(
+        "--queue",
+        nargs="?",
+        const=str(DEFAULT_QUEUE_PATH),
+        help="Use a durable SQLite work queue (default: ARCHIVE_ROOT/_queue/batch_queue.sqlite3). "
+        "Batch selections are enqueued, then this process works the queue alongside any other workers.",
+    )
+    parser.add_argument(
+        "--fleet-limit",
+        type=int,
+        help="Cap the number of clients in flight across every worker on this queue "
+        "(stored in the queue; 0 removes the cap; default PURGER_FLEET_LIMIT).",
+    )
+    parser.add_argument(
+        "--enqueue-only",
+        action="store_true",
+        help="With --queue, add the batch selection to the queue without starting a worker.",
+    )
+    parser.add_argument(
+        "--queue-status",
+        action="store_true",
+        help="Print job counts for the work queue and exit.",
+    )
+    parser.add_argument(
+        "--package-format",
+        choices=("zip", "tar.zst", "auto"),
+        help="Package each finished archive into one verified container in the background "
+        "(auto = tar.zst when zstandard is installed, else zip).",
+    )
+    parser.add_argument(
+        "--document-store",
+        nargs="?",
+        const="reflink",
+        choices=purger_blobs.LINK_MODES,
+        help="Keep each distinct document once under ARCHIVE_ROOT/_blobs and clone (reflink, the default) "
+        "or hardlink it into client folders. Hardlinked documents share one inode across archives.",
+    )
+    parser.add_argument(
+        "--archive-format",
+        choices=purger_sqlite_archive.ARCHIVE_FORMATS,
+        help="Write each client as the folder tree, one <archive>.sqlite3 file, or both "
+        "(default folder or PURGER_ARCHIVE_FORMAT).",
+    )
+    parser.add_argument(
+        "--sqlite-documents",
+        action="store_true",
+        help="Store document and budget workbook bytes inside the SQLite archive as well.",
+    )
+    parser.add_argument(
+        "--verify-bytes",
+        action="store_true",
+        help="After each purge, walk the archive and compare its size with the bytes recorded while writing.",
+    )
+    parser.add_argument(
+        "--verify",
+        nargs="?",
+        const=str(ARCHIVE_ROOT),
+        metavar="PATH",
+        help="Re-hash one archive folder, or every archive under PATH (default ARCHIVE_ROOT), "
+        "against its _checksums.csv manifest and exit.",
+    )
+    parser.add_argument(
+        "--verify-workers",
+        type=int,
+        help="Processes (archive root) or threads (single archive) used by --verify.",
+    )
+    parser.add_argument(
+        "--rebuild-catalog",
+        action="store_true",
+        help="Re-scan ARCHIVE_ROOT once to rebuild the archive catalog and exit.",
+    )
     parser.add_argument(
         "--find-purgeable",
         action="store_true",
@@ -1337,6 +3751,28 @@ def parse_cli_args():
         dest="bundle_packages",
         help="Limit bundle exports to specific packages (repeat or comma-separate).",
     )
+    parser.add_argument(
+        "--rebuild-bundles",
+        action="store_true",
+        help="Rewrite every package bundle, not just packages whose clients changed.",
+    )
+    parser.add_argument(
+        "--stream-bundle",
+        action="store_true",
+        help="Build bundles by streaming the purgeable workbook row by row (constant memory).",
+    )
+    parser.add_argument(
+        "--bundle-workers",
+        type=int,
+        default=None,
+        help="Processes used to write package bundle files (default: PURGER_BUNDLE_WORKERS or up to 4).",
+    )
+    parser.add_argument(
+        "--discovery-source",
+        choices=("excel", "table"),
+        default=DISCOVERY_SOURCE,
+        help="Read the purgeable list via the Excel export (default) or by harvesting the rendered result table.",
+    )
     parser.add_argument(
         "--purgeable-url",
         help="Override the purgeable client list URL (defaults to BASE_URL + client-list.asp?purgeable=yes or PURGEABLE_CLIENTS_URL env).",
@@ -1345,7 +3781,23 @@ def parse_cli_args():
 
 
 def main():
+    global VERIFY_ARCHIVE_BYTES, PACKAGE_FORMAT, DOCUMENT_STORE_LINK
+    global ARCHIVE_FORMAT, SQLITE_ARCHIVE_DOCUMENTS
     args = parse_cli_args()
+    ARCHIVE_FORMAT = purger_sqlite_archive.resolve_format(args.archive_format or ARCHIVE_FORMAT)
+    SQLITE_ARCHIVE_DOCUMENTS = SQLITE_ARCHIVE_DOCUMENTS or args.sqlite_documents
+    DOCUMENT_STORE_LINK = args.document_store or DOCUMENT_STORE_LINK
+    VERIFY_ARCHIVE_BYTES = VERIFY_ARCHIVE_BYTES or args.verify_bytes
+    PACKAGE_FORMAT = args.package_format or PACKAGE_FORMAT
+    if PACKAGE_FORMAT:
+        purger_archive.resolve_format(PACKAGE_FORMAT)  # fail fast if zstandard is missing
+    try:
+        _run_cli(args)
+    finally:
+        wait_for_archive_packaging()
+
+
+def _run_cli(args):
     packages = parse_package_args(args.packages)
     bundle_packages = parse_package_args(args.bundle_packages)
     manifest_path = args.manifest
@@ -1354,7 +3806,10 @@ def main():
     if args.find_purgeable or args.bundle_download or args.update_bundle:
         if args.find_purgeable:
             find_purgeable_clients(
-                headless=args.headless, purgeable_url=purgeable_url
+                headless=args.headless,
+                purgeable_url=purgeable_url,
+                include_dataframe=False,
+                source=args.discovery_source,
             )
             if not (args.bundle_download or args.update_bundle):
                 return
@@ -1362,13 +3817,41 @@ def main():
             packages=bundle_packages or None,
             headless=args.headless,
             refresh=args.update_bundle,
-            overwrite=args.update_bundle,
+            overwrite=args.rebuild_bundles,
             purgeable_url=purgeable_url,
+            workers=args.bundle_workers,
+            streaming=args.stream_bundle,
+            source=args.discovery_source,
         )
         return
 
-    batch_mode = bool(packages or args.all_clients)
-    if batch_mode and not manifest_path:
+    if args.queue_status:
+        log_queue_status(args.queue)
+        return
+
+    if args.verify:
+        run_integrity_check(args.verify, workers=args.verify_workers)
+        return
+
+    if args.rebuild_catalog:
+        count = purger_catalog.rebuild_catalog(CATALOG_PATH, ARCHIVE_ROOT)
+        totals = purger_catalog.catalog_totals(CATALOG_PATH)
+        log_message(
+            f"Archive catalog rebuilt: {count} archive(s), {totals['files']} file(s), "
+            f"{totals['bytes']} bytes at {CATALOG_PATH}."
+        )
+        return
+
+    if args.workers != 1 and not args.queue:
+        # run_client_batch purges one client at a time; an N-worker ETA would be N times too short.
+        raise SystemExit("--workers only applies with --queue; a plain batch purges one client at a time.")
+
+    # Check the client selection before --pipeline spends a discovery run on it.
+    generated_manifest = args.pipeline or args.from_snapshot or bool(args.from_bundle)
+    batch_mode = bool(packages or args.all_clients or args.from_bundle)
+    if generated_manifest and not batch_mode:
+        raise SystemExit("Use --package filters or --all-clients to choose clients from the snapshot.")
+    if batch_mode and not generated_manifest and not manifest_path:
         detected = _detect_default_manifest_path()
         if detected:
             manifest_path = str(detected)
@@ -1377,23 +3860,57 @@ def main():
                 "Batch purging requires --manifest or a client_manifest.csv file next to importcsv.py."
             )
 
+    if args.pipeline:
+        bundle_package_download(
+            headless=args.headless,
+            refresh=True,
+            overwrite=args.rebuild_bundles,
+            purgeable_url=purgeable_url,
+            workers=args.bundle_workers,
+            streaming=True,
+            source=args.discovery_source,
+        )
+    if generated_manifest:
+        manifest_path = str(resolve_generated_manifest(args.from_bundle))
+        log_message(f"Building the batch queue from {manifest_path}.")
+
     if batch_mode:
         queue = build_batch_queue(
             manifest_path,
             packages=packages,
-            include_all=args.all_clients,
+            include_all=args.all_clients or bool(args.from_bundle),
+        )
+        if generated_manifest:
+            log_message(f"Resolved queue saved as manifest {write_queue_manifest(queue, manifest_path)}.")
+        strategy = args.schedule or ("lpt" if args.queue else "manifest")
+        queue, estimates, _ = plan_batch_schedule(
+            queue, workers=args.workers, strategy=strategy
         )
-        total = len(queue)
-        log_message(f"Batch purge armed for {total} client(s).")
-        results = run_client_batch(
-            queue,
+        if args.queue:
+            enqueue_batch(args.queue, queue, estimates=estimates if strategy == "lpt" else None)
+            if args.enqueue_only:
+                return
+        else:
+            log_message(f"Batch purge armed for {len(queue)} client(s).")
+            ensure_credentials()
+            run_client_batch(
+                queue,
+                headless=args.headless,
+                allow_duplicate=args.force_duplicate,
+                max_attempts=args.max_attempts,
+                continue_on_error=not args.stop_on_error,
+                estimates=estimates,
+            )
+            return
+
+    if args.queue:
+        ensure_credentials()
+        run_queue_worker(
+            args.queue,
             headless=args.headless,
             allow_duplicate=args.force_duplicate,
-        )
-        completed = sum(1 for r in results if r["status"] == "completed")
-        duplicates = sum(1 for r in results if r["status"] == "duplicate")
-        log_message(
-            f"Batch purge finished: {completed} completed, {duplicates} skipped as duplicates."
+            max_attempts=args.max_attempts,
+            fleet_limit=args.fleet_limit,
         )
         return
 
@@ -1410,4 +3927,5 @@ def main():
 
 
 if __name__ == "__main__":
+    freeze_support()
     main()
@@ -0,0 +1,252 @@
+"""
+Package a finished client archive folder into a single compressed container.
+
+Two formats are supported:
+  * zip      – always available; members are deflated and the zip central
+               directory already gives random access.
+  * tar.zst  – needs the optional `zstandard` package; compressed with
+               zstd's worker threads. Every member is its own zstd frame, so a
+               member can be extracted by seeking to its frame without
+               decompressing the rest (the concatenated frames still form one
+               ordinary .tar.zst stream).
+
+Each package gets a `<package>.index.json` member index (name, size, SHA-256
+and the offset needed for random access), hashes are taken while the source
+is read, and the finished package is re-read and checked against the index
+before it is moved into place.
+"""
+
+import hashlib
+import io
+import json
+import os
+import tarfile
+import time
+import zipfile
+from pathlib import Path
+
+PACKAGE_FORMATS = ("zip", "tar.zst")
+INDEX_VERSION = 1
+ZIP_LEVEL = 6
+ZSTD_LEVEL = 10
+CHUNK_SIZE = 1024 * 1024
+
+
+def _load_zstandard():
+    try:
+        import zstandard  # type: ignore
+    except ImportError:
+        return None
+    return zstandard
+
+
+def resolve_format(fmt=None):
+    """Map "auto"/None to tar.zst when zstandard is installed, otherwise zip."""
+    fmt = (fmt or "auto").lower()
+    if fmt == "auto":
+        return "tar.zst" if _load_zstandard() else "zip"
+    if fmt not in PACKAGE_FORMATS:
+        raise ValueError(f"Unknown package format {fmt!r}; choose from {', '.join(PACKAGE_FORMATS)}.")
+    if fmt == "tar.zst" and not _load_zstandard():
+        raise RuntimeError(
+            "tar.zst packaging requires the zstandard package. Install it with "
+            "`pip install zstandard` or use the zip format."
+        )
+    return fmt
+
+
+def _archive_members(folder):
+    members = []
+    for root, dirs, files in os.walk(folder):
+        dirs.sort()
+        for name in sorted(files):
+            path = Path(root) / name
+            members.append((path, path.relative_to(folder).as_posix()))
+    return members
+
+
+class _HashingReader:
+    """File wrapper that hashes and counts everything read through it."""
+
+    def __init__(self, fh):
+        self._fh = fh
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def read(self, size=-1):
+        data = self._fh.read(size)
+        self.digest.update(data)
+        self.size += len(data)
+        return data
+
+
+def _write_zip(folder, target, level):
+    index = []
+    with zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED, compresslevel=level) as zf:
+        for path, name in _archive_members(folder):
+            info = zipfile.ZipInfo.from_file(path, name)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            with open(path, "rb") as src, zf.open(info, "w") as dst:
+                reader = _HashingReader(src)
+                for chunk in iter(lambda: reader.read(CHUNK_SIZE), b""):
+                    dst.write(chunk)
+            index.append(
+                {"name": name, "size": reader.size, "sha256": reader.digest.hexdigest(),
+                 "offset": info.header_offset}
+            )
+    return index
+
+
+def _write_tar_zst(folder, target, level, threads):
+    zstandard = _load_zstandard()
+    compressor = zstandard.ZstdCompressor(level=level, threads=threads)
+    index = []
+    with open(target, "wb") as out:
+        for path, name in _archive_members(folder):
+            offset = out.tell()
+            info = tarfile.TarInfo(name)
+            stat = path.stat()
+            info.size = stat.st_size
+            info.mtime = int(stat.st_mtime)
+            info.mode = 0o644
+            with open(path, "rb") as src, compressor.stream_writer(out, closefd=False) as frame:
+                reader = _HashingReader(src)
+                frame.write(info.tobuf(format=tarfile.PAX_FORMAT))
+                for chunk in iter(lambda: reader.read(CHUNK_SIZE), b""):
+                    frame.write(chunk)
+                remainder = reader.size % tarfile.BLOCKSIZE
+                if remainder:
+                    frame.write(tarfile.NUL * (tarfile.BLOCKSIZE - remainder))
+            if reader.size != info.size:
+                raise OSError(f"{path} changed size while it was being packaged.")
+            index.append(
+                {"name": name, "size": reader.size, "sha256": reader.digest.hexdigest(),
+                 "offset": offset, "frame_bytes": out.tell() - offset}
+            )
+        with compressor.stream_writer(out, closefd=False) as frame:
+            frame.write(tarfile.NUL * (tarfile.BLOCKSIZE * 2))
+    return index
+
+
+def _hash_stream(fh):
+    digest = hashlib.sha256()
+    size = 0
+    for chunk in iter(lambda: fh.read(CHUNK_SIZE), b""):
+        digest.update(chunk)
+        size += len(chunk)
+    return size, digest.hexdigest()
+
+
+def _package_format(package_path):
+    return "zip" if Path(package_path).name.endswith(".zip") else "tar.zst"
+
+
+def verify_package(package_path, index=None, *, fmt=None):
+    """
+    Re-read a package and compare every member with its index entry.
+    Returns a list of problems (empty when the package is intact).
+    """
+    package_path = Path(package_path)
+    if index is None:
+        index = load_index(package_path)["members"]
+    expected = {entry["name"]: entry for entry in index}
+    seen = {}
+    if (fmt or _package_format(package_path)) == "zip":
+        with zipfile.ZipFile(package_path) as zf:
+            for info in zf.infolist():
+                with zf.open(info) as fh:
+                    seen[info.filename] = _hash_stream(fh)
+    else:
+        zstandard = _load_zstandard()
+        if zstandard is None:
+            return ["zstandard is not installed; cannot verify tar.zst packages."]
+        with open(package_path, "rb") as raw:
+            reader = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+            with tarfile.open(fileobj=reader, mode="r|") as tar:
+                for member in tar:
+                    if member.isfile():
+                        seen[member.name] = _hash_stream(tar.extractfile(member))
+    problems = []
+    for name, entry in expected.items():
+        if name not in seen:
+            problems.append(f"missing member {name}")
+        elif seen[name] != (entry["size"], entry["sha256"]):
+            problems.append(f"checksum mismatch for {name}")
+    problems.extend(f"unexpected member {name}" for name in seen if name not in expected)
+    return problems
+
+
+def index_path_for(package_path):
+    package_path = Path(package_path)
+    return package_path.with_name(package_path.name + ".index.json")
+
+
+def load_index(package_path):
+    return json.loads(index_path_for(package_path).read_text(encoding="utf-8"))
+
+
+def read_member(package_path, name):
+    """Return one member's bytes using the index offset (no full decompression)."""
+    package_path = Path(package_path)
+    entry = next(item for item in load_index(package_path)["members"] if item["name"] == name)
+    if _package_format(package_path) == "zip":
+        with zipfile.ZipFile(package_path) as zf:
+            return zf.read(name)
+    zstandard = _load_zstandard()
+    if zstandard is None:
+        raise RuntimeError("Reading tar.zst packages requires the zstandard package.")
+    with open(package_path, "rb") as raw:
+        raw.seek(entry["offset"])
+        frame = io.BytesIO(raw.read(entry["frame_bytes"]))
+    reader = zstandard.ZstdDecompressor().stream_reader(frame)
+    with tarfile.open(fileobj=reader, mode="r|") as tar:
+        return tar.extractfile(tar.next()).read()
+
+
+def package_archive(folder, *, fmt=None, dest_dir=None, level=None, threads=-1):
+    """
+    Stream `folder` into <dest_dir>/<folder name>.<zip|tar.zst> plus its index,
+    verify it, then move both into place. Returns a summary dict with the
+    package path, format, member count, source bytes and package bytes.
+    Raises RuntimeError if verification fails (the partial file is removed).
+    """
+    folder = Path(folder)
+    fmt = resolve_format(fmt)
+    dest_dir = Path(dest_dir) if dest_dir else folder.parent
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    target = dest_dir / f"{folder.name}.{fmt}"
+    partial = target.with_name(target.name + ".partial")
+    started = time.monotonic()
+    try:
+        if fmt == "zip":
+            members = _write_zip(folder, partial, ZIP_LEVEL if level is None else level)
+        else:
+            members = _write_tar_zst(folder, partial, ZSTD_LEVEL if level is None else level, threads)
+        problems = verify_package(partial, members, fmt=fmt)
+        if problems:
+            raise RuntimeError(f"Package verification failed for {target.name}: {'; '.join(problems[:5])}")
+        summary = {
+            "version": INDEX_VERSION,
+            "format": fmt,
+            "source": str(folder),
+            "members": members,
+            "source_bytes": sum(entry["size"] for entry in members),
+            "package_bytes": partial.stat().st_size,
+        }
+        index_path = index_path_for(target)
+        index_tmp = index_path.with_name(index_path.name + ".partial")
+        index_tmp.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+        os.replace(partial, target)
+        os.replace(index_tmp, index_path)
+    finally:
+        partial.unlink(missing_ok=True)
+    return {
+        "path": str(target),
+        "format": fmt,
+        "members": len(members),
+        "source_bytes": summary["source_bytes"],
+        "package_bytes": summary["package_bytes"],
+        "verified": True,
+        "seconds": round(time.monotonic() - started, 1),
+    }
+
@@ -0,0 +1,119 @@
+"""
+Content-addressed store for client documents.
+
+Policy PDFs, templates and forms are attached to many clients. With the store
+enabled, every downloaded document is hashed once while it is read and kept
+once as `<store>/<aa>/<sha256><suffix>`. The client's `Documents` entry is a
+reflink (copy-on-write clone) of that blob by default, or a plain copy where
+the filesystem cannot clone, so editing one client's document never touches
+another's. The store itself never replaces a blob, and leaves permissions
+alone so client folders can still be moved or deleted on Windows.
+
+hardlink mode saves the most space but is not immutable: every client's entry
+is the same inode as the blob, so an in-place edit or overwrite of one archive's
+document changes it in every archive that shares it, and the blob no longer
+matches its SHA-256 name. Nothing prevents that; only --verify (re-hashing the
+checksum manifests) detects it.
+"""
+
+import hashlib
+import os
+import shutil
+import sys
+from pathlib import Path
+
+BLOB_DIRNAME = "_blobs"
+LINK_MODES = ("hardlink", "reflink")
+CHUNK_SIZE = 1024 * 1024
+_FICLONE = 0x40049409  # Linux ioctl: clone a file's extents (btrfs, XFS, ...)
+
+
+def store_dir_for(archive_root):
+    return Path(archive_root) / BLOB_DIRNAME
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def blob_path(store_dir, digest, suffix=""):
+    return Path(store_dir) / digest[:2] / f"{digest}{suffix.lower()}"
+
+
+def _reflink(source, target):
+    """Clone source into target without copying data; raises OSError if unsupported."""
+    if sys.platform.startswith("linux"):
+        import fcntl
+
+        with open(source, "rb") as src, open(target, "wb") as dst:
+            try:
+                fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+            except OSError:
+                dst.close()
+                Path(target).unlink(missing_ok=True)
+                raise
+        return
+    if sys.platform == "darwin":
+        import ctypes
+
+        libc = ctypes.CDLL(None, use_errno=True)
+        if libc.clonefile(os.fsencode(source), os.fsencode(target), 0) != 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        return
+    raise OSError("reflinks are not supported on this platform")
+
+
+def _link(blob, target, mode):
+    """
+    Create target from blob with the requested mode, copying when it is not
+    supported. reflink never falls back to a hardlink: that would silently
+    share an inode between client archives.
+    """
+    try:
+        if mode == "reflink":
+            _reflink(blob, target)
+        else:
+            os.link(blob, target)
+        return mode
+    except OSError:
+        shutil.copy2(blob, target)
+        return "copy"
+
+
+def ingest_file(store_dir, source, target, *, link="reflink"):
+    """
+    Move a freshly downloaded file into the store and expose it at target.
+    When the blob already exists (same SHA-256), including when another worker
+    stores it concurrently, the download is discarded.
+    Returns {"sha256", "bytes", "deduplicated", "method"}.
+    """
+    if link not in LINK_MODES:
+        raise ValueError(f"Unknown link mode {link!r}; choose from {', '.join(LINK_MODES)}.")
+    source, target = Path(source), Path(target)
+    digest = _sha256(source)
+    size = source.stat().st_size
+    blob = blob_path(store_dir, digest, source.suffix)
+    deduplicated = blob.exists()
+    if not deduplicated:
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(source, blob)  # create-if-absent: never replaces a blob
+        except FileExistsError:
+            deduplicated = True
+        except OSError:
+            # No hardlinks here; move the file in unless a concurrent ingest got there first.
+            deduplicated = blob.exists()
+            if not deduplicated:
+                os.replace(source, blob)
+    source.unlink(missing_ok=True)
+    tmp_target = target.with_name(f".{target.name}.tmp")
+    tmp_target.unlink(missing_ok=True)
+    method = _link(blob, tmp_target, link)
+    os.replace(tmp_target, target)
+    return {"sha256": digest, "bytes": size, "deduplicated": deduplicated, "method": method}
+
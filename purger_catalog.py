@@ -0,0 +1,286 @@
+"""
+SQLite catalog of purged client archives.
+
+Every file the purger writes is recorded as it is written: universal ID ->
+archive folder, client, file list with sizes, and the budget workbook. Budget
+auto-detection, archive size accounting and the GUI totals read the catalog
+instead of walking archive trees on a slow network share. rebuild_catalog()
+seeds it from an existing ARCHIVE_ROOT with a single scandir pass.
+
+Like the job queue, the database may sit next to ARCHIVE_ROOT on a shared
+filesystem, so it keeps SQLite's default rollback journal.
+"""
+
+import os
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+CATALOG_DIRNAME = "_catalog"
+CATALOG_NAME = "catalog.sqlite3"
+BUSY_TIMEOUT_SECONDS = 60
+ARCHIVE_NAME_PATTERN = re.compile(r"^(\d+) (.*?)(?: \(([^()]*)\))?$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS archives (
+    universal_id TEXT PRIMARY KEY,
+    turnpoint_id TEXT NOT NULL DEFAULT '',
+    client_name TEXT NOT NULL DEFAULT '',
+    path TEXT NOT NULL,
+    file_count INTEGER NOT NULL DEFAULT 0,
+    total_bytes INTEGER NOT NULL DEFAULT 0,
+    budget_workbook TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    universal_id TEXT NOT NULL,
+    relpath TEXT NOT NULL,
+    bytes INTEGER NOT NULL,
+    kind TEXT NOT NULL DEFAULT 'file',
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (universal_id, relpath)
+);
+CREATE INDEX IF NOT EXISTS archives_updated ON archives (updated_at);
+"""
+
+ARCHIVE_COLUMNS = (
+    "universal_id",
+    "turnpoint_id",
+    "client_name",
+    "path",
+    "file_count",
+    "total_bytes",
+    "budget_workbook",
+    "updated_at",
+)
+
+
+def catalog_path(archive_root):
+    return Path(archive_root) / CATALOG_DIRNAME / CATALOG_NAME
+
+
+@contextmanager
+def _transaction(db_path):
+    path = Path(db_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), timeout=BUSY_TIMEOUT_SECONDS, isolation_level=None)
+    try:
+        conn.executescript(_SCHEMA)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
+
+
+def _row_to_archive(row):
+    return dict(zip(ARCHIVE_COLUMNS, row)) if row else None
+
+
+def _upsert_archive(conn, universal_id, path, turnpoint_id, client_name, now):
+    conn.execute(
+        "INSERT INTO archives (universal_id, turnpoint_id, client_name, path, updated_at) "
+        "VALUES (?, ?, ?, ?, ?) ON CONFLICT (universal_id) DO UPDATE SET "
+        "path = excluded.path, updated_at = excluded.updated_at, "
+        "turnpoint_id = CASE WHEN excluded.turnpoint_id != '' "
+        "THEN excluded.turnpoint_id ELSE archives.turnpoint_id END, "
+        "client_name = CASE WHEN excluded.client_name != '' "
+        "THEN excluded.client_name ELSE archives.client_name END",
+        (str(universal_id), turnpoint_id or "", client_name or "", str(path), now),
+    )
+
+
+def register_archive(db_path, universal_id, path, *, turnpoint_id=None, client_name=None):
+    """Create or update the archive row; also used when the folder is renamed."""
+    with _transaction(db_path) as conn:
+        _upsert_archive(conn, universal_id, path, turnpoint_id, client_name, time.time())
+
+
+def record_files(db_path, universal_id, files, *, kind="file", replace=False):
+    """
+    Record written files for an archive. `files` holds (path, size) pairs with
+    paths inside the archive folder; size None means stat the file. Totals are
+    adjusted by the difference, so rewriting a file does not double count it.
+    replace=True first drops the archive's existing rows of this kind (a
+    rebuilt budget export). Returns the number of bytes added to the archive total.
+    """
+    now = time.time()
+    added = 0
+    with _transaction(db_path) as conn:
+        row = conn.execute(
+            "SELECT path FROM archives WHERE universal_id = ?", (str(universal_id),)
+        ).fetchone()
+        if row is None:
+            raise KeyError(f"Archive {universal_id} is not registered in the catalog.")
+        root = Path(row[0])
+        if replace:
+            count, removed = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM files WHERE universal_id = ? AND kind = ?",
+                (str(universal_id), kind),
+            ).fetchone()
+            conn.execute(
+                "DELETE FROM files WHERE universal_id = ? AND kind = ?", (str(universal_id), kind)
+            )
+            conn.execute(
+                "UPDATE archives SET file_count = file_count - ?, total_bytes = total_bytes - ? "
+                "WHERE universal_id = ?",
+                (count, removed, str(universal_id)),
+            )
+            added -= removed
+        for path, size in files:
+            path = Path(path)
+            size = path.stat().st_size if size is None else int(size)
+            relpath = path.relative_to(root).as_posix()
+            previous = conn.execute(
+                "SELECT bytes FROM files WHERE universal_id = ? AND relpath = ?",
+                (str(universal_id), relpath),
+            ).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO files (universal_id, relpath, bytes, kind, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (str(universal_id), relpath, size, kind, now),
+            )
+            conn.execute(
+                "UPDATE archives SET file_count = file_count + ?, total_bytes = total_bytes + ?, "
+                "updated_at = ? WHERE universal_id = ?",
+                (0 if previous else 1, size - (previous[0] if previous else 0), now, str(universal_id)),
+            )
+            added += size - (previous[0] if previous else 0)
+            if kind == "budget_workbook":
+                conn.execute(
+                    "UPDATE archives SET budget_workbook = ? WHERE universal_id = ?",
+                    (relpath, str(universal_id)),
+                )
+    return added
+
+
+def get_archive(db_path, universal_id, *, with_files=False):
+    """Return the archive row (plus its file list when asked), or None."""
+    with _transaction(db_path) as conn:
+        archive = _row_to_archive(
+            conn.execute(
+                f"SELECT {', '.join(ARCHIVE_COLUMNS)} FROM archives WHERE universal_id = ?",
+                (str(universal_id),),
+            ).fetchone()
+        )
+        if archive and with_files:
+            archive["files"] = [
+                {"relpath": relpath, "bytes": size, "kind": kind}
+                for relpath, size, kind in conn.execute(
+                    "SELECT relpath, bytes, kind FROM files WHERE universal_id = ? ORDER BY relpath",
+                    (str(universal_id),),
+                )
+            ]
+    return archive
+
+
+def budget_workbook_path(db_path, universal_id=None):
+    """
+    Return the budget workbook recorded for universal_id, or for the most
+    recently updated archive that has one. None when nothing is catalogued.
+    """
+    query = "SELECT path, budget_workbook FROM archives WHERE budget_workbook IS NOT NULL"
+    params = ()
+    if universal_id is not None:
+        query += " AND universal_id = ?"
+        params = (str(universal_id),)
+    query += " ORDER BY updated_at DESC LIMIT 1"
+    with _transaction(db_path) as conn:
+        row = conn.execute(query, params).fetchone()
+    return Path(row[0]) / row[1] if row else None
+
+
+def catalog_totals(db_path):
+    """Return {"archives", "files", "bytes"} across the whole catalog."""
+    with _transaction(db_path) as conn:
+        archives, files, total = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(file_count), 0), COALESCE(SUM(total_bytes), 0) FROM archives"
+        ).fetchone()
+    return {"archives": archives, "files": files, "bytes": total}
+
+
+def parse_archive_name(name):
+    """Split '<universal id> <client name> (<turnpoint id>)' into its parts."""
+    match = ARCHIVE_NAME_PATTERN.match(name)
+    if not match:
+        return None
+    universal_id, client_name, turnpoint_id = match.groups()
+    if (turnpoint_id or "").startswith("superseded"):
+        return None  # a set-aside copy left at the top level by an older release
+    return universal_id, client_name, turnpoint_id or ""
+
+
+def iter_files(root):
+    """Yield (path, size) for every regular file below root using os.scandir."""
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield Path(entry.path), entry.stat(follow_symlinks=False).st_size
+
+
+def _file_kind(relpath, universal_id):
+    parts = Path(relpath).parts
+    if len(parts) == 1 and parts[0].lower().endswith((".xlsx", ".xls")):
+        return "budget_workbook"
+    if len(parts) == 1 and parts[0].lower().endswith(".csv"):
+        return "page_csv"
+    if len(parts) == 1 and parts[0].lower().endswith(".sqlite3"):
+        return "sqlite_archive"
+    if parts[0] == f"{universal_id} Documents":
+        return "document"
+    if parts[0] == "NDIS_Budget_Exports":
+        return "budget_export"
+    return "file"
+
+
+def rebuild_catalog(db_path, archive_root):
+    """
+    Replace the catalog with one scandir pass over archive_root. Folders whose
+    name does not start with a universal ID (e.g. _queue, _superseded) and
+    set-aside "(superseded …)" copies are skipped. Returns the number of
+    archives catalogued.
+    """
+    archive_root = Path(archive_root)
+    now = time.time()
+    count = 0
+    with _transaction(db_path) as conn:
+        conn.execute("DELETE FROM files")
+        conn.execute("DELETE FROM archives")
+        with os.scandir(archive_root) as entries:
+            folders = sorted(entry.path for entry in entries if entry.is_dir(follow_symlinks=False))
+        for folder in map(Path, folders):
+            parsed = parse_archive_name(folder.name)
+            if not parsed:
+                continue
+            universal_id, client_name, turnpoint_id = parsed
+            if not turnpoint_id and client_name.isdigit():
+                client_name, turnpoint_id = "", client_name  # unfinalised "<uid> <client id>"
+            _upsert_archive(conn, universal_id, folder, turnpoint_id, client_name, now)
+            records = []
+            for path, size in iter_files(folder):
+                relpath = path.relative_to(folder).as_posix()
+                records.append((universal_id, relpath, size, _file_kind(relpath, universal_id), now))
+            conn.executemany(
+                "INSERT OR REPLACE INTO files (universal_id, relpath, bytes, kind, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                records,
+            )
+            budget = sorted(relpath for _, relpath, _, kind, _ in records if kind == "budget_workbook")
+            conn.execute(
+                "UPDATE archives SET file_count = ?, total_bytes = ?, budget_workbook = ? "
+                "WHERE universal_id = ?",
+                (len(records), sum(record[2] for record in records), budget[-1] if budget else None,
+                 universal_id),
+            )
+            count += 1
+    return count
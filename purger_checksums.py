@@ -0,0 +1,130 @@
+"""
+Per-archive checksum manifests and a parallel integrity verifier.
+
+Each finalised archive carries `_checksums.csv` listing every file the purge
+wrote (relative path, size, SHA-256, kind and the TurnPoint page or document
+it came from). The hashes are taken by the purge while it writes, so writing
+the manifest costs no extra read. verify_archive() re-hashes one archive on a
+thread pool; verify_archives() spreads whole archives across processes.
+"""
+
+import csv
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+CHECKSUM_NAME = "_checksums.csv"
+CHECKSUM_COLUMNS = ("path", "bytes", "sha256", "kind", "source")
+CHUNK_SIZE = 1024 * 1024
+
+
+def write_checksum_manifest(folder, records):
+    """
+    Write folder/_checksums.csv from {relative path: {"bytes", "sha256", "kind", "source"}}.
+    Entries without a hash or outside the folder are skipped. Returns the manifest path.
+    """
+    folder = Path(folder)
+    path = folder / CHECKSUM_NAME
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(CHECKSUM_COLUMNS)
+        for relpath in sorted(records):
+            record = records[relpath]
+            if not record.get("sha256") or Path(relpath).is_absolute():
+                continue
+            writer.writerow(
+                [relpath, record["bytes"], record["sha256"], record.get("kind", ""), record.get("source", "")]
+            )
+    os.replace(tmp_path, path)
+    return path
+
+
+def replace_manifest_entries(folder, kind, records):
+    """
+    Swap every entry of one kind in an existing manifest for records (same
+    shape as write_checksum_manifest). Used when part of an archive is rebuilt
+    offline. Returns the manifest path, or None when the archive has none.
+    """
+    try:
+        entries = read_checksum_manifest(folder)
+    except FileNotFoundError:
+        return None
+    merged = {entry["path"]: entry for entry in entries if entry["kind"] != kind}
+    merged.update(records)
+    return write_checksum_manifest(folder, merged)
+
+
+def read_checksum_manifest(folder):
+    with open(Path(folder) / CHECKSUM_NAME, newline="", encoding="utf-8") as fh:
+        return list(csv.DictReader(fh))
+
+
+def _hash_file(path):
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+            size += len(chunk)
+    return size, digest.hexdigest()
+
+
+def _check_entry(folder, entry):
+    path = folder / entry["path"]
+    try:
+        size, digest = _hash_file(path)
+    except FileNotFoundError:
+        return (entry["path"], "missing")
+    except OSError as exc:
+        return (entry["path"], f"unreadable: {exc}")
+    if size != int(entry["bytes"]):
+        return (entry["path"], f"size {size} != {entry['bytes']}")
+    if digest != entry["sha256"]:
+        return (entry["path"], "sha256 mismatch")
+    return None
+
+
+def verify_archive(folder, *, workers=None):
+    """
+    Re-hash every file listed in one archive's manifest.
+    Returns {"archive", "files", "bytes", "problems": [(path, issue), ...]}.
+    """
+    folder = Path(folder)
+    result = {"archive": folder.name, "files": 0, "bytes": 0, "problems": []}
+    try:
+        entries = read_checksum_manifest(folder)
+    except FileNotFoundError:
+        result["problems"].append((CHECKSUM_NAME, "no checksum manifest"))
+        return result
+    with ThreadPoolExecutor(max_workers=max(1, workers or min(8, os.cpu_count() or 1))) as pool:
+        outcomes = list(pool.map(lambda entry: _check_entry(folder, entry), entries))
+    result["files"] = len(entries)
+    result["bytes"] = sum(int(entry["bytes"]) for entry in entries)
+    result["problems"] = [outcome for outcome in outcomes if outcome]
+    return result
+
+
+def _verify_serially(folder):
+    return verify_archive(folder, workers=1)
+
+
+def verify_archives(archive_root, *, workers=None):
+    """
+    Verify every archive under archive_root that has a checksum manifest, one
+    archive per process (falls back to serial when processes are unavailable).
+    """
+    folders = sorted(
+        p.parent for p in Path(archive_root).glob(f"*/{CHECKSUM_NAME}")
+        if not p.parent.name.startswith("_") and "(superseded " not in p.parent.name
+    )
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(folders) > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=min(workers, len(folders))) as pool:
+                return list(pool.map(_verify_serially, folders, chunksize=8))
+        except (BrokenProcessPool, OSError):
+            pass
+    return [_verify_serially(folder) for folder in folders]
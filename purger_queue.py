@@ -0,0 +1,282 @@
+"""
+Durable SQLite job queue shared by several purger processes.
+
+Jobs are leased to a worker for a limited time and kept alive with heartbeats;
+leases that expire (crashed process, closed laptop) are reclaimed by the next
+worker that asks for work. The database can live on a filesystem shared by
+several machines (e.g. next to ARCHIVE_ROOT). SQLite relies on the share's
+byte-range locking, so keep the default rollback journal; WAL mode does not
+work over network filesystems.
+"""
+
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+DEFAULT_LEASE_SECONDS = 900
+BUSY_TIMEOUT_SECONDS = 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    client_id TEXT PRIMARY KEY,
+    client_name TEXT NOT NULL DEFAULT '',
+    package TEXT NOT NULL DEFAULT '',
+    position INTEGER NOT NULL,
+    priority REAL NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    universal_id INTEGER,
+    failure_kind TEXT,
+    error TEXT,
+    output_path TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, priority DESC, position);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+JOB_COLUMNS = (
+    "client_id",
+    "client_name",
+    "package",
+    "position",
+    "priority",
+    "status",
+    "attempts",
+    "available_at",
+    "lease_owner",
+    "lease_expires",
+    "universal_id",
+    "failure_kind",
+    "error",
+    "output_path",
+)
+
+
+@contextmanager
+def _transaction(db_path):
+    """Open the queue and hold the write lock for the duration of the block."""
+    path = Path(db_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), timeout=BUSY_TIMEOUT_SECONDS, isolation_level=None)
+    try:
+        conn.executescript(_SCHEMA)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
+
+
+def _row_to_job(row):
+    return dict(zip(JOB_COLUMNS, row)) if row else None
+
+
+def _reclaim(conn, now, max_attempts):
+    expired = conn.execute(
+        "SELECT client_id, attempts FROM jobs WHERE status = 'leased' AND lease_expires < ?",
+        (now,),
+    ).fetchall()
+    for client_id, attempts in expired:
+        if max_attempts and attempts >= max_attempts:
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', failure_kind = 'lease', "
+                "error = 'lease expired without completion', lease_owner = NULL, "
+                "lease_expires = NULL, updated_at = ? WHERE client_id = ?",
+                (now, client_id),
+            )
+        else:
+            conn.execute(
+                "UPDATE jobs SET status = 'pending', lease_owner = NULL, lease_expires = NULL, "
+                "available_at = ?, updated_at = ? WHERE client_id = ?",
+                (now, now, client_id),
+            )
+    return len(expired)
+
+
+def _allocate_universal_id(conn, floor):
+    row = conn.execute("SELECT value FROM meta WHERE key = 'next_universal_id'").fetchone()
+    current = max(int(row[0]) if row else 0, int(floor or 0))
+    conn.execute(
+        "INSERT OR REPLACE INTO meta (key, value) VALUES ('next_universal_id', ?)",
+        (str(current + 1),),
+    )
+    return current
+
+
+def enqueue_jobs(db_path, entries, *, priorities=None):
+    """
+    Add manifest entries to the queue, preserving their order.
+    Clients already present (pending, leased or finished) are left untouched.
+    Returns the number of newly queued jobs.
+    """
+    now = time.time()
+    added = 0
+    with _transaction(db_path) as conn:
+        row = conn.execute("SELECT COALESCE(MAX(position), -1) FROM jobs").fetchone()
+        position = int(row[0]) + 1
+        for entry in entries:
+            client_id = str(entry["client_id"])
+            priority = float((priorities or {}).get(client_id, 0.0))
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO jobs (client_id, client_name, package, position, "
+                "priority, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    client_id,
+                    entry.get("client_name") or "",
+                    entry.get("package") or "",
+                    position,
+                    priority,
+                    now,
+                ),
+            )
+            if cursor.rowcount:
+                added += 1
+                position += 1
+    return added
+
+
+def claim_job(
+    db_path,
+    worker_id,
+    *,
+    lease_seconds=DEFAULT_LEASE_SECONDS,
+    universal_floor=0,
+    max_attempts=None,
+):
+    """
+    Lease the next ready job to worker_id, reclaiming expired leases first.
+    A universal ID is allocated from the shared counter on the first claim and
+    kept across retries so every machine uses a distinct archive prefix.
+    Returns the job dict, or None when nothing is ready right now.
+    """
+    now = time.time()
+    with _transaction(db_path) as conn:
+        _reclaim(conn, now, max_attempts)
+        row = conn.execute(
+            f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs "
+            "WHERE status = 'pending' AND available_at <= ? "
+            "ORDER BY priority DESC, position LIMIT 1",
+            (now,),
+        ).fetchone()
+        job = _row_to_job(row)
+        if job is None:
+            return None
+        if job["universal_id"] is None:
+            job["universal_id"] = _allocate_universal_id(conn, universal_floor)
+        job["attempts"] += 1
+        job["status"] = "leased"
+        job["lease_owner"] = worker_id
+        job["lease_expires"] = now + lease_seconds
+        conn.execute(
+            "UPDATE jobs SET status = 'leased', attempts = ?, lease_owner = ?, "
+            "lease_expires = ?, universal_id = ?, updated_at = ? WHERE client_id = ?",
+            (
+                job["attempts"],
+                worker_id,
+                job["lease_expires"],
+                job["universal_id"],
+                now,
+                job["client_id"],
+            ),
+        )
+        return job
+
+
+def heartbeat(db_path, client_id, worker_id, *, lease_seconds=DEFAULT_LEASE_SECONDS):
+    """Extend a lease. Returns False when the lease was lost to another worker."""
+    now = time.time()
+    with _transaction(db_path) as conn:
+        cursor = conn.execute(
+            "UPDATE jobs SET lease_expires = ?, updated_at = ? "
+            "WHERE client_id = ? AND lease_owner = ? AND status = 'leased'",
+            (now + lease_seconds, now, str(client_id), worker_id),
+        )
+        return cursor.rowcount == 1
+
+
+def complete_job(db_path, client_id, worker_id, *, status="done", output_path=None):
+    """Mark a leased job finished ('done' or 'duplicate')."""
+    now = time.time()
+    with _transaction(db_path) as conn:
+        cursor = conn.execute(
+            "UPDATE jobs SET status = ?, output_path = ?, lease_owner = NULL, "
+            "lease_expires = NULL, failure_kind = NULL, error = NULL, updated_at = ? "
+            "WHERE client_id = ? AND lease_owner = ?",
+            (status, str(output_path) if output_path else None, now, str(client_id), worker_id),
+        )
+        return cursor.rowcount == 1
+
+
+def fail_job(db_path, client_id, worker_id, *, kind, error, retry_delay=None):
+    """
+    Record a failed attempt. With retry_delay the job goes back to pending and
+    becomes claimable after the delay; otherwise it is dead-lettered ('failed').
+    """
+    now = time.time()
+    if retry_delay is None:
+        status, available_at = "failed", now
+    else:
+        status, available_at = "pending", now + retry_delay
+    with _transaction(db_path) as conn:
+        cursor = conn.execute(
+            "UPDATE jobs SET status = ?, available_at = ?, failure_kind = ?, error = ?, "
+            "lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+            "WHERE client_id = ? AND lease_owner = ?",
+            (status, available_at, kind, error, now, str(client_id), worker_id),
+        )
+        return cursor.rowcount == 1
+
+
+def reclaim_expired_leases(db_path, *, max_attempts=None):
+    """Return expired leases to the pending pool. Returns the number reclaimed."""
+    with _transaction(db_path) as conn:
+        return _reclaim(conn, time.time(), max_attempts)
+
+
+def queue_counts(db_path):
+    """Return {status: count} plus the next time a backing-off job becomes ready."""
+    with _transaction(db_path) as conn:
+        counts = dict(conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        row = conn.execute(
+            "SELECT MIN(available_at) FROM jobs WHERE status = 'pending'"
+        ).fetchone()
+    counts["next_available_at"] = row[0]
+    return counts
+
+
+def get_meta(db_path, key, default=None):
+    """Read a shared setting (e.g. the fleet-wide concurrency limit)."""
+    with _transaction(db_path) as conn:
+        row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else default
+
+
+def set_meta(db_path, key, value):
+    with _transaction(db_path) as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value))
+        )
+
+
+def list_jobs(db_path, status=None):
+    """Return queued jobs in claim order, optionally filtered by status."""
+    query = f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs"
+    params = ()
+    if status:
+        query += " WHERE status = ?"
+        params = (status,)
+    query += " ORDER BY priority DESC, position"
+    with _transaction(db_path) as conn:
+        return [_row_to_job(row) for row in conn.execute(query, params).fetchall()]
@@ -0,0 +1,187 @@
+"""
+Content-addressed store for purgeable client snapshots.
+
+Every downloaded workbook is hashed and kept once as `<sha256>.xlsx`; repeat
+downloads of identical content only bump the index entry. The "latest" workbook
+is a hardlink (or symlink) to the stored blob, swapped in atomically, and a
+retention policy prunes old snapshots. index.json lists every snapshot with its
+size, row count and when it was first/last downloaded; bundle_baseline.json
+names the snapshot the package bundles were last fully built from.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+INDEX_NAME = "index.json"
+INDEX_VERSION = 1
+BUNDLE_BASELINE_NAME = "bundle_baseline.json"
+LEGACY_PATTERN = re.compile(r"purgeable_clients_(\d{8}_\d{6})\.xlsx$")
+
+
+def _sha256(path: Path, chunk_size=1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _now_iso():
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def load_index(store_dir: Path):
+    """Return the snapshot entries ordered oldest -> newest by last download."""
+    path = Path(store_dir) / INDEX_NAME
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return []
+    if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+        return []
+    snapshots = [entry for entry in data.get("snapshots", []) if isinstance(entry, dict)]
+    return sorted(snapshots, key=lambda entry: entry.get("last_seen", ""))
+
+
+def _write_index(store_dir: Path, snapshots):
+    path = Path(store_dir) / INDEX_NAME
+    tmp_path = path.with_suffix(".tmp")
+    payload = {
+        "version": INDEX_VERSION,
+        "snapshots": sorted(snapshots, key=lambda entry: entry.get("last_seen", "")),
+    }
+    tmp_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def bundle_baseline(store_dir: Path):
+    """SHA-256 of the snapshot the package bundles were last fully built from, or None."""
+    path = Path(store_dir) / BUNDLE_BASELINE_NAME
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return data.get("sha256") if isinstance(data, dict) else None
+
+
+def set_bundle_baseline(store_dir: Path, sha256: str):
+    """Record that every package bundle now reflects the snapshot with this SHA-256."""
+    path = Path(store_dir) / BUNDLE_BASELINE_NAME
+    tmp_path = path.with_suffix(".tmp")
+    payload = {"sha256": sha256, "built_at": _now_iso()}
+    tmp_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def latest_entry(store_dir: Path):
+    snapshots = load_index(store_dir)
+    return snapshots[-1] if snapshots else None
+
+
+def store_snapshot(store_dir: Path, downloaded: Path, *, row_counter=None, seen_at=None):
+    """
+    Move a downloaded workbook into the store. Identical content is stored once:
+    the duplicate download is deleted and the existing entry's last_seen/downloads
+    are updated. Returns (entry, is_new).
+    """
+    store_dir = Path(store_dir)
+    store_dir.mkdir(parents=True, exist_ok=True)
+    seen_at = seen_at or _now_iso()
+    digest = _sha256(downloaded)
+    blob = store_dir / f"{digest}.xlsx"
+    snapshots = load_index(store_dir)
+    entry = next((item for item in snapshots if item.get("sha256") == digest), None)
+    is_new = entry is None or not blob.exists()
+    if is_new:
+        os.replace(downloaded, blob)
+        if entry is None:
+            entry = {
+                "sha256": digest,
+                "file": blob.name,
+                "bytes": blob.stat().st_size,
+                "rows": row_counter(blob) if row_counter else None,
+                "first_seen": seen_at,
+                "downloads": 0,
+            }
+            snapshots.append(entry)
+    else:
+        Path(downloaded).unlink()
+    entry["last_seen"] = max(seen_at, entry.get("last_seen", ""))
+    entry["downloads"] = int(entry.get("downloads", 0)) + 1
+    _write_index(store_dir, snapshots)
+    return entry, is_new
+
+
+def ingest_legacy_snapshots(store_dir: Path, legacy_dir: Path, *, row_counter=None):
+    """Move old timestamped purgeable_clients_*.xlsx downloads into the store."""
+    moved = 0
+    for path in sorted(Path(legacy_dir).glob("purgeable_clients_*.xlsx")):
+        match = LEGACY_PATTERN.match(path.name)
+        seen_at = None
+        if match:
+            stamp = datetime.strptime(match.group(1), "%Y%m%d_%H%M%S")
+            seen_at = stamp.astimezone(timezone.utc).isoformat(timespec="seconds")
+        store_snapshot(store_dir, path, row_counter=row_counter, seen_at=seen_at)
+        moved += 1
+    return moved
+
+
+def point_latest(blob: Path, latest_path: Path):
+    """
+    Atomically make latest_path refer to blob: hardlink, else symlink, else copy,
+    always created under a temporary name and swapped in with os.replace.
+    Returns the method used.
+    """
+    latest_path = Path(latest_path)
+    tmp_path = latest_path.with_name(f".{latest_path.name}.tmp")
+    tmp_path.unlink(missing_ok=True)
+    try:
+        os.link(blob, tmp_path)
+        method = "hardlink"
+    except OSError:
+        try:
+            tmp_path.symlink_to(Path(blob).resolve())
+            method = "symlink"
+        except OSError:
+            shutil.copy2(blob, tmp_path)
+            method = "copy"
+    os.replace(tmp_path, latest_path)
+    return method
+
+
+def apply_retention(store_dir: Path, *, keep=None, max_age_days=None, protect=()):
+    """
+    Drop snapshots beyond the newest `keep` and/or older than max_age_days
+    (by last download). Snapshots whose SHA-256 is in `protect`, the latest one
+    and the bundle baseline are never removed. Returns the removed entries.
+    """
+    snapshots = load_index(store_dir)
+    protected = set(protect)
+    baseline = bundle_baseline(store_dir)
+    if baseline:
+        protected.add(baseline)
+    doomed = set()
+    if keep and keep > 0:
+        doomed.update(entry["sha256"] for entry in snapshots[:-keep])
+    if max_age_days and max_age_days > 0:
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=max_age_days)).isoformat()
+        doomed.update(
+            entry["sha256"] for entry in snapshots if entry.get("last_seen", "") < cutoff
+        )
+    if snapshots:
+        protected.add(snapshots[-1]["sha256"])
+    removed = [
+        entry for entry in snapshots if entry["sha256"] in doomed and entry["sha256"] not in protected
+    ]
+    if not removed:
+        return []
+    for entry in removed:
+        (Path(store_dir) / entry["file"]).unlink(missing_ok=True)
+    removed_ids = {entry["sha256"] for entry in removed}
+    _write_index(store_dir, [entry for entry in snapshots if entry["sha256"] not in removed_ids])
+    return removed
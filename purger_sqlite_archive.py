@@ -0,0 +1,296 @@
+"""
+Single-file SQLite container for one client archive.
+
+A purge normally leaves ten page CSVs, a budget workbook, the
+NDIS_Budget_Exports tree and a Documents folder per client. This module puts
+the same content into one `<archive name>.sqlite3` file, kept in the archive
+folder, instead of (or as well as) that tree:
+
+  * pages / records  – every page's rows from write_csv, in header order
+  * budget_lines     – the parsed budget entries in the Budget_Long.csv layout
+  * files            – documents and the budget workbook (size, SHA-256,
+                       source); the bytes themselves are stored only when
+                       asked, so the document blobs are optional
+  * archive          – key/value metadata (IDs, client name, timings)
+
+Rows are inserted in batched transactions so a large Notes page or budget
+does not hold one long write lock, and file contents are streamed into
+BLOBs. The file is built in the staging area and moved into the archive
+folder once complete. Like the catalog and queue, it keeps SQLite's default
+rollback journal because ARCHIVE_ROOT may be a network share.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from contextlib import closing, contextmanager
+from pathlib import Path, PurePosixPath
+
+ARCHIVE_FORMATS = ("folder", "sqlite", "both")
+SQLITE_SUFFIX = ".sqlite3"
+SCHEMA_VERSION = 1
+BATCH_ROWS = 5000
+BUSY_TIMEOUT_SECONDS = 60
+CHUNK_SIZE = 1024 * 1024
+PAGE_SIZE = 16384
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS archive (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS pages (
+    page TEXT PRIMARY KEY,
+    headers TEXT NOT NULL,
+    row_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS records (
+    page TEXT NOT NULL,
+    row_index INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (page, row_index)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS budget_lines (
+    universal_id TEXT,
+    entry_index INTEGER,
+    entry TEXT,
+    line INTEGER,
+    day TEXT,
+    field TEXT,
+    value TEXT
+);
+CREATE INDEX IF NOT EXISTS budget_lines_entry ON budget_lines (entry_index, line);
+CREATE TABLE IF NOT EXISTS files (
+    relpath TEXT PRIMARY KEY,
+    bytes INTEGER NOT NULL,
+    sha256 TEXT,
+    kind TEXT NOT NULL DEFAULT 'file',
+    source TEXT NOT NULL DEFAULT '',
+    data BLOB
+);
+"""
+
+
+def resolve_format(fmt=None):
+    fmt = (fmt or "folder").lower()
+    if fmt not in ARCHIVE_FORMATS:
+        raise ValueError(f"Unknown archive format {fmt!r}; choose from {', '.join(ARCHIVE_FORMATS)}.")
+    return fmt
+
+
+def archive_path_for(folder):
+    """The container kept inside an archive folder: '<folder>/<folder name>.sqlite3'."""
+    folder = Path(folder)
+    return folder / (folder.name + SQLITE_SUFFIX)
+
+
+@contextmanager
+def _connect(db_path):
+    path = Path(db_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with closing(
+        sqlite3.connect(str(path), timeout=BUSY_TIMEOUT_SECONDS, isolation_level=None)
+    ) as conn:
+        conn.execute(f"PRAGMA page_size = {PAGE_SIZE}")  # only takes effect on a new file
+        conn.executescript(_SCHEMA)
+        yield conn
+
+
+@contextmanager
+def _transaction(conn):
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def _insert_batched(conn, sql, rows, batch_rows):
+    """executemany in transactions of batch_rows rows. Returns the row count."""
+    batch = []
+    count = 0
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_rows:
+            with _transaction(conn):
+                conn.executemany(sql, batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        with _transaction(conn):
+            conn.executemany(sql, batch)
+        count += len(batch)
+    return count
+
+
+def create_archive(db_path, **metadata):
+    """Start a fresh container (an existing partial file is discarded)."""
+    Path(db_path).unlink(missing_ok=True)
+    set_metadata(db_path, schema_version=SCHEMA_VERSION, **metadata)
+
+
+def set_metadata(db_path, **values):
+    with _connect(db_path) as conn, _transaction(conn):
+        conn.executemany(
+            "INSERT OR REPLACE INTO archive (key, value) VALUES (?, ?)",
+            [(key, None if value is None else str(value)) for key, value in values.items()],
+        )
+
+
+def get_metadata(db_path):
+    with _connect(db_path) as conn:
+        return dict(conn.execute("SELECT key, value FROM archive"))
+
+
+def write_page(db_path, page, headers, records, *, batch_rows=BATCH_ROWS):
+    """
+    Replace one page's rows. Each row is stored as a JSON array in header
+    order (the same cells write_csv puts in the page CSV). Returns the row count.
+    """
+    headers = list(headers)
+    with _connect(db_path) as conn:
+        with _transaction(conn):
+            conn.execute("DELETE FROM records WHERE page = ?", (page,))
+            conn.execute(
+                "INSERT OR REPLACE INTO pages (page, headers, row_count) VALUES (?, ?, 0)",
+                (page, json.dumps(headers, ensure_ascii=False)),
+            )
+        rows = (
+            (page, index, json.dumps([record.get(h, "") for h in headers], ensure_ascii=False))
+            for index, record in enumerate(records)
+        )
+        count = _insert_batched(
+            conn, "INSERT INTO records (page, row_index, data) VALUES (?, ?, ?)", rows, batch_rows
+        )
+        with _transaction(conn):
+            conn.execute("UPDATE pages SET row_count = ? WHERE page = ?", (count, page))
+    return count
+
+
+def read_page(db_path, page):
+    """Return a page's rows as dicts, or None when the page was not written."""
+    with _connect(db_path) as conn:
+        row = conn.execute("SELECT headers FROM pages WHERE page = ?", (page,)).fetchone()
+        if row is None:
+            return None
+        headers = json.loads(row[0])
+        return [
+            dict(zip(headers, json.loads(data)))
+            for (data,) in conn.execute(
+                "SELECT data FROM records WHERE page = ? ORDER BY row_index", (page,)
+            )
+        ]
+
+
+def write_budget_lines(db_path, rows, *, batch_rows=BATCH_ROWS):
+    """
+    Replace the budget entries with rows in the Budget_Long.csv column order
+    (universal_id, entry_index, entry, line, day, field, value).
+    """
+    with _connect(db_path) as conn:
+        with _transaction(conn):
+            conn.execute("DELETE FROM budget_lines")
+        return _insert_batched(
+            conn, "INSERT INTO budget_lines VALUES (?, ?, ?, ?, ?, ?, ?)", rows, batch_rows
+        )
+
+
+def _unique_relpath(conn, relpath):
+    path = PurePosixPath(relpath)
+    candidate = relpath
+    counter = 1
+    while conn.execute("SELECT 1 FROM files WHERE relpath = ?", (candidate,)).fetchone():
+        candidate = str(path.with_name(f"{path.stem}_{counter}{path.suffix}"))
+        counter += 1
+    return candidate
+
+
+def store_file(db_path, relpath, path=None, *, kind="file", source="", size=None, sha256=None,
+               unique=False):
+    """
+    Record a file under relpath. With path, its bytes are streamed into the
+    container and hashed on the way; without, only the given size and hash are
+    recorded. unique=True picks '<stem>_<n>' instead of replacing an entry.
+    Returns {"relpath", "bytes", "sha256"}.
+    """
+    with _connect(db_path) as conn, _transaction(conn):
+        if unique:
+            relpath = _unique_relpath(conn, relpath)
+        if path is None:
+            conn.execute(
+                "INSERT OR REPLACE INTO files (relpath, bytes, sha256, kind, source, data) "
+                "VALUES (?, ?, ?, ?, ?, NULL)",
+                (relpath, int(size), sha256, kind, source),
+            )
+            return {"relpath": relpath, "bytes": int(size), "sha256": sha256}
+        size = os.stat(path).st_size
+        digest = hashlib.sha256()
+        cursor = conn.execute(
+            "INSERT OR REPLACE INTO files (relpath, bytes, sha256, kind, source, data) "
+            "VALUES (?, ?, NULL, ?, ?, zeroblob(?))",
+            (relpath, size, kind, source, size),
+        )
+        written = 0
+        with open(path, "rb") as src, conn.blobopen("files", "data", cursor.lastrowid) as blob:
+            for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                if written + len(chunk) > size:
+                    raise OSError(f"{path} grew while it was being stored.")
+                blob.write(chunk)
+                digest.update(chunk)
+                written += len(chunk)
+        if written != size:
+            raise OSError(f"{path} shrank while it was being stored.")
+        conn.execute(
+            "UPDATE files SET sha256 = ? WHERE rowid = ?", (digest.hexdigest(), cursor.lastrowid)
+        )
+    return {"relpath": relpath, "bytes": size, "sha256": digest.hexdigest()}
+
+
+def set_file_hash(db_path, relpath, sha256):
+    """Fill in the SHA-256 of a file recorded before it was hashed."""
+    with _connect(db_path) as conn, _transaction(conn):
+        conn.execute("UPDATE files SET sha256 = ? WHERE relpath = ?", (sha256, relpath))
+
+
+def read_file(db_path, relpath):
+    """Return a stored file's bytes (None when only its metadata was kept)."""
+    with _connect(db_path) as conn:
+        row = conn.execute("SELECT data FROM files WHERE relpath = ?", (relpath,)).fetchone()
+    if row is None:
+        raise KeyError(relpath)
+    return row[0]
+
+
+def archive_summary(db_path):
+    """Return {"pages", "records", "budget_lines", "files", "stored_bytes"}."""
+    with _connect(db_path) as conn:
+        pages, records = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(row_count), 0) FROM pages"
+        ).fetchone()
+        (budget_lines,) = conn.execute("SELECT COUNT(*) FROM budget_lines").fetchone()
+        files, stored = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(length(data)), 0) FROM files"
+        ).fetchone()
+    return {
+        "pages": pages,
+        "records": records,
+        "budget_lines": budget_lines,
+        "files": files,
+        "stored_bytes": stored,
+    }
+
+
+def finalize_archive(partial_path, target):
+    """Check the container and move it into place. Returns the target path."""
+    with _connect(partial_path) as conn:
+        (result,) = conn.execute("PRAGMA quick_check").fetchone()
+        if result != "ok":
+            raise sqlite3.DatabaseError(f"{partial_path} failed quick_check: {result}")
+        conn.execute("PRAGMA optimize")
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(partial_path, target)
+    return target
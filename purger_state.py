@@ -1,13 +1,68 @@
 import json
+import os
+import tempfile
 import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
 
 DEFAULT_START_ID = 100001
 STATE_DIR = Path.home() / ".turnpoint_purger"
 STATE_FILE = STATE_DIR / "purger_state.json"
+LOCK_TIMEOUT_SECONDS = 60
 HISTORY_LIMIT = 200
+COST_SMOOTHING = 0.5
+COST_FIELDS = ("duration_seconds", "bytes", "documents", "notes")
 
-_state_lock = threading.Lock()
+_thread_lock = threading.Lock()
+
+
+def _lock_file(fh):
+    if os.name == "nt":
+        import msvcrt
+
+        fh.seek(0)
+        msvcrt.locking(fh.fileno(), msvcrt.LK_NBLCK, 1)
+    else:
+        import fcntl
+
+        fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+
+def _unlock_file(fh):
+    if os.name == "nt":
+        import msvcrt
+
+        fh.seek(0)
+        msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+
+        fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+
+@contextmanager
+def _state_lock():
+    """
+    Serialise read-modify-write of the state file across threads and across
+    purger processes (queue workers share ~/.turnpoint_purger).
+    """
+    with _thread_lock:
+        STATE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(STATE_FILE.with_name(STATE_FILE.name + ".lock"), "a+b") as fh:
+            deadline = time.monotonic() + LOCK_TIMEOUT_SECONDS
+            while True:
+                try:
+                    _lock_file(fh)
+                    break
+                except OSError:
+                    if time.monotonic() >= deadline:
+                        raise TimeoutError(f"Timed out waiting for the lock on {STATE_FILE}.")
+                    time.sleep(0.05)
+            try:
+                yield
+            finally:
+                _unlock_file(fh)
 
 
 def _default_state():
@@ -16,6 +71,8 @@ def _default_state():
         "purged_count": 0,
         "clients": {},
         "history": [],
+        "costs": {},
+        "selectors": {},
     }
 
 
@@ -33,6 +90,8 @@ def _coerce_state(raw):
         base["purged_count"] = 0
     base["clients"] = raw.get("clients", {})
     base["history"] = raw.get("history", [])
+    base["costs"] = raw.get("costs", {}) if isinstance(raw.get("costs"), dict) else {}
+    base["selectors"] = raw.get("selectors", {}) if isinstance(raw.get("selectors"), dict) else {}
     return base
 
 
@@ -49,21 +108,25 @@ def _read_state():
 
 def _write_state(state):
     STATE_DIR.mkdir(parents=True, exist_ok=True)
-    tmp_path = STATE_FILE.with_suffix(".tmp")
-    with tmp_path.open("w", encoding="utf-8") as fh:
-        json.dump(state, fh, indent=2)
-    tmp_path.replace(STATE_FILE)
+    fd, tmp_name = tempfile.mkstemp(prefix=STATE_FILE.name + ".", suffix=".tmp", dir=STATE_DIR)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(state, fh, indent=2)
+        os.replace(tmp_name, STATE_FILE)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
 
 
 def get_purge_statistics():
     """Return a snapshot of purge counters (thread-safe)."""
-    with _state_lock:
+    with _state_lock():
         return _read_state().copy()
 
 
 def reserve_universal_sequence():
     """Return the current universal ID slot and cumulative purge count."""
-    with _state_lock:
+    with _state_lock():
         state = _read_state()
         return state["next_universal_id"], state["purged_count"]
 
@@ -71,18 +134,68 @@ def reserve_universal_sequence():
 def get_client_last_purge(client_id):
     """Return metadata for the last purge of the provided TurnPoint client ID."""
     client_id = str(client_id)
-    with _state_lock:
+    with _state_lock():
         state = _read_state()
         return state.get("clients", {}).get(client_id)
 
 
 def get_recent_history(limit=10):
     """Return the most recent purge events (success + failure)."""
-    with _state_lock:
+    with _state_lock():
         history = _read_state().get("history", [])
     return history[-limit:]
 
 
+def get_cost_model():
+    """Return the per-client cost model (smoothed duration/bytes/documents/notes)."""
+    with _state_lock():
+        return dict(_read_state().get("costs", {}))
+
+
+def get_learned_selector(site, control):
+    """Return the locator [by, value] that last worked for a page control on site."""
+    with _state_lock():
+        locator = _read_state()["selectors"].get(site, {}).get(control)
+    return tuple(locator) if isinstance(locator, list) and len(locator) == 2 else None
+
+
+def remember_selector(site, control, locator):
+    """Store the locator that worked for control so it is tried first next time."""
+    locator = [str(part) for part in locator]
+    with _state_lock():
+        state = _read_state()
+        controls = state["selectors"].setdefault(site, {})
+        if controls.get(control) == locator:
+            return
+        controls[control] = locator
+        _write_state(state)
+
+
+def forget_selector(site, control):
+    with _state_lock():
+        state = _read_state()
+        if state["selectors"].get(site, {}).pop(control, None) is not None:
+            _write_state(state)
+
+
+def _update_cost_model(state, turnpoint_id, metrics):
+    costs = state.setdefault("costs", {})
+    previous = costs.get(turnpoint_id) or {}
+    runs = int(previous.get("runs", 0))
+    updated = {"runs": runs + 1, "package": metrics.get("package") or previous.get("package", "")}
+    for field in COST_FIELDS:
+        value = metrics.get(field)
+        if value is None:
+            if field in previous:
+                updated[field] = previous[field]
+            continue
+        value = float(value)
+        if runs and field in previous:
+            value = COST_SMOOTHING * value + (1 - COST_SMOOTHING) * float(previous[field])
+        updated[field] = round(value, 2)
+    costs[turnpoint_id] = updated
+
+
 def record_purge_event(
     *,
     universal_id,
@@ -92,9 +205,12 @@ def record_purge_event(
     bytes_written,
     timestamp_iso,
     operator=None,
+    metrics=None,
 ):
     """
     Persist the outcome of a purge attempt and update counters as needed.
+    metrics (duration_seconds, documents, notes, package) feed the per-client
+    cost model used to schedule batches longest-first.
     Returns the updated state snapshot.
     """
     used_value = int(universal_id)
@@ -108,8 +224,10 @@ def record_purge_event(
         "timestamp": timestamp_iso,
         "operator": operator or "",
     }
+    if metrics:
+        entry["metrics"] = dict(metrics)
 
-    with _state_lock:
+    with _state_lock():
         state = _read_state()
         history = state.setdefault("history", [])
         history.append(entry)
@@ -126,6 +244,7 @@ def record_purge_event(
                 "operator": operator or "",
             }
             state["purged_count"] = int(state.get("purged_count", 0)) + 1
+            _update_cost_model(state, turnpoint_id, dict(metrics or {}, bytes=int(bytes_written)))
 
         state["next_universal_id"] = max(state.get("next_universal_id", DEFAULT_START_ID), used_value + 1)
 
@@ -133,8 +252,29 @@ def record_purge_event(
         return state.copy()
 
 
+def record_archive_package(turnpoint_id, universal_id, package):
+    """
+    Attach packaging results (path, format, package_bytes, ...) to the client's
+    last purge record and its history entry under "archive_package" ("package"
+    is the client's NDIS package). Returns False when no record exists.
+    """
+    turnpoint_id = str(turnpoint_id)
+    with _state_lock():
+        state = _read_state()
+        client = state.get("clients", {}).get(turnpoint_id)
+        if not client or client.get("universal_id") != int(universal_id):
+            return False
+        client["archive_package"] = dict(package)
+        for entry in reversed(state.get("history", [])):
+            if entry.get("universal_id") == int(universal_id) and entry.get("success"):
+                entry["archive_package"] = dict(package)
+                break
+        _write_state(state)
+        return True
+
+
 def reset_state():
     """Delete the persisted purge state file (used by reset command)."""
-    with _state_lock:
+    with _state_lock():
         if STATE_FILE.exists():
             STATE_FILE.unlink()
@@ -0,0 +1,176 @@
+"""
+Shared request throttle for TurnPoint page loads and downloads.
+
+A token bucket caps the request rate across every thread in the process, and an
+AIMD controller (additive increase, multiplicative decrease) tunes both the rate
+and the number of concurrent requests from observed latency and error/timeout
+rates. Worker processes sharing a queue split the global rate between them via
+set_share().
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a token is available."""
+
+    def __init__(self, rate, capacity=None):
+        self._lock = threading.Lock()
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def set_rate(self, rate):
+        with self._lock:
+            self._refill()
+            self.rate = max(0.01, float(rate))
+            self.capacity = max(1.0, self.rate)
+            self._tokens = min(self._tokens, self.capacity)
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens=1.0):
+        """Take tokens, sleeping as needed. Returns the seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class AdaptiveThrottle:
+    """
+    Token bucket plus concurrency limit, tuned with AIMD.
+    Every `window` observations the controller either backs off (any error, or a
+    mean latency above target_latency) by halving rate and concurrency, or probes
+    upwards by adding rate_step req/s and one concurrent slot.
+    """
+
+    def __init__(
+        self,
+        *,
+        rate=2.0,
+        min_rate=0.2,
+        max_rate=10.0,
+        rate_step=0.25,
+        concurrency=2,
+        max_concurrency=8,
+        target_latency=3.0,
+        window=20,
+        on_change=None,
+    ):
+        self.min_rate = float(min_rate)
+        self.max_rate = float(max_rate)
+        self.rate_step = float(rate_step)
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.target_latency = float(target_latency)
+        self.window = max(1, int(window))
+        self.on_change = on_change
+        self.rate = min(self.max_rate, max(self.min_rate, float(rate)))
+        self.concurrency = min(self.max_concurrency, max(1, int(concurrency)))
+        self.share = 1
+        self._bucket = TokenBucket(self.rate)
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._latencies = []
+        self._errors = 0
+        self._totals = {"requests": 0, "errors": 0, "waited_seconds": 0.0}
+
+    # ---------------- admission ---------------- #
+    @contextmanager
+    def slot(self):
+        """Hold one concurrency slot and one rate token for the enclosed request."""
+        with self._cond:
+            while self._in_flight >= self.concurrency:
+                self._cond.wait()
+            self._in_flight += 1
+        try:
+            waited = self._bucket.acquire()
+            with self._cond:
+                self._totals["waited_seconds"] += waited
+            yield
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                self._cond.notify_all()
+
+    def set_share(self, workers):
+        """Split the global rate across `workers` processes draining the same queue."""
+        workers = max(1, int(workers or 1))
+        if workers == self.share:
+            return
+        with self._cond:
+            self.share = workers
+            self._bucket.set_rate(self.rate / self.share)
+        self._notify("share", f"split across {workers} worker(s)")
+
+    # ---------------- feedback ---------------- #
+    def observe(self, latency=None, *, error=False):
+        """Record one request outcome; latency may be None for size-bound downloads."""
+        with self._cond:
+            self._totals["requests"] += 1
+            if error:
+                self._errors += 1
+                self._totals["errors"] += 1
+            elif latency is not None:
+                self._latencies.append(float(latency))
+            if self._errors == 0 and len(self._latencies) < self.window:
+                return
+            overloaded = self._errors > 0 or (
+                self._latencies
+                and sum(self._latencies) / len(self._latencies) > self.target_latency
+            )
+            reason = (
+                f"{self._errors} error(s)" if self._errors else
+                f"mean latency {sum(self._latencies) / len(self._latencies):.2f}s"
+            )
+            self._latencies = []
+            self._errors = 0
+            if overloaded:
+                new_rate = max(self.min_rate, self.rate / 2)
+                new_concurrency = max(1, self.concurrency // 2)
+            else:
+                new_rate = min(self.max_rate, self.rate + self.rate_step)
+                new_concurrency = min(self.max_concurrency, self.concurrency + 1)
+            changed = (new_rate, new_concurrency) != (self.rate, self.concurrency)
+            self.rate, self.concurrency = new_rate, new_concurrency
+            self._bucket.set_rate(self.rate / self.share)
+            self._cond.notify_all()
+        if changed:
+            self._notify("decrease" if overloaded else "increase", reason)
+
+    def _notify(self, direction, reason):
+        if self.on_change:
+            try:
+                self.on_change(direction, reason, self.status())
+            except Exception:
+                pass
+
+    def status(self):
+        return {
+            "rate": round(self.rate, 2),
+            "process_rate": round(self.rate / self.share, 2),
+            "concurrency": self.concurrency,
+            "in_flight": self._in_flight,
+            "share": self.share,
+            **{key: round(value, 1) if isinstance(value, float) else value
+               for key, value in self._totals.items()},
+        }
+
+    def describe(self):
+        status = self.status()
+        text = f"{status['process_rate']:.2f} req/s, concurrency {status['concurrency']}"
+        if status["share"] > 1:
+            text += f" (1/{status['share']} of {status['rate']:.2f} req/s)"
+        return text
@@ -0,0 +1,62 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import purger_catalog
+
+
+def test_catalog_tracks_writes_renames_and_rebuilds(tmp_path):
+    db = purger_catalog.catalog_path(tmp_path)
+    working = tmp_path / "100003 4411"
+    (working / "100003 Documents").mkdir(parents=True)
+    purger_catalog.register_archive(db, "100003", working, turnpoint_id="4411")
+
+    notes = working / "100003 Notes.csv"
+    notes.write_text("a,b\n1,2\n")
+    budget = working / "100003 budget.xlsx"
+    budget.write_bytes(b"x" * 50)
+    document = working / "100003 Documents" / "100003 Plan.pdf"
+    document.write_bytes(b"y" * 200)
+    purger_catalog.record_files(db, "100003", [(notes, None)], kind="page_csv")
+    purger_catalog.record_files(db, "100003", [(budget, None)], kind="budget_workbook")
+    purger_catalog.record_files(db, "100003", [(document, None)], kind="document")
+    notes.write_text("a,b\n")
+    purger_catalog.record_files(db, "100003", [(notes, None)], kind="page_csv")
+
+    final = tmp_path / "100003 Jane Citizen (4411)"
+    working.rename(final)
+    purger_catalog.register_archive(db, "100003", final, client_name="Jane Citizen")
+
+    archive = purger_catalog.get_archive(db, "100003", with_files=True)
+    assert archive["client_name"] == "Jane Citizen"
+    assert archive["turnpoint_id"] == "4411"
+    assert (archive["file_count"], archive["total_bytes"]) == (3, 4 + 50 + 200)
+    assert purger_catalog.budget_workbook_path(db) == final / "100003 budget.xlsx"
+
+    (tmp_path / "_queue").mkdir()
+    assert purger_catalog.rebuild_catalog(db, tmp_path) == 1
+    rebuilt = purger_catalog.get_archive(db, "100003", with_files=True)
+    assert rebuilt["files"] == archive["files"]
+    assert purger_catalog.catalog_totals(db) == {"archives": 1, "files": 3, "bytes": 254}
+
+
+def test_run_byte_accumulator_matches_verification_walk(tmp_path, monkeypatch):
+    import importcsv
+
+    monkeypatch.setattr(importcsv, "UNIVERSAL_CLIENT_ID", None)
+    monkeypatch.setattr(importcsv, "RUN_WRITTEN", {})
+    monkeypatch.setattr(importcsv, "log_message", lambda message: None)
+    page = tmp_path / "100004 Notes.csv"
+    page.write_text("header\n" * 10)
+    importcsv.record_written_files([(page, None)], kind="page_csv")
+    page.write_text("header\n")
+    importcsv.record_written_files([(page, None)], kind="page_csv")
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "plan.pdf").write_bytes(b"z" * 300)
+    importcsv.record_written_files([(tmp_path / "docs" / "plan.pdf", 300)], kind="document")
+
+    assert importcsv.run_bytes_written() == 7 + 300
+    assert importcsv.verify_archive_bytes(tmp_path, importcsv.run_bytes_written()) == 307
@@ -0,0 +1,59 @@
+import csv
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import purger_checksums
+
+
+def test_manifest_from_write_time_hashes_verifies_and_flags_damage(tmp_path, monkeypatch):
+    import importcsv
+
+    archive = tmp_path / "100005 Jane Citizen (4412)"
+    (archive / "100005 Documents").mkdir(parents=True)
+    monkeypatch.setattr(importcsv, "OUTPUT_DIR", archive)
+    monkeypatch.setattr(importcsv, "FILE_PREFIX", "100005 ")
+    monkeypatch.setattr(importcsv, "UNIVERSAL_CLIENT_ID", None)
+    monkeypatch.setattr(importcsv, "RUN_WRITTEN", {})
+    monkeypatch.setattr(importcsv, "log_message", lambda message: None)
+    monkeypatch.setattr(importcsv, "DOCUMENTS_DIR", archive / "100005 Documents")
+    monkeypatch.setattr(importcsv, "DOCUMENT_STORE_LINK", "")
+    monkeypatch.setattr(importcsv, "SQLITE_ARCHIVE_PATH", None)
+    monkeypatch.setattr(importcsv, "ARCHIVE_FORMAT", "folder")
+    monkeypatch.setattr(importcsv, "PENDING_POST_PROCESSING", [])
+    monkeypatch.setattr(importcsv, "RUN_METRICS", {})
+
+    importcsv.write_csv("Notes", [{"Note": "héllo, world"}, {"Note": "second"}])
+    download = tmp_path / "plan.pdf"
+    download.write_bytes(b"p" * 120)
+    document = archive / "100005 Documents" / "100005 Plan.pdf"
+    importcsv.archive_document(download, document, "document cid=9")
+    # The document is hashed on the post-processing pool, not during the move.
+    assert importcsv.RUN_WRITTEN["100005 Documents/100005 Plan.pdf"]["sha256"] is None
+    assert importcsv.drain_post_processing() == (1, 0)
+    manifest = importcsv.write_run_checksums()
+
+    with open(manifest, newline="", encoding="utf-8") as fh:
+        rows = {row["path"]: row for row in csv.DictReader(fh)}
+    notes = archive / "100005 Notes.csv"
+    assert rows["100005 Notes.csv"]["sha256"] == importcsv.file_sha256(notes)
+    assert int(rows["100005 Notes.csv"]["bytes"]) == notes.stat().st_size
+    assert rows["100005 Documents/100005 Plan.pdf"]["source"] == "document cid=9"
+    assert importcsv.verify_archive_bytes(archive, importcsv.run_bytes_written()) == (
+        notes.stat().st_size + 120 + manifest.stat().st_size
+    )
+
+    clean = purger_checksums.verify_archive(archive, workers=2)
+    assert (clean["files"], clean["problems"]) == (2, [])
+
+    document.write_bytes(b"q" * 120)
+    notes.unlink()
+    results = purger_checksums.verify_archives(tmp_path, workers=1)
+    assert [result["archive"] for result in results] == [archive.name]
+    assert sorted(results[0]["problems"]) == [
+        ("100005 Documents/100005 Plan.pdf", "sha256 mismatch"),
+        ("100005 Notes.csv", "missing"),
+    ]
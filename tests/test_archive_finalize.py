@@ -0,0 +1,69 @@
+import errno
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import importcsv
+
+
+def test_finalize_copies_across_devices_and_keeps_existing_target(tmp_path, monkeypatch):
+    working = tmp_path / "100005 4412"
+    (working / "100005 Documents").mkdir(parents=True)
+    (working / "100005 Notes.csv").write_text("note\n")
+    (working / "100005 Documents" / "plan.pdf").write_bytes(b"p" * 4096)
+    final = tmp_path / "100005 Sam Citizen (4412)"
+    final.mkdir()
+    (final / "stale.csv").write_text("from an earlier attempt\n")
+
+    for name, value in {
+        "ARCHIVE_ROOT": tmp_path,
+        "OUTPUT_DIR": working,
+        "FINAL_OUTPUT_DIR": final,
+        "UNIVERSAL_CLIENT_ID": "100005",
+        "CATALOG_PATH": tmp_path / "_catalog" / "catalog.sqlite3",
+        "DUPLICATE_REPORTS_DIR": tmp_path / "_duplicate_reports",
+        "log_message": lambda message: None,
+    }.items():
+        monkeypatch.setattr(importcsv, name, value)
+    real_rename = Path.rename
+
+    def cross_device_rename(self, target):
+        if self == working:
+            raise OSError(errno.EXDEV, "Invalid cross-device link")
+        return real_rename(self, target)
+
+    monkeypatch.setattr(Path, "rename", cross_device_rename)
+    importcsv.finalize_output_directory()
+
+    assert not working.exists()
+    assert importcsv.OUTPUT_DIR == final
+    assert (final / "100005 Notes.csv").read_text() == "note\n"
+    assert (final / "100005 Documents" / "plan.pdf").stat().st_size == 4096
+    superseded = list((tmp_path / "_superseded").iterdir())
+    assert len(superseded) == 1
+    assert (superseded[0] / "stale.csv").exists()
+
+
+def test_rebuild_after_set_aside_catalogues_only_the_live_archive(tmp_path, monkeypatch):
+    import purger_catalog
+
+    monkeypatch.setattr(importcsv, "ARCHIVE_ROOT", tmp_path)
+    monkeypatch.setattr(importcsv, "log_message", lambda message: None)
+    live = tmp_path / "100007 Ann Citizen (4414)"
+    live.mkdir()
+    (live / "100007 Notes.csv").write_text("old\n")
+    importcsv.set_aside_existing_archive(live)
+    live.mkdir()
+    (live / "100007 Notes.csv").write_text("new notes\n")
+    legacy = tmp_path / "100007 Ann Citizen (4414) (superseded 20250101_000000)"
+    legacy.mkdir()
+    (legacy / "100007 Stale.csv").write_text("legacy\n")
+
+    db = purger_catalog.catalog_path(tmp_path)
+    assert purger_catalog.rebuild_catalog(db, tmp_path) == 1
+    archive = purger_catalog.get_archive(db, "100007", with_files=True)
+    assert Path(archive["path"]) == live
+    assert archive["files"] == [{"relpath": "100007 Notes.csv", "bytes": 10, "kind": "page_csv"}]
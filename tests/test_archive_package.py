@@ -0,0 +1,55 @@
+import sys
+import zipfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import importcsv
+import purger_archive
+import purger_state
+
+
+def test_zip_package_is_indexed_verified_and_recorded(tmp_path, monkeypatch):
+    monkeypatch.setattr(purger_state, "STATE_DIR", tmp_path / "state")
+    monkeypatch.setattr(purger_state, "STATE_FILE", tmp_path / "state" / "state.json")
+    folder = tmp_path / "100006 Alex Citizen (4413)"
+    (folder / "100006 Documents").mkdir(parents=True)
+    (folder / "100006 Notes.csv").write_text("note\n" * 200)
+    (folder / "100006 Documents" / "plan.pdf").write_bytes(bytes(range(256)) * 40)
+
+    result = purger_archive.package_archive(folder, fmt="zip", dest_dir=tmp_path / "_packages")
+    package = Path(result["path"])
+    assert package.name == "100006 Alex Citizen (4413).zip"
+    assert (result["members"], result["source_bytes"]) == (2, 1000 + 10240)
+    assert result["package_bytes"] < result["source_bytes"]
+    assert purger_archive.verify_package(package) == []
+    assert purger_archive.read_member(package, "100006 Documents/plan.pdf") == bytes(range(256)) * 40
+
+    with zipfile.ZipFile(package, "a") as zf:
+        zf.writestr("extra.txt", "sneaked in")
+    assert purger_archive.verify_package(package) == ["unexpected member extra.txt"]
+
+    purger_state.record_purge_event(
+        universal_id=100006, turnpoint_id="4413", client_name="Alex Citizen", success=True,
+        bytes_written=11240, timestamp_iso="2026-01-01T00:00:00+00:00",
+    )
+    assert purger_state.record_archive_package("4413", "100006", result)
+    client = purger_state.get_client_last_purge("4413")
+    assert client["archive_package"]["package_bytes"] == result["package_bytes"]
+
+
+def test_finished_packaging_jobs_are_pruned_before_the_next_one(monkeypatch):
+    from concurrent.futures import Future
+
+    logged = []
+    monkeypatch.setattr(importcsv, "log_message", logged.append)
+    ok, broken, running = Future(), Future(), Future()
+    ok.set_result({})
+    broken.set_exception(OSError("share offline"))
+    monkeypatch.setattr(importcsv, "PACKAGE_JOBS", [("a", ok), ("b", broken), ("c", running)])
+
+    assert importcsv.prune_archive_packaging() == (1, 1)
+    assert importcsv.PACKAGE_JOBS == [("c", running)]
+    assert logged == ["Packaging b failed: share offline"]
@@ -0,0 +1,66 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import importcsv
+import purger_state
+
+
+def test_plan_batch_schedule_orders_longest_first_with_package_fallback():
+    cost_model = {
+        "1": {"duration_seconds": 60, "package": "SIL"},
+        "2": {"duration_seconds": 900, "package": "HCP L1"},
+        "3": {"duration_seconds": 300, "package": "SIL"},
+    }
+    entries = [
+        {"client_id": "1", "package": "SIL"},
+        {"client_id": "4", "package": "sil"},
+        {"client_id": "2", "package": "HCP L1"},
+        {"client_id": "5", "package": "Unknown"},
+    ]
+    ordered, estimates, eta = importcsv.plan_batch_schedule(
+        entries, workers=2, strategy="lpt", cost_model=cost_model
+    )
+    assert estimates["4"] == 180  # mean of the SIL clients
+    assert estimates["5"] == 300  # median of all recorded clients
+    assert [entry["client_id"] for entry in ordered] == ["2", "5", "4", "1"]
+    assert eta == 900
+
+
+def test_estimate_batch_makespan_balances_workers():
+    assert importcsv.estimate_batch_makespan([5, 4, 3, 3, 3], workers=2) == 10
+    assert importcsv.estimate_batch_makespan([5, 4, 3], workers=1) == 12
+
+
+def test_record_purge_event_updates_smoothed_cost_model(tmp_path, monkeypatch):
+    monkeypatch.setattr(purger_state, "STATE_DIR", tmp_path)
+    monkeypatch.setattr(purger_state, "STATE_FILE", tmp_path / "state.json")
+    for duration in (100, 200):
+        purger_state.record_purge_event(
+            universal_id=100001,
+            turnpoint_id="42",
+            client_name="Echo",
+            success=True,
+            bytes_written=1000,
+            timestamp_iso="2025-01-01T00:00:00+00:00",
+            metrics={"duration_seconds": duration, "documents": 3, "notes": 40, "package": "SIL"},
+        )
+    cost = purger_state.get_cost_model()["42"]
+    assert cost["runs"] == 2
+    assert cost["duration_seconds"] == 150
+    assert cost["package"] == "SIL" and cost["bytes"] == 1000
+
+
+def test_pipeline_without_a_client_selection_fails_before_discovery(monkeypatch):
+    def unexpected(**kwargs):
+        raise AssertionError("bundle_package_download ran before the selection was checked")
+
+    monkeypatch.setattr(importcsv, "bundle_package_download", unexpected)
+    monkeypatch.setattr(sys, "argv", ["importcsv.py", "--pipeline"])
+    with pytest.raises(SystemExit, match="--all-clients"):
+        importcsv._run_cli(importcsv.parse_cli_args())
@@ -0,0 +1,90 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import importcsv
+from selenium.common.exceptions import TimeoutException
+
+
+def test_run_client_batch_requeues_transient_failures_and_dead_letters(tmp_path, monkeypatch):
+    monkeypatch.setattr(importcsv, "BATCH_REPORTS_DIR", tmp_path / "reports")
+    monkeypatch.setattr(importcsv, "BATCH_BACKOFF_SECONDS", 0)
+    monkeypatch.setattr(importcsv, "MANIFEST_CACHE_DIR", tmp_path / "cache")
+    calls = []
+
+    def fake_purge(client_id, **_kwargs):
+        calls.append(client_id)
+        if client_id == "1" and calls.count("1") == 1:
+            raise TimeoutException("Timed out waiting for page")
+        if client_id == "2":
+            raise ValueError("unexpected table layout")
+        return tmp_path / client_id
+
+    monkeypatch.setattr(importcsv, "run_turnpoint_purge", fake_purge)
+    queue = [{"client_id": cid, "client_name": "", "package": "SIL"} for cid in ("1", "2", "3")]
+
+    results = importcsv.run_client_batch(queue, max_attempts=3)
+
+    assert calls == ["1", "2", "3", "1"]
+    by_id = {r["client_id"]: r for r in results}
+    assert by_id["1"]["status"] == "completed" and by_id["1"]["attempts"] == 2
+    assert by_id["2"]["status"] == "failed" and by_id["2"]["failure_kind"] == "parse"
+    assert by_id["3"]["status"] == "completed"
+    reports = list((tmp_path / "reports").glob("dead_letter_*.csv"))
+    assert len(reports) == 1
+    assert importcsv.load_client_manifest(reports[0])[0]["client_id"] == "2"
+
+
+def test_classify_purge_failure_categories():
+    classify = importcsv.classify_purge_failure
+    assert classify(importcsv.PurgeStepError("login", "bad password")) == "login"
+    assert classify(TimeoutException("Timed out waiting for download to finish.")) == "download"
+    assert classify(TimeoutException("page stalled")) == "timeout"
+    assert classify(KeyError("Package")) == "parse"
+    assert classify(RuntimeError("boom")) == "other"
+
+
+def test_page_timeout_fails_the_purge_so_the_batch_retries_it(tmp_path, monkeypatch):
+    monkeypatch.setattr(importcsv, "BATCH_REPORTS_DIR", tmp_path / "reports")
+    monkeypatch.setattr(importcsv, "BATCH_BACKOFF_SECONDS", 0)
+    monkeypatch.setattr(importcsv, "DOWNLOAD_DIR", None)
+    monkeypatch.setattr(importcsv, "PENDING_POST_PROCESSING", [])
+    monkeypatch.setattr(importcsv, "log_message", lambda message: None)
+    for name in ("guard_against_duplicate", "assign_universal_sequence", "configure_client_context",
+                 "cleanup_old_csvs", "login", "finalize_output_directory", "finalize_sqlite_archive",
+                 "write_run_checksums", "write_csv"):
+        monkeypatch.setattr(importcsv, name, lambda *args, **kwargs: None)
+    for name in ("extract_client_details", "extract_package_schedules", "extract_notes",
+                 "extract_info_sheet", "extract_agreement", "extract_contacts", "extract_support_plan",
+                 "extract_emergency_plan", "extract_ndis_budget"):
+        monkeypatch.setattr(importcsv, name, lambda driver: [])
+    monkeypatch.setattr(importcsv, "reserve_universal_sequence", lambda: (100001, 0))
+    monkeypatch.setattr(importcsv, "build_chrome_driver", lambda **kwargs: type("D", (), {"quit": lambda self: None})())
+    recorded = []
+    monkeypatch.setattr(importcsv, "record_purge_event", lambda **kwargs: recorded.append(kwargs))
+
+    def stalled_documents(driver):
+        raise TimeoutException("Timed out waiting for download to finish.")
+
+    monkeypatch.setattr(importcsv, "extract_documents", stalled_documents)
+    results = importcsv.run_client_batch(
+        [{"client_id": "7", "client_name": "", "package": "SIL"}], max_attempts=2
+    )
+
+    assert recorded == []
+    assert results[0]["status"] == "failed" and results[0]["attempts"] == 2
+    assert results[0]["failure_kind"] == "download"
+    assert results[0]["page_failures"] == [
+        {"page": "Documents", "kind": "download", "error": "Message: Timed out waiting for download to finish.\n"}
+    ]
+
+
+def test_page_failure_error_prefers_a_transient_kind():
+    error = importcsv.page_failure_error(
+        [{"page": "Contacts", "kind": "parse", "error": "x"}, {"page": "Notes", "kind": "timeout", "error": "y"}]
+    )
+    assert error.kind == "timeout"
+    assert str(error) == "2 page(s) failed: Contacts (parse), Notes (timeout)"
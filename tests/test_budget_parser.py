@@ -0,0 +1,157 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import NDISBUDGETER
+import purger_catalog
+import purger_checksums
+from benchmarks.budget_parser_benchmark import compare_outputs, legacy_process_budget_excel
+
+EDGE_CASE_ROWS = [
+    ["Mon", "stray row before any entry", ""],
+    ["Agreement entry: Core / Daily Living", "", ""],
+    ["Tue", "before header", ""],
+    ["Day", "Date", "Hours"],
+    [" Mon ", "2024-01-01", " 2 "],
+    ["Monthly Total January", "", "2"],
+    ["Wed", "2024-01-03", "1.5"],
+    ["Day", "Date (again)", "Hours"],
+    ["Thu", "2024-01-04", None],
+    ["AGREEMENT ENTRY - no colon", "", ""],
+    ["Day", "Date", "Hours"],
+    ["Fri", "2024-01-05", "4"],
+    ["Agreement entry:", "", ""],
+    ["Day", "Date", "Hours"],
+    ["Sat", "2024-01-06", "3"],
+    ["Agreement entry: Empty", "", ""],
+    ["Agreement entry: Core / Daily Living", "", ""],
+    ["Day", "Date", "Hours"],
+    ["Sun", "2024-01-07", "5"],
+]
+
+
+def test_vectorised_parser_matches_legacy_output(tmp_path):
+    workbook = tmp_path / "budget.xlsx"
+    pd.DataFrame(EDGE_CASE_ROWS).to_excel(workbook, index=False, header=False)
+
+    legacy = legacy_process_budget_excel(workbook, tmp_path / "legacy")
+    current = NDISBUDGETER.process_budget_excel(workbook, export_folder=tmp_path / "current", quiet=True)
+
+    assert current["entries_exported"] == legacy["entries_exported"] == 3
+    assert compare_outputs(tmp_path / "legacy", tmp_path / "current") == 3
+
+
+def test_streaming_ingestion_writes_the_same_bytes(tmp_path):
+    workbook = tmp_path / "budget.xlsx"
+    rows = EDGE_CASE_ROWS + [["Agreement entry: Wide", "", ""], ["Day", "Date"], ["Mon", "NA", 1.0, None, 2.5], [], []]
+    pd.DataFrame(rows).to_excel(workbook, index=False, header=False)
+
+    frame = NDISBUDGETER.process_budget_excel(workbook, export_folder=tmp_path / "frame", quiet=True)
+    streamed = NDISBUDGETER.process_budget_excel(
+        workbook, export_folder=tmp_path / "streamed", quiet=True, streaming=True
+    )
+
+    assert streamed["entries_exported"] == frame["entries_exported"] == 4
+    assert compare_outputs(tmp_path / "frame", tmp_path / "streamed") == 4
+    assert not list((tmp_path / "streamed").rglob("*.partial"))
+
+
+def test_reprocess_archive_skips_unchanged_workbooks(tmp_path, monkeypatch):
+    for client in ("100001 Alpha (1)", "100002 Bravo (2)"):
+        folder = tmp_path / client
+        (folder / "100001 Documents").mkdir(parents=True)
+        pd.DataFrame(EDGE_CASE_ROWS).to_excel(folder / "budget.xlsx", index=False, header=False)
+        pd.DataFrame([["not a budget"]]).to_excel(folder / "100001 Documents" / "attachment.xlsx")
+
+    first = NDISBUDGETER.reprocess_archive(tmp_path, workers=2)
+    assert [item["status"] for item in first] == ["processed", "processed"]
+    assert [item["entries"] for item in first] == [3, 3]
+
+    again = NDISBUDGETER.reprocess_archive(tmp_path, workers=1)
+    assert [item["status"] for item in again] == ["cached", "cached"]
+
+    monkeypatch.setattr(NDISBUDGETER, "PARSER_VERSION", NDISBUDGETER.PARSER_VERSION + 1)
+    rebuilt = NDISBUDGETER.reprocess_archive(tmp_path, workers=1)
+    assert [item["status"] for item in rebuilt] == ["processed", "processed"]
+    assert (tmp_path / "100002 Bravo (2)" / "NDIS_Budget_Exports" / "Entries").is_dir()
+    assert "2 workbook(s): 2 processed" in NDISBUDGETER.format_reprocess_summary(rebuilt)
+
+
+def test_long_format_matches_between_paths_and_feeds_dataset(tmp_path):
+    folder = tmp_path / "100007 Charlie (7)"
+    folder.mkdir()
+    workbook = folder / "100007 budget.xlsx"
+    pd.DataFrame(EDGE_CASE_ROWS).to_excel(workbook, index=False, header=False)
+
+    frame = NDISBUDGETER.process_budget_excel(
+        workbook, export_folder=tmp_path / "frame", quiet=True, long_format=True
+    )
+    streamed = NDISBUDGETER.process_budget_excel(workbook, quiet=True, streaming=True, long_format=True)
+    assert frame["long_path"].read_bytes() == streamed["long_path"].read_bytes()
+
+    long_rows = pd.read_csv(streamed["long_path"], dtype=str)
+    assert set(long_rows["universal_id"]) == {"100007"}
+    assert long_rows["entry_index"].tolist()[-2:] == ["3", "3"]
+    assert long_rows.iloc[0][["entry", "day", "field", "value"]].tolist() == [
+        "Core / Daily Living", "Mon", "Date (again)", "2024-01-01",
+    ]
+
+    dataset = NDISBUDGETER.build_budget_dataset(tmp_path / "budgets.sqlite", tmp_path)
+    assert dataset == {"clients": 1, "rows": len(long_rows), "path": tmp_path / "budgets.sqlite"}
+
+
+def test_parquet_dataset_writes_one_row_group_per_client(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    for client_id in ("100008", "100009"):
+        folder = tmp_path / f"{client_id} Client ({client_id[-1]})"
+        folder.mkdir()
+        workbook = folder / f"{client_id} budget.xlsx"
+        pd.DataFrame(EDGE_CASE_ROWS).to_excel(workbook, index=False, header=False)
+        NDISBUDGETER.process_budget_excel(workbook, quiet=True, streaming=True, long_format=True)
+
+    dataset = NDISBUDGETER.build_budget_dataset(tmp_path / "budgets.parquet", tmp_path)
+    parquet = pq.ParquetFile(dataset["path"])
+    assert dataset["clients"] == 2
+    assert parquet.metadata.num_row_groups == 2
+    assert parquet.metadata.num_rows == dataset["rows"]
+
+
+def test_reprocessed_export_updates_the_checksum_manifest_and_catalog(tmp_path, monkeypatch):
+    folder = tmp_path / "100003 Delta (3)"
+    folder.mkdir()
+    workbook = folder / "100003 budget.xlsx"
+    pd.DataFrame(EDGE_CASE_ROWS).to_excel(workbook, index=False, header=False)
+    NDISBUDGETER.process_budget_excel(workbook, quiet=True, streaming=True)
+    # An export from an older parser: one entry CSV differs from what the current parser writes.
+    stale = sorted((folder / "NDIS_Budget_Exports").rglob("*.csv"))[0]
+    stale.write_text("old parser output\n", encoding="utf-8")
+    purger_checksums.write_checksum_manifest(
+        folder,
+        {
+            path.relative_to(folder).as_posix(): {
+                "bytes": path.stat().st_size,
+                "sha256": NDISBUDGETER._file_sha256(path),
+                "kind": "budget_export" if "NDIS_Budget_Exports" in path.parts else "budget_workbook",
+            }
+            for path in folder.rglob("*") if path.is_file()
+        },
+    )
+    db_path = purger_catalog.catalog_path(tmp_path)
+    purger_catalog.rebuild_catalog(db_path, tmp_path)
+
+    monkeypatch.setattr(NDISBUDGETER, "PARSER_VERSION", NDISBUDGETER.PARSER_VERSION + 1)
+    assert NDISBUDGETER.reprocess_archive(tmp_path, workers=1)[0]["status"] == "processed"
+
+    assert purger_checksums.verify_archive(folder)["problems"] == []
+    manifest = {entry["path"] for entry in purger_checksums.read_checksum_manifest(folder)}
+    assert "NDIS_Budget_Exports/_budget_source.json" in manifest
+    totals = purger_catalog.catalog_totals(db_path)
+    fresh = tmp_path / "fresh.sqlite3"
+    purger_catalog.rebuild_catalog(fresh, tmp_path)
+    assert totals == purger_catalog.catalog_totals(fresh)
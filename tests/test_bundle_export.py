@@ -0,0 +1,115 @@
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import importcsv
+
+
+def _use_pdcc_root(monkeypatch, root):
+    monkeypatch.setattr(importcsv, "PDCC_ROOT", root)
+    monkeypatch.setattr(importcsv, "PDCC_DOWNLOADS_DIR", root / "_downloads")
+
+
+def test_export_package_bundles_groups_once_and_keeps_skip_semantics(tmp_path, monkeypatch):
+    _use_pdcc_root(monkeypatch, tmp_path)
+    df = pd.DataFrame(
+        {
+            "Client ID": [1, 2, 3, 4],
+            "Package": [" HCP L1", "SaH Level 2", "hcp l1", None],
+        }
+    )
+    exports = importcsv._export_package_bundles(
+        df, ["HCP L1", "SaH Level 2", "Admin"], "Package", workers=2
+    )
+    assert exports == [
+        {"package": "HCP L1", "rows": 2, "skipped": False},
+        {"package": "SaH Level 2", "rows": 1, "skipped": False},
+        {"package": "Admin", "rows": 0, "skipped": False},
+    ]
+    written = pd.read_csv(tmp_path / "HCP L1" / "HCP_L1_clients.csv")
+    assert written["Client ID"].tolist() == [1, 3]
+    assert (tmp_path / "Admin" / "Admin_clients.xlsx").exists()
+
+    again = importcsv._export_package_bundles(df, ["HCP L1"], "Package", workers=1)
+    assert again == [{"package": "HCP L1", "rows": None, "skipped": True}]
+
+
+def test_stream_package_bundles_routes_rows_without_dataframe(tmp_path, monkeypatch):
+    _use_pdcc_root(monkeypatch, tmp_path / "pdcc")
+    source = tmp_path / "purgeable.xlsx"
+    pd.DataFrame(
+        {
+            "Client ID": [1, 2, 3, 4],
+            "Package": ["SaH Level 2", " HCP L1", "hcp l1", None],
+        }
+    ).to_excel(source, index=False)
+
+    result = importcsv.stream_package_bundles(source)
+    assert result["record_count"] == 4
+    assert result["packages"] == ["HCP L1", "SaH Level 2"]
+    assert [export["rows"] for export in result["exports"]] == [2, 1]
+    written = pd.read_csv(tmp_path / "pdcc" / "HCP L1" / "HCP_L1_clients.csv")
+    assert written["Client ID"].tolist() == [2, 3]
+    xlsx = pd.read_excel(tmp_path / "pdcc" / "HCP L1" / "HCP_L1_clients.xlsx")
+    assert xlsx["Client ID"].tolist() == [2, 3]
+    assert not list((tmp_path / "pdcc").rglob("*.partial.*"))
+
+    summary = importcsv.summarize_purgeable_workbook(source)
+    assert summary == {"record_count": 4, "packages": ["HCP L1", "SaH Level 2", "hcp l1"]}
+
+
+def test_purgeable_sidecar_is_reused_until_workbook_changes(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    workbook = tmp_path / "latest_purgeable_clients.xlsx"
+    pd.DataFrame({"Client ID": [1, 2, 3], "Package": ["HCP L1", "HCP L1", "Admin"]}).to_excel(
+        workbook, index=False
+    )
+    importcsv.refresh_purgeable_sidecar(workbook, importcsv.file_sha256(workbook))
+    assert (tmp_path / "latest_purgeable_clients.sidecar.json").exists()
+    first = importcsv._load_purgeable_dataframe(workbook)
+    assert isinstance(first["Package"].dtype, pd.CategoricalDtype)
+
+    def fail_read_excel(*args, **kwargs):
+        raise AssertionError("sidecar should have been used")
+
+    with monkeypatch.context() as patched:
+        patched.setattr(pd, "read_excel", fail_read_excel)
+        cached = importcsv._load_purgeable_dataframe(workbook)
+    assert cached["Client ID"].tolist() == [1, 2, 3]
+    assert importcsv._discover_packages_from_dataframe(cached) == ["Admin", "HCP L1"]
+
+    pd.DataFrame({"Client ID": [9], "Package": ["SaH Level 2"]}).to_excel(workbook, index=False)
+    refreshed = importcsv._load_purgeable_dataframe(workbook)
+    assert refreshed["Client ID"].tolist() == [9]
+
+
+def test_pickle_sidecar_on_the_share_is_never_loaded(tmp_path, monkeypatch):
+    workbook = tmp_path / "latest_purgeable_clients.xlsx"
+    pd.DataFrame({"Client ID": [4], "Package": ["HCP L1"]}).to_excel(workbook, index=False)
+    pd.DataFrame({"Client ID": [666]}).to_pickle(tmp_path / "latest_purgeable_clients.pkl")
+    (tmp_path / "latest_purgeable_clients.sidecar.json").write_text(
+        json.dumps(
+            {
+                "version": importcsv.PURGEABLE_SIDECAR_VERSION,
+                "sha256": importcsv.file_sha256(workbook),
+                "format": "pickle",
+                "data": "latest_purgeable_clients.pkl",
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    def fail_read_pickle(*args, **kwargs):
+        raise AssertionError("pickle sidecars must not be loaded")
+
+    monkeypatch.setattr(pd, "read_pickle", fail_read_pickle)
+    assert importcsv._load_purgeable_dataframe(workbook)["Client ID"].tolist() == [4]
+    if importcsv._sidecar_format() is None:
+        assert importcsv.write_purgeable_sidecar(workbook, pd.DataFrame()) is None
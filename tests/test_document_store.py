@@ -0,0 +1,86 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import purger_blobs
+
+
+def test_identical_documents_are_stored_once_and_linked(tmp_path):
+    store = purger_blobs.store_dir_for(tmp_path)
+    staging = tmp_path / "_staging"
+    staging.mkdir()
+    first_client = tmp_path / "100008 A (1)" / "100008 Documents"
+    second_client = tmp_path / "100009 B (2)" / "100009 Documents"
+    first_client.mkdir(parents=True)
+    second_client.mkdir(parents=True)
+
+    (staging / "policy.pdf").write_bytes(b"%PDF shared policy")
+    first = purger_blobs.ingest_file(
+        store, staging / "policy.pdf", first_client / "100008 Policy.pdf", link="hardlink"
+    )
+    (staging / "policy.pdf").write_bytes(b"%PDF shared policy")
+    second = purger_blobs.ingest_file(
+        store, staging / "policy.pdf", second_client / "100009 Policy.pdf", link="hardlink"
+    )
+
+    assert (first["deduplicated"], second["deduplicated"]) == (False, True)
+    assert first["sha256"] == second["sha256"]
+    assert second["method"] == "hardlink"
+    assert not (staging / "policy.pdf").exists()
+    blob = purger_blobs.blob_path(store, first["sha256"], ".pdf")
+    assert blob.stat().st_nlink == 3
+    assert (second_client / "100009 Policy.pdf").read_bytes() == b"%PDF shared policy"
+    assert len(list(store.glob("*/*"))) == 1
+
+
+def test_client_folder_can_be_deleted_after_ingest_and_concurrent_blobs_are_kept(tmp_path, monkeypatch):
+    import shutil
+
+    store = purger_blobs.store_dir_for(tmp_path)
+    staging = tmp_path / "_staging"
+    staging.mkdir()
+    client = tmp_path / "100010 C (3)"
+    (client / "100010 Documents").mkdir(parents=True)
+    (staging / "form.pdf").write_bytes(b"%PDF form")
+    stored = purger_blobs.ingest_file(store, staging / "form.pdf", client / "100010 Documents" / "Form.pdf")
+
+    blob = purger_blobs.blob_path(store, stored["sha256"], ".pdf")
+    shutil.rmtree(client)
+    assert not client.exists() and blob.read_bytes() == b"%PDF form"
+
+    # Another worker stored the same content between the exists check and the link.
+    (staging / "form.pdf").write_bytes(b"%PDF form")
+    real_exists = Path.exists
+    calls = []
+
+    def racing_exists(self):
+        if self == blob and not calls:
+            calls.append(self)
+            return False
+        return real_exists(self)
+
+    original_inode = blob.stat().st_ino
+    monkeypatch.setattr(Path, "exists", racing_exists)
+    again = purger_blobs.ingest_file(store, staging / "form.pdf", tmp_path / "Form.pdf")
+    assert again["deduplicated"] and blob.stat().st_ino == original_inode
+    assert not (staging / "form.pdf").exists()
+
+
+def test_reflink_mode_copies_instead_of_hardlinking_when_clones_are_unsupported(tmp_path, monkeypatch):
+    def unsupported(source, target):
+        raise OSError("reflinks are not supported on this platform")
+
+    monkeypatch.setattr(purger_blobs, "_reflink", unsupported)
+    store = purger_blobs.store_dir_for(tmp_path)
+    (tmp_path / "download.pdf").write_bytes(b"%PDF shared")
+    target = tmp_path / "Shared.pdf"
+    stored = purger_blobs.ingest_file(store, tmp_path / "download.pdf", target)
+
+    blob = purger_blobs.blob_path(store, stored["sha256"], ".pdf")
+    assert stored["method"] == "copy"
+    assert target.stat().st_ino != blob.stat().st_ino
+    target.write_bytes(b"edited in one archive")
+    assert blob.read_bytes() == b"%PDF shared"
@@ -0,0 +1,64 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import importcsv
+
+
+def _write_manifest(path, rows):
+    path.write_text("\n".join(rows) + "\n", encoding="utf-8")
+    return path
+
+
+def test_select_clients_by_packages_uses_package_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(importcsv, "MANIFEST_CACHE_DIR", tmp_path / "cache")
+    manifest = _write_manifest(
+        tmp_path / "manifest.csv",
+        [
+            "Client ID,Client Name,Package",
+            "1,Alpha,SIL",
+            "2,Bravo,Core Supports",
+            "3,Charlie,sil",
+            "2,Bravo,SIL",
+        ],
+    )
+    queue = importcsv.build_batch_queue(manifest, packages=["Core Supports", "SIL"])
+    assert [entry["client_id"] for entry in queue] == ["2", "1", "3"]
+
+
+def test_load_client_manifest_is_cached_by_content_hash(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(importcsv, "MANIFEST_CACHE_DIR", cache_dir)
+    manifest = _write_manifest(
+        tmp_path / "manifest.csv",
+        ["client_id,client_name,package", "10,Delta,HCP L1"],
+    )
+    entries = importcsv.load_client_manifest(manifest)
+    assert entries == [{"client_id": "10", "client_name": "Delta", "package": "HCP L1"}]
+    assert len(list(cache_dir.glob("*.json"))) == 1
+
+    index = importcsv.load_manifest_index(manifest)
+    assert index["by_client"]["10"]["client_name"] == "Delta"
+    assert [e["client_id"] for e in index["by_package"]["hcp l1"]] == ["10"]
+
+
+def test_snapshot_headers_are_mapped_and_queue_saved(tmp_path, monkeypatch):
+    monkeypatch.setattr(importcsv, "MANIFEST_CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(importcsv, "PDCC_ROOT", tmp_path / "pdcc")
+    snapshot = _write_manifest(
+        tmp_path / "snapshot.csv",
+        [
+            "Status,TP Client ID,Participant Name,Package Type,Case Manager",
+            "Active,7,Echo,HCP L2,Sam",
+            "Active,8,Foxtrot,Admin,Sam",
+        ],
+    )
+    queue = importcsv.build_batch_queue(snapshot, packages=["hcp l2"])
+    assert queue == [{"client_id": "7", "client_name": "Echo", "package": "HCP L2"}]
+
+    saved = importcsv.write_queue_manifest(queue, snapshot)
+    assert saved.parent == tmp_path / "pdcc" / "_manifests"
+    assert importcsv.load_client_manifest(saved) == queue
@@ -0,0 +1,66 @@
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import importcsv
+
+
+def test_post_processing_runs_in_background_and_drains(monkeypatch):
+    monkeypatch.setattr(importcsv, "POST_PROCESS_WORKERS", 1)
+    monkeypatch.setattr(importcsv, "_POST_PROCESS_EXECUTOR", None)
+    monkeypatch.setattr(importcsv, "RUN_METRICS", {})
+    monkeypatch.setattr(importcsv, "PENDING_POST_PROCESSING", [])
+    monkeypatch.setattr(importcsv, "log_message", lambda message: None)
+    release = threading.Event()
+    results = []
+
+    def slow_parse(value):
+        release.wait(5)
+        return value * 2
+
+    def broken():
+        raise ValueError("bad workbook")
+
+    future = importcsv.submit_post_processing("parse", slow_parse, 21, on_result=results.append)
+    importcsv.submit_post_processing("broken", broken)
+    assert not future.done()
+
+    release.set()
+    assert importcsv.drain_post_processing() == (1, 1)
+    assert results == [42]
+    assert importcsv.PENDING_POST_PROCESSING == []
+    assert importcsv.RUN_METRICS == {"post_processed": 1, "post_process_failed": 1}
+
+
+def test_purge_waits_for_tasks_left_over_from_an_aborted_run(monkeypatch):
+    monkeypatch.setattr(importcsv, "POST_PROCESS_WORKERS", 1)
+    monkeypatch.setattr(importcsv, "_POST_PROCESS_EXECUTOR", None)
+    monkeypatch.setattr(importcsv, "RUN_METRICS", {})
+    monkeypatch.setattr(importcsv, "PENDING_POST_PROCESSING", [])
+    monkeypatch.setattr(importcsv, "DOWNLOAD_DIR", None)
+    logged = []
+    monkeypatch.setattr(importcsv, "log_message", logged.append)
+    leftovers = []
+    importcsv.submit_post_processing("stale hash", lambda: "done", on_result=leftovers.append)
+
+    for name in ("guard_against_duplicate", "assign_universal_sequence", "configure_client_context",
+                 "cleanup_old_csvs", "finalize_output_directory", "finalize_sqlite_archive",
+                 "write_run_checksums"):
+        monkeypatch.setattr(importcsv, name, lambda *args, **kwargs: None)
+    monkeypatch.setattr(importcsv, "reserve_universal_sequence", lambda: (100001, 0))
+    monkeypatch.setattr(importcsv, "build_chrome_driver", lambda **kwargs: type("D", (), {"quit": lambda self: None})())
+
+    def refuse_login(driver):
+        raise RuntimeError("offline")
+
+    monkeypatch.setattr(importcsv, "login", refuse_login)
+    with pytest.raises(importcsv.PurgeStepError):
+        importcsv.run_turnpoint_purge("42")
+    assert leftovers == ["done"]
+    assert "Waiting for 1 background task(s) left over from the previous run." in logged
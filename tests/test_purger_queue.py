@@ -0,0 +1,94 @@
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import purger_queue
+
+
+def _entries(*client_ids):
+    return [{"client_id": cid, "client_name": f"Client {cid}", "package": "SIL"} for cid in client_ids]
+
+
+def test_claims_are_exclusive_and_allocate_distinct_universal_ids(tmp_path):
+    db = tmp_path / "queue.sqlite3"
+    assert purger_queue.enqueue_jobs(db, _entries("1", "2")) == 2
+    assert purger_queue.enqueue_jobs(db, _entries("2", "3")) == 1
+
+    first = purger_queue.claim_job(db, "host-a:1", universal_floor=100001)
+    second = purger_queue.claim_job(db, "host-b:1", universal_floor=100001)
+    assert (first["client_id"], second["client_id"]) == ("1", "2")
+    assert (first["universal_id"], second["universal_id"]) == (100001, 100002)
+
+    assert purger_queue.complete_job(db, "1", "host-a:1", output_path="/archive/1")
+    assert not purger_queue.complete_job(db, "2", "host-a:1")
+    assert purger_queue.queue_counts(db)["done"] == 1
+
+
+def test_expired_leases_are_reclaimed_and_keep_their_universal_id(tmp_path):
+    db = tmp_path / "queue.sqlite3"
+    purger_queue.enqueue_jobs(db, _entries("7"))
+    job = purger_queue.claim_job(db, "crashed:1", lease_seconds=0, universal_floor=100010)
+    time.sleep(0.01)
+
+    retry = purger_queue.claim_job(db, "healthy:2", universal_floor=100050)
+    assert retry["client_id"] == "7"
+    assert retry["attempts"] == 2
+    assert retry["universal_id"] == job["universal_id"]
+    assert not purger_queue.heartbeat(db, "7", "crashed:1")
+
+
+def test_fail_job_backs_off_before_the_job_is_claimable_again(tmp_path):
+    db = tmp_path / "queue.sqlite3"
+    purger_queue.enqueue_jobs(db, _entries("9"))
+    purger_queue.claim_job(db, "w:1")
+    purger_queue.fail_job(db, "9", "w:1", kind="timeout", error="slow", retry_delay=60)
+    assert purger_queue.claim_job(db, "w:1") is None
+    counts = purger_queue.queue_counts(db)
+    assert counts["pending"] == 1 and counts["next_available_at"] > time.time()
+
+
+def test_worker_does_not_record_a_client_reclaimed_by_another_worker(tmp_path, monkeypatch):
+    import sqlite3
+
+    import importcsv
+
+    db = tmp_path / "queue.sqlite3"
+    purger_queue.enqueue_jobs(db, _entries("11"))
+    seen_stop = []
+
+    def purge_while_lease_is_stolen(client_id, **kwargs):
+        seen_stop.append(importcsv.PURGE_STOP is not None)
+        with sqlite3.connect(db) as conn:
+            conn.execute("UPDATE jobs SET lease_owner = 'other:2' WHERE client_id = ?", (client_id,))
+        purger_queue.complete_job(db, client_id, "other:2", output_path="/archive/other")
+        return tmp_path / "archive"
+
+    monkeypatch.setattr(importcsv, "run_turnpoint_purge", purge_while_lease_is_stolen)
+    monkeypatch.setattr(importcsv, "log_message", lambda message: None)
+    monkeypatch.setattr(importcsv, "reserve_universal_sequence", lambda: (100001, 0))
+    results = importcsv.run_queue_worker(db, worker_id="me:1", lease_seconds=60)
+
+    assert seen_stop == [True] and importcsv.PURGE_STOP is None
+    assert [result["status"] for result in results] == ["lease_lost"]
+    with sqlite3.connect(db) as conn:
+        assert conn.execute("SELECT output_path FROM jobs").fetchone() == ("/archive/other",)
+
+
+def test_fleet_limit_is_explicit_and_independent_of_the_local_throttle(tmp_path, monkeypatch):
+    import importcsv
+
+    db = tmp_path / "queue.sqlite3"
+    purger_queue.enqueue_jobs(db, _entries("21", "22"))
+    monkeypatch.setattr(importcsv, "run_turnpoint_purge", lambda client_id, **kwargs: tmp_path / client_id)
+    monkeypatch.setattr(importcsv, "log_message", lambda message: None)
+    monkeypatch.setattr(importcsv, "reserve_universal_sequence", lambda: (100001, 0))
+    monkeypatch.setattr(importcsv.THROTTLE, "concurrency", 1)
+
+    results = importcsv.run_queue_worker(db, worker_id="me:1", fleet_limit=3)
+    assert [result["status"] for result in results] == ["completed", "completed"]
+    assert purger_queue.get_meta(db, "fleet_limit") == "3"
+    assert purger_queue.get_meta(db, "throttle_concurrency") is None
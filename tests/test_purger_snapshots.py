@@ -0,0 +1,56 @@
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import purger_snapshots
+
+
+def _download(directory, name, payload):
+    path = directory / name
+    path.write_bytes(payload)
+    return path
+
+
+def test_store_dedupes_links_latest_and_applies_retention(tmp_path):
+    downloads = tmp_path / "_downloads"
+    downloads.mkdir()
+    store = downloads / "snapshots"
+    latest = tmp_path / "latest_purgeable_clients.xlsx"
+
+    first, is_new = purger_snapshots.store_snapshot(
+        store, _download(downloads, "a.xlsx", b"one"), row_counter=lambda path: 1,
+        seen_at="2025-01-01T00:00:00+00:00",
+    )
+    again, again_new = purger_snapshots.store_snapshot(
+        store, _download(downloads, "b.xlsx", b"one"), seen_at="2025-01-02T00:00:00+00:00"
+    )
+    assert is_new and not again_new
+    assert again["downloads"] == 2 and again["rows"] == 1
+    assert sorted(path.name for path in downloads.iterdir()) == ["snapshots"]
+
+    purger_snapshots.store_snapshot(
+        store, _download(downloads, "c.xlsx", b"two"), seen_at="2025-01-03T00:00:00+00:00"
+    )
+    newest = purger_snapshots.latest_entry(store)
+    purger_snapshots.point_latest(store / newest["file"], latest)
+    assert latest.read_bytes() == b"two"
+
+    removed = purger_snapshots.apply_retention(store, keep=1)
+    assert [entry["sha256"] for entry in removed] == [first["sha256"]]
+    assert not (store / first["file"]).exists()
+    index = json.loads((store / "index.json").read_text())
+    assert [entry["sha256"] for entry in index["snapshots"]] == [newest["sha256"]]
+
+
+def test_legacy_timestamped_downloads_are_ingested(tmp_path):
+    downloads = tmp_path / "_downloads"
+    downloads.mkdir()
+    _download(downloads, "purgeable_clients_20240101_120000.xlsx", b"old")
+    _download(downloads, "purgeable_clients_20240102_120000.xlsx", b"new")
+    assert purger_snapshots.ingest_legacy_snapshots(downloads / "snapshots", downloads) == 2
+    assert not list(downloads.glob("purgeable_clients_*.xlsx"))
+    assert (downloads / "snapshots" / (purger_snapshots.latest_entry(downloads / "snapshots")["file"])).read_bytes() == b"new"
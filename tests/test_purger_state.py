@@ -0,0 +1,45 @@
+import multiprocessing
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import purger_state
+
+
+def _record_many(state_dir, first_uid, count):
+    purger_state.STATE_DIR = Path(state_dir)
+    purger_state.STATE_FILE = Path(state_dir) / "purger_state.json"
+    for offset in range(count):
+        uid = first_uid + offset
+        purger_state.record_purge_event(
+            universal_id=uid,
+            turnpoint_id=str(uid),
+            client_name="",
+            success=True,
+            bytes_written=1,
+            timestamp_iso="2026-01-01T00:00:00+00:00",
+        )
+        purger_state.remember_selector("tp1", f"control-{uid}", ("id", str(uid)))
+
+
+def test_concurrent_processes_do_not_lose_state_updates(tmp_path, monkeypatch):
+    monkeypatch.setattr(purger_state, "STATE_DIR", tmp_path)
+    monkeypatch.setattr(purger_state, "STATE_FILE", tmp_path / "purger_state.json")
+    workers = [
+        multiprocessing.Process(target=_record_many, args=(str(tmp_path), 200000 + 100 * n, 15))
+        for n in range(3)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(60)
+        assert worker.exitcode == 0
+
+    state = purger_state.get_purge_statistics()
+    assert state["purged_count"] == 45
+    assert len(state["clients"]) == 45 and len(state["selectors"]["tp1"]) == 45
+    assert state["next_universal_id"] == 200215
+    assert not list(tmp_path.glob("*.tmp"))
@@ -0,0 +1,44 @@
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from purger_throttle import AdaptiveThrottle, TokenBucket
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=50, capacity=1)
+    started = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    assert time.monotonic() - started >= 0.09
+
+
+def test_aimd_backs_off_on_errors_and_probes_up_when_healthy():
+    changes = []
+    throttle = AdaptiveThrottle(
+        rate=4, rate_step=0.5, concurrency=4, max_concurrency=6, target_latency=1.0,
+        window=3, on_change=lambda direction, *_: changes.append(direction),
+    )
+    throttle.observe(error=True)
+    assert (throttle.rate, throttle.concurrency) == (2, 2)
+
+    for _ in range(3):
+        throttle.observe(0.2)
+    assert (throttle.rate, throttle.concurrency) == (2.5, 3)
+
+    for _ in range(3):
+        throttle.observe(5.0)
+    assert (throttle.rate, throttle.concurrency) == (1.25, 1)
+    assert changes == ["decrease", "increase", "decrease"]
+
+
+def test_set_share_splits_rate_across_workers():
+    throttle = AdaptiveThrottle(rate=6)
+    throttle.set_share(3)
+    assert throttle.status()["process_rate"] == 2
+    with throttle.slot():
+        assert throttle.status()["in_flight"] == 1
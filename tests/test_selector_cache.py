@@ -0,0 +1,39 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import importcsv
+import purger_state
+
+
+class FakeDriver:
+    def __init__(self, present):
+        self.present = set(present)
+        self.lookups = []
+
+    def find_elements(self, by, value):
+        self.lookups.append((by, value))
+        return [object()] if (by, value) in self.present else []
+
+
+def test_learned_selector_is_tried_first_and_relearned(tmp_path, monkeypatch):
+    monkeypatch.setattr(purger_state, "STATE_DIR", tmp_path)
+    monkeypatch.setattr(purger_state, "STATE_FILE", tmp_path / "state.json")
+    candidates = [("id", "first"), ("name", "second"), ("xpath", "third")]
+    used = []
+
+    driver = FakeDriver({("xpath", "third")})
+    assert importcsv.use_page_control(driver, "limit", candidates, used.append)
+    assert purger_state.get_learned_selector(importcsv.BASE_URL, "limit") == ("xpath", "third")
+
+    driver = FakeDriver({("xpath", "third")})
+    assert importcsv.use_page_control(driver, "limit", candidates, used.append)
+    assert driver.lookups == [("xpath", "third")]
+
+    driver = FakeDriver({("name", "second")})
+    assert importcsv.use_page_control(driver, "limit", candidates, used.append)
+    assert purger_state.get_learned_selector(importcsv.BASE_URL, "limit") == ("name", "second")
+    assert len(used) == 3
@@ -0,0 +1,104 @@
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import importcsv
+
+
+def _snapshot(path, rows):
+    pd.DataFrame(rows, columns=["Client ID", "Client Name", "Package"]).to_excel(path, index=False)
+    return path
+
+
+def test_diff_lists_clients_and_limits_bundle_rewrites(tmp_path, monkeypatch):
+    monkeypatch.setattr(importcsv, "PDCC_ROOT", tmp_path / "pdcc")
+    downloads = tmp_path / "pdcc" / "_downloads"
+    downloads.mkdir(parents=True)
+    previous = _snapshot(
+        downloads / "purgeable_clients_20250101_000000.xlsx",
+        [[1, "Ann", "HCP L1"], [2, "Bob", "Admin"], [3, "Cy", "SaH Level 2"]],
+    )
+    current = _snapshot(
+        downloads / "purgeable_clients_20250102_000000.xlsx",
+        [[1, "Ann", "HCP L1"], [3, "Cy", "HCP L2"], [4, "Di", "HCP L1"]],
+    )
+    changes = importcsv.diff_purgeable_snapshots(previous, current)
+    assert changes["added"] == [{"client_id": "4", "package": "HCP L1"}]
+    assert changes["removed"] == [{"client_id": "2", "package": "Admin"}]
+    assert changes["changed"] == [
+        {"client_id": "3", "package": "HCP L2", "previous_package": "SaH Level 2", "fields": ["package"]}
+    ]
+    assert changes["packages"] == ["Admin", "HCP L1", "HCP L2", "SaH Level 2"]
+
+    log_path = importcsv.write_snapshot_change_log(changes, tmp_path / "changes")
+    assert json.loads(log_path.read_text())["current"] == current.name
+
+    df = pd.read_excel(current)
+    importcsv._export_package_bundles(df, ["HCP L1", "Admin", "NDIS - Plan Managed"], "Package", workers=1)
+    exports = importcsv._export_package_bundles(
+        df,
+        ["HCP L1", "Admin", "NDIS - Plan Managed"],
+        "Package",
+        workers=1,
+        refresh_packages=changes["packages"],
+    )
+    assert [export["skipped"] for export in exports] == [False, False, True]
+
+
+def _fake_pdcc(tmp_path, monkeypatch, downloads):
+    """Point PDCC at tmp_path and make each 'download' return the next row list."""
+    pdcc = tmp_path / "pdcc"
+    monkeypatch.setattr(importcsv, "PDCC_ROOT", pdcc)
+    monkeypatch.setattr(importcsv, "PDCC_DOWNLOADS_DIR", pdcc / "_downloads")
+    monkeypatch.setattr(importcsv, "SNAPSHOT_CHANGES_DIR", pdcc / "_downloads" / "_changes")
+    monkeypatch.setattr(importcsv, "LATEST_PURGEABLE_EXCEL", pdcc / "latest_purgeable_clients.xlsx")
+    monkeypatch.setattr(importcsv, "build_chrome_driver", lambda **kwargs: type("D", (), {"quit": lambda self: None})())
+    monkeypatch.setattr(importcsv, "login", lambda driver: None)
+    monkeypatch.setattr(importcsv, "log_message", lambda message: None)
+
+    def fake_download(driver, *, download_dir, **kwargs):
+        download_dir.mkdir(parents=True, exist_ok=True)
+        path = _snapshot(download_dir / "download.xlsx", downloads.pop(0))
+        return importcsv._store_purgeable_snapshot(path, importcsv._snapshot_store_dir(download_dir))
+
+    monkeypatch.setattr(importcsv, "_download_purgeable_clients_excel", fake_download)
+    return pdcc
+
+
+def test_retention_keeps_the_snapshot_a_download_was_diffed_against(tmp_path, monkeypatch):
+    _fake_pdcc(tmp_path, monkeypatch, [
+        [[1, "Ann", "HCP L1"]],
+        [[1, "Ann", "HCP L1"], [2, "Bob", "Admin"]],
+    ])
+    monkeypatch.setattr(importcsv, "SNAPSHOT_KEEP", 1)
+    first = importcsv.find_purgeable_clients(include_dataframe=False)
+    second = importcsv.find_purgeable_clients(include_dataframe=False)
+
+    assert first["changes"] is None
+    assert [item["client_id"] for item in second["changes"]["added"]] == ["2"]
+    store = importcsv._snapshot_store_dir()
+    assert len(list(store.glob("*.xlsx"))) == 2  # keep=1, but the diff baseline stays
+
+
+def test_update_bundle_diffs_against_the_snapshot_the_bundles_were_built_from(tmp_path, monkeypatch):
+    built = [[1, "Ann", "HCP L1"], [2, "Bob", "Admin"]]
+    moved = [[1, "Ann", "HCP L1"], [2, "Bob", "HCP L1"]]
+    _fake_pdcc(tmp_path, monkeypatch, [built, moved, moved])
+    monkeypatch.setattr(importcsv, "SNAPSHOT_KEEP", 1)
+
+    first = importcsv.bundle_package_download(refresh=True, streaming=True)
+    assert first["changes"] is None  # nothing recorded yet: full rebuild
+    importcsv.find_purgeable_clients(include_dataframe=False)  # e.g. the GUI's "Find purgeable"
+    update = importcsv.bundle_package_download(refresh=True, streaming=True)
+
+    assert [item["client_id"] for item in update["changes"]["changed"]] == ["2"]
+    rewritten = sorted(export["package"] for export in update["exports"] if not export["skipped"])
+    assert rewritten == ["Admin", "HCP L1"]
+    admin_csv = importcsv._package_export_paths("Admin", create=False)[1]
+    assert pd.read_csv(admin_csv).empty
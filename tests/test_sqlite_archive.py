@@ -0,0 +1,67 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import purger_checksums
+import purger_sqlite_archive
+
+
+def test_sqlite_only_archive_holds_pages_budget_and_documents(tmp_path, monkeypatch):
+    import importcsv
+
+    archive = tmp_path / "100006 Jane Citizen (4413)"
+    (archive / "100006 Documents").mkdir(parents=True)
+    partial = tmp_path / "_staging" / "100006-1.sqlite3"
+    purger_sqlite_archive.create_archive(partial, universal_id="100006", turnpoint_id="4413")
+    for name, value in {
+        "OUTPUT_DIR": archive,
+        "DOCUMENTS_DIR": archive / "100006 Documents",
+        "FILE_PREFIX": "100006 ",
+        "CLIENT_NAME": "Jane Citizen",
+        "UNIVERSAL_CLIENT_ID": None,
+        "ARCHIVE_FORMAT": "sqlite",
+        "SQLITE_ARCHIVE_DOCUMENTS": True,
+        "SQLITE_ARCHIVE_PATH": partial,
+        "RUN_WRITTEN": {},
+        "RUN_METRICS": {},
+        "log_message": lambda message: None,
+    }.items():
+        monkeypatch.setattr(importcsv, name, value)
+    monkeypatch.setattr(purger_sqlite_archive, "BATCH_ROWS", 2)
+
+    notes = [{"Note": f"note {i}, with comma", "Author": "A"} for i in range(5)]
+    importcsv.write_csv("Notes", notes)
+    importcsv.write_csv("Contacts", [])
+    long_csv = tmp_path / "Budget_Long.csv"
+    long_csv.write_text(
+        "universal_id,entry_index,entry,line,day,field,value\n"
+        "100006,1,Agreement entry 1,1,Mon,Hours,2\n"
+        "100006,1,Agreement entry 1,2,Tue,Hours,3\n",
+        encoding="utf-8",
+    )
+    assert importcsv.load_budget_lines(partial, long_csv) == 2
+    for _ in range(2):
+        download = tmp_path / "_staging" / "plan.pdf"
+        download.write_bytes(b"%PDF" * 100)
+        importcsv.archive_document(download, archive / "100006 Documents" / "100006 Plan.pdf", "document cid=7")
+        assert not download.exists()
+
+    target = importcsv.finalize_sqlite_archive()
+    assert target == archive / "100006 Jane Citizen (4413).sqlite3"
+    assert not partial.exists()
+    assert not list(archive.glob("*.csv"))
+    assert list(importcsv.RUN_WRITTEN) == [target.name]
+    assert importcsv.run_bytes_written() == target.stat().st_size
+    importcsv.write_run_checksums()
+    verified = purger_checksums.verify_archive(archive)
+    assert (verified["files"], verified["problems"]) == (1, [])
+    assert purger_sqlite_archive.read_page(target, "Notes") == notes
+    assert purger_sqlite_archive.read_page(target, "Contacts") == []
+    assert purger_sqlite_archive.read_file(target, "100006 Documents/100006 Plan_1.pdf") == b"%PDF" * 100
+    assert purger_sqlite_archive.get_metadata(target)["client_name"] == "Jane Citizen"
+    assert purger_sqlite_archive.archive_summary(target) == {
+        "pages": 2, "records": 5, "budget_lines": 2, "files": 2, "stored_bytes": 800,
+    }
@@ -0,0 +1,81 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import importcsv
+
+
+def test_pagination_targets_orders_links_and_skips_first_page():
+    urls, scripted = importcsv._pagination_targets(
+        [
+            {"label": "1", "href": "https://tp1.com.au/client-list.asp?page=1"},
+            {"label": "Next", "href": "https://tp1.com.au/client-list.asp?page=2"},
+            {"label": "3", "href": "https://tp1.com.au/client-list.asp?page=3"},
+            {"label": "2", "href": "https://tp1.com.au/client-list.asp?page=2"},
+            {"label": "4", "href": "javascript:goPage(4)"},
+        ]
+    )
+    assert urls == [
+        "https://tp1.com.au/client-list.asp?page=2",
+        "https://tp1.com.au/client-list.asp?page=3",
+    ]
+    assert scripted == ["4"]
+
+
+def test_harvested_pages_match_the_bundler_schema(tmp_path, monkeypatch):
+    monkeypatch.setattr(importcsv, "PDCC_ROOT", tmp_path / "pdcc")
+    path = tmp_path / "harvest.xlsx"
+    pages = [
+        {"headers": ["Client ID", "Name", "Package"], "rows": [["101", "Ann", "HCP L1"]]},
+        {"headers": ["Package", "Client ID", "Name"], "rows": [["Admin", "0102", "Bob"]]},
+    ]
+    assert importcsv.write_harvested_workbook(path, ["Client ID", "Name", "Package"], pages) == 2
+
+    rows = list(importcsv.iter_workbook_rows(path))
+    assert rows == [("Client ID", "Name", "Package"), (101, "Ann", "HCP L1"), ("0102", "Bob", "Admin")]
+    result = importcsv.stream_package_bundles(path)
+    assert result["packages"] == ["Admin", "HCP L1"]
+
+
+class _SessionDriver:
+    """Fake browser whose purgeable filter lives in the session, not the pager URL."""
+
+    def __init__(self):
+        self.filtered = False
+        self.current_url = "https://tp1.com.au/client-list.asp"
+
+    def quit(self):
+        pass
+
+
+def test_parallel_harvest_workers_reapply_a_session_scoped_filter(tmp_path, monkeypatch):
+    monkeypatch.setattr(importcsv, "PDCC_ROOT", tmp_path / "pdcc")
+    monkeypatch.setattr(importcsv, "LATEST_PURGEABLE_EXCEL", tmp_path / "pdcc" / "latest.xlsx")
+    monkeypatch.setattr(importcsv, "log_message", lambda message: None)
+    monkeypatch.setattr(importcsv, "build_chrome_driver", lambda **kwargs: _SessionDriver())
+    monkeypatch.setattr(importcsv, "login", lambda driver: None)
+    monkeypatch.setattr(importcsv, "open_page", lambda driver, url, *args, **kwargs: None)
+    monkeypatch.setattr(importcsv, "_assert_valid_purgeable_page", lambda driver, url: None)
+    monkeypatch.setattr(importcsv, "_set_record_limit", lambda driver, limit: True)
+    monkeypatch.setattr(importcsv, "_apply_purgeable_filter", lambda driver: setattr(driver, "filtered", True))
+    pager = [{"label": str(n), "href": f"https://tp1.com.au/client-list.asp?page={n}"} for n in (1, 2, 3)]
+
+    def read_table(driver, url=None):
+        page = url.rsplit("=", 1)[-1] if url else "1"
+        status = "Purgeable" if driver.filtered else "Active"
+        return {
+            "headers": ["Client ID", "Status", "Package"],
+            "rows": [[page, status, "SIL"]],
+            "pages": pager,
+        }
+
+    monkeypatch.setattr(importcsv, "_read_result_table", read_table)
+    blob = importcsv._harvest_purgeable_clients_table(
+        _SessionDriver(), download_dir=tmp_path / "downloads", workers=2
+    )
+
+    rows = list(importcsv.iter_workbook_rows(blob))[1:]
+    assert sorted(rows) == [(1, "Purgeable", "SIL"), (2, "Purgeable", "SIL"), (3, "Purgeable", "SIL")]
@@ -24,7 +24,7 @@ a = Analysis(
     pathex=[str(project_root)],
     binaries=[],
     datas=datas,
-    hiddenimports=["NDISBUDGETER"],
+    hiddenimports=["NDISBUDGETER", "purger_queue", "purger_throttle", "purger_snapshots", "purger_catalog", "purger_archive", "purger_blobs", "purger_checksums", "purger_sqlite_archive", "python_calamine", "zstandard", "pyarrow"],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
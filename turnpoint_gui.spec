@@ -27,6 +27,17 @@ a = Analysis(
     hiddenimports=[
         "NDISBUDGETER",
         "importcsv",
+        "purger_queue",
+        "purger_throttle",
+        "purger_snapshots",
+        "purger_catalog",
+        "purger_archive",
+        "purger_blobs",
+        "purger_checksums",
+        "purger_sqlite_archive",
+        "python_calamine",
+        "zstandard",
+        "pyarrow",
         "PIL",
         "PIL.Image",
         "PIL.ImageTk",
@@ -1,5 +1,6 @@
 import queue
 import threading
+from multiprocessing import freeze_support
 from datetime import datetime
 from pathlib import Path
 import tkinter as tk
@@ -15,7 +16,10 @@ from importcsv import (
     format_timestamp,
     find_purgeable_clients,
     bundle_package_download,
+    get_archive_catalog_totals,
+    get_throttle_status,
     run_turnpoint_purge,
+    wait_for_archive_packaging,
     set_log_sink,
     set_operator_name,
     reset_purge_data,
@@ -54,6 +58,7 @@ class TurnpointPurgerUI(tk.Tk):
         self.client_id_var = tk.StringVar(value=str(DEFAULT_CLIENT_ID))
         self.headless_var = tk.BooleanVar(value=False)
         self.sequence_var = tk.StringVar(value="Sequence tracker offline")
+        self.throttle_var = tk.StringVar(value="Throttle: idle")
         self.credential_display_var = tk.StringVar(value="Purging account: (not set)")
         self.operator_name = None
         self.credential_username = RUNTIME_USERNAME or ""
@@ -77,6 +82,7 @@ class TurnpointPurgerUI(tk.Tk):
 
         set_log_sink(self._enqueue_log)
         self.after(120, self._drain_log_queue)
+        self.after(1000, self._refresh_throttle_status)
         self.after(400, self._prompt_operator_name)
         self.after(200, self._maximize_window)
         self.protocol("WM_DELETE_WINDOW", self._on_close)
@@ -292,7 +298,16 @@ class TurnpointPurgerUI(tk.Tk):
             bg="#050b16",
             font=("Space Mono", 11),
         )
-        stats_label.pack(anchor="w", padx=20, pady=(0, 12))
+        stats_label.pack(anchor="w", padx=20, pady=(0, 4))
+
+        throttle_label = tk.Label(
+            controls_panel,
+            textvariable=self.throttle_var,
+            fg="#5f9fd8",
+            bg="#050b16",
+            font=("Space Mono", 10),
+        )
+        throttle_label.pack(anchor="w", padx=20, pady=(0, 12))
 
         cred_label = tk.Label(
             controls_panel,
@@ -742,7 +757,9 @@ class TurnpointPurgerUI(tk.Tk):
     def _handle_find_purgeable_clients(self):
         def task():
             try:
-                result = find_purgeable_clients(headless=self.headless_var.get())
+                result = find_purgeable_clients(
+                    headless=self.headless_var.get(), include_dataframe=False
+                )
                 self.last_dataset_path = result.get("excel_path")
                 packages = result.get("packages", [])
                 count = result.get("record_count", 0)
@@ -767,7 +784,7 @@ class TurnpointPurgerUI(tk.Tk):
                 result = bundle_package_download(
                     headless=self.headless_var.get(),
                     refresh=update,
-                    overwrite=update,
+                    streaming=True,
                 )
                 self.last_dataset_path = result.get("excel_path")
                 exports = result.get("exports", [])
@@ -778,6 +795,12 @@ class TurnpointPurgerUI(tk.Tk):
                     f"{len(completed)} package(s) exported, {len(skipped)} skipped. "
                     f"Source workbook: {self.last_dataset_path}"
                 )
+                changes = result.get("changes")
+                if changes:
+                    summary += (
+                        f" Clients since last snapshot: {len(changes['added'])} added, "
+                        f"{len(changes['removed'])} removed, {len(changes['changed'])} changed."
+                    )
                 self._enqueue_log(self._timestamp(summary))
                 self.after(0, lambda: messagebox.showinfo("TurnpointPurger", summary))
             except Exception as exc:
@@ -843,6 +866,7 @@ class TurnpointPurgerUI(tk.Tk):
         return f"{stamp} {text}"
 
     def _on_close(self):
+        wait_for_archive_packaging()  # log any background packaging failures before the sink goes
         set_log_sink(None)
         if self.scroll_canvas:
             self.scroll_canvas.unbind_all("<MouseWheel>")
@@ -858,10 +882,32 @@ class TurnpointPurgerUI(tk.Tk):
                 f"Next Sequence: {stats['next_universal_id']}    "
                 f"Purged: {stats['purged_count']}"
             )
+            try:
+                totals = get_archive_catalog_totals()
+            except Exception:
+                totals = None
+            if totals:
+                text += (
+                    f"    Archived: {totals['archives']} client(s), "
+                    f"{totals['bytes'] / (1024 ** 3):.2f} GB"
+                )
         else:
             text = "Sequence tracker offline"
         self.sequence_var.set(text)
 
+    def _refresh_throttle_status(self):
+        try:
+            status = get_throttle_status()
+            text = (
+                f"Throttle: {status['process_rate']:.2f} req/s • "
+                f"concurrency {status['in_flight']}/{status['concurrency']} • "
+                f"{status['errors']} error(s) / {status['requests']} request(s)"
+            )
+        except Exception:
+            text = "Throttle: unavailable"
+        self.throttle_var.set(text)
+        self.after(1000, self._refresh_throttle_status)
+
     def _refresh_credential_display(self):
         username = self.credential_username or "(not set)"
         masked = "*" * len(self.credential_password) if self.credential_password else "(none)"
@@ -874,4 +920,5 @@ def launch_ui():
 
 
 if __name__ == "__main__":
+    freeze_support()
     launch_ui()